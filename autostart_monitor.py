@@ -1,29 +1,54 @@
+import time
+_IMPORT_STARTED = time.perf_counter()
 import os
 import sys
 import json
 import threading
-import time
+import heapq
 import ctypes
-import winsound
-import winreg
+import ctypes.util
+import select
+import struct
+import socket
+import random
+import zlib
 import logging
+import logging.handlers
+import queue
+import shutil
+import atexit
+import signal
+import argparse
 import subprocess
-from win10toast import ToastNotifier
-from PyQt6.QtCore import Qt, QTimer, QVariantAnimation, QEasingCurve
-from PyQt6.QtGui import QFont, QColor
-from PyQt6.QtWidgets import (
-    QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QGroupBox,
-    QLabel, QCheckBox, QPushButton, QComboBox, QSlider, QFormLayout, QMessageBox, QDialog
-)
+import functools
+import hashlib
+import base64
+import gzip
+import tempfile
+import collections
+import collections.abc
+import bisect
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+# Nur unter Windows verfügbar; GUI- und Benachrichtigungsmodule (PyQt6, win10toast,
+# winsound) werden erst bei Verwendung geladen, damit der Headless-Modus schlank bleibt
+try:
+    import winreg
+except ImportError:
+    winreg = None
 
 LOG_FILE = "monitor.log"
-logging.basicConfig(
-    filename=LOG_FILE,
-    level=logging.DEBUG,
-    format="%(asctime)s [%(levelname)s] %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S"
-)
-logging.info("Programmstart")
+LOG_FORMAT = "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
+# Ein Logger je Teilsystem; die Stufen lassen sich über "log_levels" einzeln setzen
+LOG = logging.getLogger("autostart")
+COLLECTOR_LOG = logging.getLogger("autostart.collectors")
+ENGINE_LOG = logging.getLogger("autostart.engine")
+NOTIFY_LOG = logging.getLogger("autostart.notify")
+CHANGES_LOG = logging.getLogger("autostart.changes")
+HISTORY_LOG = logging.getLogger("autostart.history")
+METRICS_LOG = logging.getLogger("autostart.metrics")
+INSTANCE_LOG = logging.getLogger("autostart.instance")
+FLEET_LOG = logging.getLogger("autostart.fleet")
 
 DEFAULT_SETTINGS = {
     "selected_methods": {
@@ -37,6 +62,7 @@ DEFAULT_SETTINGS = {
         "folder_context_handlers": True,
         "directory_dragdrop_handlers": True,
         "services": True,
+        "service_status": False,
         "tasks": True
     },
     "notification_methods": {
@@ -46,16 +72,149 @@ DEFAULT_SETTINGS = {
     "auto_start": False,
     "language": "de",
     "dark_mode": False,
-    "scan_interval": 60
+    "scan_interval": 60,
+    "scan_intervals": {},
+    "event_driven": True,
+    "event_fallback_interval": 300,
+    "persist_snapshot": True,
+    "notification_quiet_window": 2,
+    "notification_max_delay": 30,
+    "notification_max_per_minute": 6,
+    "history_enabled": True,
+    "history_retention_days": 365,
+    "history_max_rows": 5000000,
+    "suppressions_file": "suppressions.json",
+    "fleet_collector": "",
+    "fleet_host_id": "",
+    "fleet_spool_file": "fleet_spool.sqlite3",
+    "fleet_spool_max_rows": 100000,
+    "fleet_digest_interval": 300,
+    "record_file": "",
+    "metrics_file": "metrics.prom",
+    "metrics_port": 0,
+    "multi_user": False,
+    "user_workers": 8,
+    "hash_targets": True,
+    "hash_workers": 2,
+    "command_workers": {},
+    "command_timeout": 20,
+    "collector_workers": 4,
+    "collector_timeout": 30,
+    "collector_timeouts": {
+        "services": 60
+    },
+    "log_level": "INFO",
+    "log_levels": {},
+    "log_max_bytes": 5242880,
+    "log_backup_count": 10,
+    "log_rotate_daily": True
 }
 
-def log(msg, level="INFO"):
-    print(f"{level}: {msg}")
+# Rotiert bei Erreichen der Größe und (optional) beim ersten Eintrag nach Mitternacht;
+# rotierte Dateien werden als monitor.log.1.gz, .2.gz, ... komprimiert abgelegt
+class CompressingRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    def __init__(self, filename, max_bytes, backup_count, daily=True):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, encoding="utf8", delay=True)
+        self.daily = daily
+        self.namer = lambda name: name + ".gz"
+        self.rotator = self._compress
+        self.rollover_at = self._next_midnight()
+        # Eine Datei vom Vortag wird beim ersten Eintrag rotiert
+        try:
+            if daily and os.path.getsize(self.baseFilename) and os.path.getmtime(self.baseFilename) < self.rollover_at - 86400:
+                self.rollover_at = 0
+        except OSError:
+            pass
+
+    @staticmethod
+    def _next_midnight():
+        now = time.localtime()
+        return time.mktime((now.tm_year, now.tm_mon, now.tm_mday + 1, 0, 0, 0, 0, 0, -1))
+
+    @staticmethod
+    def _compress(source, destination):
+        with open(source, "rb") as src, gzip.open(destination, "wb", compresslevel=6) as dst:
+            shutil.copyfileobj(src, dst, 1024 * 1024)
+        os.remove(source)
+
+    def shouldRollover(self, record):
+        if self.daily and record.created >= self.rollover_at:
+            return True
+        return super().shouldRollover(record)
+
+    def doRollover(self):
+        super().doRollover()
+        self.rollover_at = self._next_midnight()
+
+# Im aufrufenden Thread nur die Nachricht einsetzen; ohne Kopie des Records und ohne
+# Formatieren der Zeile bzw. des Tracebacks (das erledigt der Listener)
+class LogQueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record):
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+LOG_QUEUE = queue.SimpleQueue()
+LOG_LISTENER = None
+
+# Die Aufrufer (Scan-Thread, Collector-Threads, GUI) legen Einträge nur in die Warteschlange;
+# Formatieren der Datei, Schreiben, Rotation und Komprimierung übernimmt der Listener-Thread.
+# Erneuter Aufruf (z.B. nach dem Laden der Einstellungen) ersetzt die Handler.
+def setup_logging(settings=None, console=False):
+    global LOG_LISTENER
+    settings = settings or {}
+
+    def option(key):
+        return settings.get(key, DEFAULT_SETTINGS[key])
+
+    if LOG_LISTENER is not None:
+        LOG_LISTENER.stop()
+        for handler in LOG_LISTENER.handlers:
+            handler.close()
+    file_handler = CompressingRotatingFileHandler(LOG_FILE, option("log_max_bytes"), option("log_backup_count"), option("log_rotate_daily"))
+    file_handler.setFormatter(logging.Formatter(LOG_FORMAT, datefmt="%Y-%m-%d %H:%M:%S"))
+    handlers = [file_handler]
+    if console:
+        # Headless: gefundene Änderungen zusätzlich auf stdout
+        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler.addFilter(logging.Filter(CHANGES_LOG.name))
+        handlers.append(console_handler)
+    LOG_LISTENER = logging.handlers.QueueListener(LOG_QUEUE, *handlers, respect_handler_level=True)
+    LOG_LISTENER.start()
+
+    root = logging.getLogger()
+    if not any(isinstance(handler, LogQueueHandler) for handler in root.handlers):
+        root.addHandler(LogQueueHandler(LOG_QUEUE))
+    root.setLevel(logging.WARNING)
+    LOG.setLevel(str(option("log_level")).upper())
+    for name, logger in list(logging.root.manager.loggerDict.items()):
+        if name.startswith(f"{LOG.name}.") and isinstance(logger, logging.Logger):
+            logger.setLevel(logging.NOTSET)
+    for name, level in option("log_levels").items():
+        logging.getLogger(f"{LOG.name}.{name}").setLevel(str(level).upper())
+
+def stop_logging():
+    global LOG_LISTENER
+    if LOG_LISTENER is not None:
+        LOG_LISTENER.stop()
+        for handler in LOG_LISTENER.handlers:
+            handler.close()
+        LOG_LISTENER = None
+
+setup_logging()
+atexit.register(stop_logging)
+LOG.info("Programmstart")
+
+_TOASTER = None
 
 def show_windows_toast(title: str, message: str, duration: int = 5):
+    global _TOASTER
     try:
-        toaster = ToastNotifier()
-        toaster.show_toast(
+        # Eine einzige Notifier-Instanz für alle Toasts
+        if _TOASTER is None:
+            from win10toast import ToastNotifier
+            _TOASTER = ToastNotifier()
+        _TOASTER.show_toast(
             title,
             message,
             duration=duration,
@@ -63,23 +222,14 @@ def show_windows_toast(title: str, message: str, duration: int = 5):
             threaded=True
         )
     except Exception as e:
-        logging.error(f"Fehler bei Windows-Toast: {e}")
-
-def show_dialog(title: str, message: str, parent=None):
-    try:
-        msg = QMessageBox(parent)
-        msg.setWindowTitle(title)
-        msg.setText(message)
-        msg.setIcon(QMessageBox.Icon.Information)
-        msg.exec()
-    except Exception as e:
-        logging.error(f"Fehler bei Dialog: {e}")
+        NOTIFY_LOG.error(f"Fehler bei Windows-Toast: {e}")
 
 def play_alert_sound():
     try:
+        import winsound
         winsound.MessageBeep(winsound.MB_ICONEXCLAMATION)
     except Exception as e:
-        logging.error(f"Sound-Fehler: {e}")
+        NOTIFY_LOG.error(f"Sound-Fehler: {e}")
 
 def flash_window():
     try:
@@ -91,782 +241,3569 @@ def flash_window():
             0x00000060
         )
     except Exception as e:
-        logging.error(f"Flash-Fehler: {e}")
+        NOTIFY_LOG.error(f"Flash-Fehler: {e}")
+
+USER_STARTUP_DIR = os.path.expanduser(r"~\AppData\Roaming\Microsoft\Windows\Start Menu\Startup")
+COMMON_STARTUP_DIR = r"C:\ProgramData\Microsoft\Windows\Start Menu\Startup"
+RUN_KEY_PATH = r"Software\Microsoft\Windows\CurrentVersion\Run"
+
+# Collectors, die Fehler einzelner Einträge abfangen und mit einem Teilergebnis weiterlaufen,
+# zählen sie über record_collector_error; der CollectorExecutor setzt dafür je Thread die Quelle.
+# Scheitert eine Quelle als Ganzes, lässt der Collector die Ausnahme durch (reason "error").
+COLLECTOR_CONTEXT = threading.local()
+
+def record_collector_error(reason="partial"):
+    current = getattr(COLLECTOR_CONTEXT, "current", None)
+    if current is not None and current[1] is not None:
+        current[1].record_error(current[0], reason)
+
+def call_in_collector_context(current, func, *args):
+    previous = getattr(COLLECTOR_CONTEXT, "current", None)
+    COLLECTOR_CONTEXT.current = current
+    try:
+        return func(*args)
+    finally:
+        COLLECTOR_CONTEXT.current = previous
 
 def check_startup_folders():
-    user_dir = os.path.expanduser(r"~\AppData\Roaming\Microsoft\Windows\Start Menu\Startup")
-    common_dir = r"C:\ProgramData\Microsoft\Windows\Start Menu\Startup"
+    user_dir = USER_STARTUP_DIR
+    common_dir = COMMON_STARTUP_DIR
+    # Ein fehlender Ordner ist leer; andere Fehler gehen an den CollectorExecutor, damit der
+    # letzte Stand erhalten bleibt statt alle Dateien als entfernt zu melden
     try:
         user_files = set(os.listdir(user_dir))
-    except Exception as e:
-        logging.error(f"Fehler beim Lesen des Benutzer-Startup-Ordners: {e}")
+    except FileNotFoundError:
         user_files = set()
     try:
         common_files = set(os.listdir(common_dir))
-    except Exception as e:
-        logging.error(f"Fehler beim Lesen des Common-Startup-Ordners: {e}")
+    except FileNotFoundError:
         common_files = set()
     return {'user': user_files, 'common': common_files}
 
-def check_registry_autostart():
-    key_path = r'Software\Microsoft\Windows\CurrentVersion\Run'
-    entries = {}
-    try:
-        with winreg.OpenKey(winreg.HKEY_CURRENT_USER, key_path) as key:
-            i = 0
-            while True:
+# Deklarative Tabelle der überwachten Autostart-Orte (ASEPs).
+# mode "values": Werte des Schlüssels, bei values nur die genannten.
+# mode "subkeys": je Unterschlüssel ein Wert; ohne values der Standardwert (auch leer),
+# sonst der erste vorhandene der genannten Werte (Unterschlüssel ohne diesen Wert fehlen).
+# targets: Werte sind Befehlszeilen, deren Zieldateien gehasht werden.
+AsepLocation = collections.namedtuple("AsepLocation", ["hive", "path", "mode", "values", "targets"], defaults=[None, False])
+
+WINDOWS_NT_PATH = r"SOFTWARE\Microsoft\Windows NT\CurrentVersion"
+WOW64_WINDOWS_NT_PATH = r"SOFTWARE\WOW6432Node\Microsoft\Windows NT\CurrentVersion"
+
+ASEP_LOCATIONS = {
+    "registry": AsepLocation("HKCU", RUN_KEY_PATH, "values", targets=True),
+    "registry_hklm_run": AsepLocation("HKLM", r"SOFTWARE\Microsoft\Windows\CurrentVersion\Run", "values", targets=True),
+    "context_handlers_star": AsepLocation("HKLM", r"SOFTWARE\Classes\*\ShellEx\ContextMenuHandlers", "subkeys"),
+    "context_handlers_allfilesystem": AsepLocation("HKLM", r"SOFTWARE\Classes\AllFilesystemObjects\shellex\ContextMenuHandlers", "subkeys"),
+    "context_handlers_directory": AsepLocation("HKLM", r"SOFTWARE\Classes\Directory\shellex\ContextMenuHandlers", "subkeys"),
+    "context_handlers_directory_bg": AsepLocation("HKLM", r"SOFTWARE\Classes\Directory\background\shellex\ContextMenuHandlers", "subkeys"),
+    "folder_context_handlers": AsepLocation("HKLM", r"SOFTWARE\Classes\Folder\ShellEx\ContextMenuHandlers", "subkeys"),
+    "directory_dragdrop_handlers": AsepLocation("HKLM", r"SOFTWARE\Classes\Directory\shellex\DragDropHandlers", "subkeys"),
+    "registry_hkcu_runonce": AsepLocation("HKCU", r"Software\Microsoft\Windows\CurrentVersion\RunOnce", "values", targets=True),
+    "registry_hklm_runonce": AsepLocation("HKLM", r"SOFTWARE\Microsoft\Windows\CurrentVersion\RunOnce", "values", targets=True),
+    "registry_hklm_run_wow64": AsepLocation("HKLM", r"SOFTWARE\WOW6432Node\Microsoft\Windows\CurrentVersion\Run", "values", targets=True),
+    "registry_hklm_runonce_wow64": AsepLocation("HKLM", r"SOFTWARE\WOW6432Node\Microsoft\Windows\CurrentVersion\RunOnce", "values", targets=True),
+    "registry_hkcu_policies_run": AsepLocation("HKCU", r"Software\Microsoft\Windows\CurrentVersion\Policies\Explorer\Run", "values", targets=True),
+    "registry_hklm_policies_run": AsepLocation("HKLM", r"SOFTWARE\Microsoft\Windows\CurrentVersion\Policies\Explorer\Run", "values", targets=True),
+    "winlogon": AsepLocation("HKLM", WINDOWS_NT_PATH + r"\Winlogon", "values", ("Shell", "Userinit", "Taskman", "AppSetup", "GinaDLL")),
+    "winlogon_hkcu": AsepLocation("HKCU", r"Software\Microsoft\Windows NT\CurrentVersion\Winlogon", "values", ("Shell",)),
+    "winlogon_notify": AsepLocation("HKLM", WINDOWS_NT_PATH + r"\Winlogon\Notify", "subkeys", ("DLLName",)),
+    "appinit_dlls": AsepLocation("HKLM", WINDOWS_NT_PATH + r"\Windows", "values", ("AppInit_DLLs", "LoadAppInit_DLLs")),
+    "appinit_dlls_wow64": AsepLocation("HKLM", WOW64_WINDOWS_NT_PATH + r"\Windows", "values", ("AppInit_DLLs", "LoadAppInit_DLLs")),
+    "hkcu_windows_load": AsepLocation("HKCU", r"Software\Microsoft\Windows NT\CurrentVersion\Windows", "values", ("Load", "Run")),
+    "ifeo": AsepLocation("HKLM", WINDOWS_NT_PATH + r"\Image File Execution Options", "subkeys", ("Debugger",), targets=True),
+    "ifeo_wow64": AsepLocation("HKLM", WOW64_WINDOWS_NT_PATH + r"\Image File Execution Options", "subkeys", ("Debugger",), targets=True),
+    "silent_process_exit": AsepLocation("HKLM", WINDOWS_NT_PATH + r"\SilentProcessExit", "subkeys", ("MonitorProcess",), targets=True),
+    "active_setup": AsepLocation("HKLM", r"SOFTWARE\Microsoft\Active Setup\Installed Components", "subkeys", ("StubPath",), targets=True),
+    "active_setup_wow64": AsepLocation("HKLM", r"SOFTWARE\WOW6432Node\Microsoft\Active Setup\Installed Components", "subkeys", ("StubPath",), targets=True),
+    "shell_service_objects": AsepLocation("HKLM", r"SOFTWARE\Microsoft\Windows\CurrentVersion\ShellServiceObjectDelayLoad", "values"),
+    "browser_helper_objects": AsepLocation("HKLM", r"SOFTWARE\Microsoft\Windows\CurrentVersion\Explorer\Browser Helper Objects", "subkeys"),
+    "boot_execute": AsepLocation("HKLM", r"SYSTEM\CurrentControlSet\Control\Session Manager", "values", ("BootExecute", "SetupExecute")),
+    "lsa_packages": AsepLocation("HKLM", r"SYSTEM\CurrentControlSet\Control\Lsa", "values", ("Authentication Packages", "Notification Packages", "Security Packages")),
+    "print_monitors": AsepLocation("HKLM", r"SYSTEM\CurrentControlSet\Control\Print\Monitors", "subkeys", ("Driver",))
+}
+
+REGISTRY_HIVES = {"HKLM": "HKEY_LOCAL_MACHINE", "HKCU": "HKEY_CURRENT_USER", "HKU": "HKEY_USERS"}
+
+def asep_location_label(name):
+    location = ASEP_LOCATIONS[name]
+    label = f"{location.hive}\\{location.path}"
+    return f"{label} ({', '.join(location.values)})" if location.values else label
+
+# Gemeinsamer Leser für alle Orte: Schlüssel werden Komponente für Komponente relativ zum
+# bereits offenen Elternschlüssel geöffnet und bleiben offen, sodass sich Geschwister die
+# Eltern-Handles teilen. Werte werden je Schlüssel nur neu gelesen, wenn sich dessen
+# Last-Write-Zeit (QueryInfoKey) geändert hat; Unterschlüssellisten ebenso.
+# self.lock schützt nur die gemeinsamen Handle- und Cache-Dicts; die Registry-Zugriffe selbst
+# laufen unter einer Sperre je Ort, sodass die Collector-Threads parallel lesen.
+class RegistryLocationReader:
+    def __init__(self):
+        self.reg = None
+        self.lock = threading.Lock()
+        self.location_locks = {}
+        self.handles = {}
+        self.values = {}
+        self.subkeys = {}
+        self.reads = 0
+
+    def release_handles(self):
+        with self.lock:
+            for handle in self.handles.values():
                 try:
-                    name, value, _ = winreg.EnumValue(key, i)
-                    entries[name] = value
-                    i += 1
+                    handle.Close()
                 except OSError:
-                    break
-    except Exception as e:
-        logging.error(f"Registry-Fehler (HKCU): {e}")
-    return entries
+                    pass
+            self.handles.clear()
 
-def check_registry_autostart_hklm():
-    key_path = r"SOFTWARE\Microsoft\Windows\CurrentVersion\Run"
-    entries = {}
-    try:
-        with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, key_path) as key:
+    def close(self):
+        for handle in self.handles.values():
+            try:
+                handle.Close()
+            except OSError:
+                pass
+        self.handles.clear()
+        self.values.clear()
+        self.subkeys.clear()
+
+    def _forget(self, hive, path):
+        prefix = path.lower()
+        for cache in (self.handles, self.values, self.subkeys):
+            for key in [key for key in cache if key[0] == hive and (key[1] == prefix or key[1].startswith(prefix + "\\"))]:
+                entry = cache.pop(key)
+                if cache is self.handles:
+                    try:
+                        entry.Close()
+                    except OSError:
+                        pass
+
+    # Verwirft den Ort samt Unterschlüsseln und die Handles seiner Elternschlüssel, nicht aber
+    # die anderer Orte unter denselben Eltern
+    def _discard(self, hive, path):
+        self._forget(hive, path)
+        parent_path = path.rpartition("\\")[0]
+        while parent_path:
+            handle = self.handles.pop((hive, parent_path.lower()), None)
+            if handle is not None:
+                try:
+                    handle.Close()
+                except OSError:
+                    pass
+            parent_path = parent_path.rpartition("\\")[0]
+
+    def _open_locked(self, hive, path):
+        handle = self.handles.get((hive, path.lower()))
+        if handle is None:
+            parent_path, _, name = path.rpartition("\\")
+            parent = self._open_locked(hive, parent_path) if parent_path else getattr(self.reg, REGISTRY_HIVES[hive])
+            handle = self.handles[(hive, path.lower())] = self.reg.OpenKey(parent, name)
+        return handle
+
+    def _open(self, hive, path):
+        with self.lock:
+            return self._open_locked(hive, path)
+
+    def _stamp(self, hive, path):
+        _, _, stamp = self.reg.QueryInfoKey(self._open(hive, path))
+        return stamp
+
+    def _read_values(self, hive, path, names=None):
+        stamp = self._stamp(hive, path)
+        cached = self.values.get((hive, path.lower()))
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        handle = self._open(hive, path)
+        values = {}
+        if names is None:
             i = 0
             while True:
                 try:
-                    name, value, _ = winreg.EnumValue(key, i)
-                    entries[name] = value
-                    i += 1
+                    name, value, _ = self.reg.EnumValue(handle, i)
                 except OSError:
                     break
-    except Exception as e:
-        logging.error(f"Registry HKLM Run Fehler: {e}")
-    return entries
+                values[name] = value
+                i += 1
+        else:
+            for name in names:
+                try:
+                    values[name], _ = self.reg.QueryValueEx(handle, name)
+                except FileNotFoundError:
+                    pass
+        with self.lock:
+            self.reads += 1
+            self.values[(hive, path.lower())] = (stamp, values)
+        return values
+
+    def _read_subkeys(self, hive, path):
+        stamp = self._stamp(hive, path)
+        cached = self.subkeys.get((hive, path.lower()))
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        handle = self._open(hive, path)
+        names = []
+        while True:
+            try:
+                names.append(self.reg.EnumKey(handle, len(names)))
+            except OSError:
+                break
+        with self.lock:
+            if cached is not None:
+                for name in set(cached[1]) - set(names):
+                    self._forget(hive, f"{path}\\{name}")
+            self.subkeys[(hive, path.lower())] = (stamp, names)
+        return names
+
+    def _read(self, location):
+        if location.mode == "values":
+            return dict(self._read_values(location.hive, location.path, location.values))
+        entries = {}
+        for name in self._read_subkeys(location.hive, location.path):
+            subkey_path = f"{location.path}\\{name}"
+            try:
+                values = self._read_values(location.hive, subkey_path, location.values or ("",))
+            except OSError as e:
+                with self.lock:
+                    self._forget(location.hive, subkey_path)
+                # Zwischen Aufzählen und Lesen gelöschte Unterschlüssel sind kein Fehler
+                if not isinstance(e, FileNotFoundError):
+                    record_collector_error()
+                if location.values is None:
+                    COLLECTOR_LOG.error(f"Fehler beim Lesen von {subkey_path}: {e}")
+                    entries[name] = ""
+                continue
+            if location.values is None:
+                entries[name] = values.get("") or ""
+            else:
+                for value_name in location.values:
+                    if value_name in values:
+                        entries[name] = values[value_name]
+                        break
+        return entries
+
+    def read(self, location, reg=None):
+        reg = reg or winreg
+        if reg is None:
+            return {}
+        with self.lock:
+            if self.reg is not reg:
+                self.close()
+                self.reg = reg
+            location_lock = self.location_locks.setdefault((location.hive, location.path.lower()), threading.Lock())
+        with location_lock:
+            try:
+                return self._read(location)
+            except FileNotFoundError:
+                # Nicht vorhandene Orte (z.B. RunOnce, Policies) sind schlicht leer
+                with self.lock:
+                    self._forget(location.hive, location.path)
+                return {}
+            except OSError:
+                # Gelöschte oder ungültige Handles (auch von Elternschlüsseln) verwerfen und einmal frisch öffnen
+                with self.lock:
+                    self._discard(location.hive, location.path)
+                try:
+                    return self._read(location)
+                except FileNotFoundError:
+                    return {}
+
+REGISTRY_READER = RegistryLocationReader()
+
+def check_registry_location(name, reg=None, reader=None):
+    return (reader or REGISTRY_READER).read(ASEP_LOCATIONS[name], reg)
+
+PROFILE_LIST_LOCATION = AsepLocation("HKLM", WINDOWS_NT_PATH + r"\ProfileList", "subkeys", ("ProfileImagePath",))
+USER_STARTUP_SUBDIR = os.path.join("AppData", "Roaming", "Microsoft", "Windows", "Start Menu", "Startup")
+USER_SID_PREFIX = "S-1-5-21-"
+MULTI_USER_SOURCES = ("user_registry", "user_startup_folders")
+
+# Mehrbenutzer-Modus: liest die HKCU-Orte der ASEP-Tabelle in jedem geladenen Benutzer-Hive
+# (HKEY_USERS\<SID>) und die Startup-Ordner aller Profile, verteilt auf einen eigenen Pool.
+# Jeder Benutzer hat einen eigenen RegistryLocationReader, dessen Last-Write-Cache nur geänderte
+# Schlüssel neu liest; Handles in fremde Hives werden nach jedem Scan geschlossen, damit das
+# Entladen des Hives bei der Abmeldung nicht blockiert wird. Ordner werden nur bei geänderter
+# mtime neu gelistet. Nicht geladene Hives behalten ihr letztes Ergebnis.
+class MultiUserScanner:
+    def __init__(self, max_workers=8):
+        self.max_workers = max_workers
+        self.pool = None
+        self.lock = threading.Lock()
+        self.readers = {}
+        self.registry_results = {}
+        self.folders = {}
+        self.startup_dirs = {}
+        self.rescanned_folders = 0
+
+    def configure(self, max_workers):
+        self.shutdown()
+        self.max_workers = max_workers
+
+    def _map(self, func, items):
+        with self.lock:
+            if self.pool is None:
+                self.pool = ThreadPoolExecutor(max_workers=max(1, self.max_workers), thread_name_prefix="users")
+            pool = self.pool
+        # Teilfehler aus den Benutzer-Threads der aufrufenden Quelle zuordnen
+        current = getattr(COLLECTOR_CONTEXT, "current", None)
+        return list(pool.map(functools.partial(call_in_collector_context, current, func), items))
+
+    def shutdown(self):
+        with self.lock:
+            pool, self.pool = self.pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def profiles(self, reg):
+        entries = REGISTRY_READER.read(PROFILE_LIST_LOCATION, reg)
+        return {
+            sid: os.path.expandvars(path) for sid, path in entries.items()
+            if sid.startswith(USER_SID_PREFIX) and isinstance(path, str)
+        }
 
-def check_context_menu_handler(reg_path):
-    handlers = {}
-    try:
+    @staticmethod
+    def user_label(sid, profiles):
+        # Profilordnername als lesbarer Benutzername, sonst die SID
+        profile = profiles.get(sid, "").replace("/", "\\").rstrip("\\")
+        return profile.rpartition("\\")[2] or sid
+
+    def loaded_sids(self, reg):
+        sids = []
+        i = 0
+        while True:
+            try:
+                name = reg.EnumKey(reg.HKEY_USERS, i)
+            except OSError:
+                break
+            if name.startswith(USER_SID_PREFIX) and not name.endswith("_Classes"):
+                sids.append(name)
+            i += 1
+        return sids
+
+    @property
+    def registry_reads(self):
+        return sum(reader.reads for reader in list(self.readers.values()))
+
+    def scan_registry(self, reg):
+        profiles = self.profiles(reg)
+        sids = self.loaded_sids(reg)
+        locations = [(name, location) for name, location in ASEP_LOCATIONS.items() if location.hive == "HKCU"]
+        for sid in sids:
+            if sid not in self.readers:
+                self.readers[sid] = RegistryLocationReader()
+
+        def scan_user(sid):
+            reader = self.readers[sid]
+            entries = {}
+            try:
+                for name, location in locations:
+                    user_location = location._replace(hive="HKU", path=f"{sid}\\{location.path}")
+                    for value_name, value in reader.read(user_location, reg).items():
+                        entries[f"{name}\\{value_name}"] = value
+            finally:
+                reader.release_handles()
+            return entries
+
+        for sid, entries in zip(sids, self._map(scan_user, sids)):
+            self.registry_results[sid] = entries
+        # Entfernte Profile vergessen; abgemeldete Benutzer behalten ihren letzten Stand
+        for sid in set(self.registry_results) - set(sids) - set(profiles):
+            del self.registry_results[sid]
+            self.readers.pop(sid).close()
+        return {self.user_label(sid, profiles): dict(entries) for sid, entries in self.registry_results.items()}
+
+    def scan_startup_folders(self, reg):
+        profiles = self.profiles(reg)
+        startup_dirs = {self.user_label(sid, profiles): os.path.join(path, USER_STARTUP_SUBDIR) for sid, path in profiles.items()}
+
+        def scan_folder(directory):
+            try:
+                mtime = os.stat(directory).st_mtime_ns
+            except OSError:
+                return set()
+            with self.lock:
+                cached = self.folders.get(directory)
+            if cached is not None and cached[0] == mtime:
+                return set(cached[1])
+            try:
+                names = frozenset(os.listdir(directory))
+            except OSError as e:
+                COLLECTOR_LOG.error(f"Fehler beim Lesen des Startup-Ordners {directory}: {e}")
+                record_collector_error()
+                return set()
+            with self.lock:
+                self.folders[directory] = (mtime, names)
+                self.rescanned_folders += 1
+            return set(names)
+
+        users = list(startup_dirs)
+        results = dict(zip(users, self._map(scan_folder, [startup_dirs[user] for user in users])))
+        with self.lock:
+            for directory in set(self.folders) - set(startup_dirs.values()):
+                del self.folders[directory]
+        self.startup_dirs = startup_dirs
+        return results
+
+USER_SCANNER = MultiUserScanner()
+
+def check_user_registry(reg=None, scanner=None):
+    reg = reg or winreg
+    return (scanner or USER_SCANNER).scan_registry(reg) if reg is not None else {}
+
+def check_user_startup_folders(reg=None, scanner=None):
+    reg = reg or winreg
+    return (scanner or USER_SCANNER).scan_startup_folders(reg) if reg is not None else {}
+
+# Langlebiger Worker-Prozess je Befehlsquelle statt eines neuen powershell.exe pro Aufruf.
+# Protokoll: eine JSON-Zeile je Anfrage {"id", "command", ...} auf stdin, eine JSON-Zeile je
+# Antwort {"id", "ok", "result" | "error"} auf stdout. Hängt der Worker, wird er beendet und beim
+# nächsten Aufruf neu gestartet; stürzt er ab, wird die Anfrage einmal mit neuem Worker wiederholt.
+class CommandHostError(RuntimeError):
+    pass
+
+class CommandHost:
+    def __init__(self, argv, name="worker", timeout=20, max_restarts=5, restart_window=60):
+        self.argv = list(argv)
+        self.name = name
+        self.timeout = timeout
+        self.max_restarts = max_restarts
+        self.restart_window = restart_window
+        self.lock = threading.Lock()
+        self.condition = threading.Condition()
+        self.process = None
+        self.reader_done = True
+        self.responses = {}
+        self.next_id = 0
+        self.starts = collections.deque()
+
+    def _start(self):
+        now = time.monotonic()
+        while self.starts and now - self.starts[0] > self.restart_window:
+            self.starts.popleft()
+        if len(self.starts) >= self.max_restarts:
+            raise CommandHostError(f"{self.name}: mehr als {self.max_restarts} Starts in {self.restart_window} Sek.")
+        self.starts.append(now)
+        flags = subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0
+        process = subprocess.Popen(
+            self.argv, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, creationflags=flags
+        )
+        with self.condition:
+            self.process = process
+            self.reader_done = False
+            self.responses.clear()
+        threading.Thread(target=self._read, args=(process,), name=f"command-host-{self.name}", daemon=True).start()
+        COLLECTOR_LOG.info(f"Command-Host {self.name} gestartet (PID {process.pid})")
+
+    def _read(self, process):
+        for line in process.stdout:
+            try:
+                response = json.loads(line.decode("utf-8-sig"))
+            except ValueError:
+                COLLECTOR_LOG.warning(f"Command-Host {self.name}: ungültige Antwortzeile verworfen")
+                continue
+            with self.condition:
+                if self.process is process:
+                    self.responses[response.get("id")] = response
+                    self.condition.notify_all()
+        with self.condition:
+            if self.process is process:
+                self.reader_done = True
+                self.condition.notify_all()
+
+    def _wait(self, request_id, timeout):
+        deadline = time.monotonic() + timeout
+        with self.condition:
+            while request_id not in self.responses and not self.reader_done:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self.condition.wait(remaining)
+            return self.responses.pop(request_id, None)
+
+    def _kill(self):
+        with self.condition:
+            process = self.process
+            self.process = None
+            self.reader_done = True
+            self.responses.clear()
+        if process is None:
+            return
         try:
-            with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, reg_path) as key:
-                i = 0
-                while True:
-                    try:
-                        subkey_name = winreg.EnumKey(key, i)
-                        try:
-                            with winreg.OpenKey(key, subkey_name) as sub_key:
-                                default_value, _ = winreg.QueryValueEx(sub_key, None)
-                                handlers[subkey_name] = default_value or ""
-                        except Exception as e:
-                            handlers[subkey_name] = ""
-                            logging.error(f"Fehler beim Lesen des Handlers {subkey_name}: {e}")
-                        i += 1
-                    except OSError:
-                        break
+            process.kill()
+            process.wait(timeout=5)
         except Exception as e:
-            logging.error(f"Fehler beim Lesen des Schlüssels {reg_path}: {e}")
-        return handlers
-    except Exception as e:
-        logging.error(f"Unbekannter Fehler in check_context_menu_handler: {e}")
-        return {}
-
-def check_system_services():
-    services = {}
-    try:
-        result = subprocess.check_output(["powershell.exe", "-Command", "Get-Service"])
-        services_list = result.decode('utf-8').split('\n')
-        for line in services_list:
-            if 'Running' in line or 'Stopped' in line:
-                parts = line.split()
-                service_name = parts[0].strip()
-                status = parts[-1].strip()
-                services[service_name] = status
-        return services
-    except Exception as e:
-        logging.error(f"Fehler beim Lesen der Dienste via PowerShell: {e}")
-        return {}
+            COLLECTOR_LOG.error(f"Fehler beim Beenden von Command-Host {self.name}: {e}")
+        for stream in (process.stdin, process.stdout):
+            try:
+                stream.close()
+            except OSError:
+                pass
+
+    def request(self, command, timeout=None, **params):
+        timeout = self.timeout if timeout is None else timeout
+        with self.lock:
+            for attempt in range(2):
+                if self.process is None or self.process.poll() is not None:
+                    self._kill()
+                    self._start()
+                self.next_id += 1
+                request_id = self.next_id
+                line = json.dumps({"id": request_id, "command": command, **params}) + "\n"
+                try:
+                    self.process.stdin.write(line.encode("utf-8"))
+                    self.process.stdin.flush()
+                except OSError:
+                    COLLECTOR_LOG.warning(f"Command-Host {self.name} nicht erreichbar, Neustart")
+                    self._kill()
+                    continue
+                response = self._wait(request_id, timeout)
+                if response is not None:
+                    if not response.get("ok"):
+                        raise CommandHostError(f"{self.name}/{command}: {response.get('error')}")
+                    return response.get("result")
+                if self.process is not None and self.process.poll() is None and not self.reader_done:
+                    self._kill()
+                    raise TimeoutError(f"{self.name}/{command}: keine Antwort nach {timeout} Sek.")
+                COLLECTOR_LOG.warning(f"Command-Host {self.name} während {command} beendet, Neustart")
+                self._kill()
+            raise CommandHostError(f"{self.name}/{command}: Worker wiederholt abgestürzt")
+
+    def close(self, timeout=2):
+        with self.lock:
+            process = self.process
+            if process is not None and process.poll() is None:
+                try:
+                    # stdin schließen beendet die Leseschleife des Workers regulär
+                    process.stdin.close()
+                    process.wait(timeout=timeout)
+                except Exception:
+                    pass
+            self._kill()
+
+POWERSHELL_WORKER_SCRIPT = r"""
+$ErrorActionPreference = 'Stop'
+[Console]::OutputEncoding = New-Object System.Text.UTF8Encoding $false
+$commands = @{
+    'ping' = { 'pong' }
+    'services' = {
+        $result = @{}
+        foreach ($service in Get-Service) { $result[$service.Name] = $service.Status.ToString() }
+        $result
+    }
+}
+while ($null -ne ($line = [Console]::In.ReadLine())) {
+    $id = $null
+    try {
+        $request = $line | ConvertFrom-Json
+        $id = $request.id
+        $handler = $commands[$request.command]
+        if ($null -eq $handler) { throw "unbekannter Befehl: $($request.command)" }
+        $response = @{ id = $id; ok = $true; result = (& $handler) }
+    } catch {
+        $response = @{ id = $id; ok = $false; error = $_.Exception.Message }
+    }
+    [Console]::Out.WriteLine(($response | ConvertTo-Json -Compress -Depth 5))
+    [Console]::Out.Flush()
+}
+"""
+
+POWERSHELL_WORKER_ARGV = [
+    "powershell.exe", "-NoProfile", "-NonInteractive", "-ExecutionPolicy", "Bypass",
+    "-EncodedCommand", base64.b64encode(POWERSHELL_WORKER_SCRIPT.encode("utf-16-le")).decode("ascii")
+]
+
+COMMAND_HOST_ARGV = {"powershell": POWERSHELL_WORKER_ARGV}
+COMMAND_HOSTS = {}
+COMMAND_HOSTS_LOCK = threading.Lock()
+COMMAND_HOST_CONFIG = {"timeout": 20}
+
+# Einstellungen "command_workers" (Name -> Befehlszeile) erlauben z.B. einen Stand-in-Worker unter Linux
+def configure_command_hosts(workers=None, timeout=20):
+    close_command_hosts()
+    with COMMAND_HOSTS_LOCK:
+        COMMAND_HOST_ARGV.clear()
+        COMMAND_HOST_ARGV.update({"powershell": POWERSHELL_WORKER_ARGV, **(workers or {})})
+        COMMAND_HOST_CONFIG["timeout"] = timeout
+
+def get_command_host(name):
+    with COMMAND_HOSTS_LOCK:
+        host = COMMAND_HOSTS.get(name)
+        if host is None:
+            host = COMMAND_HOSTS[name] = CommandHost(COMMAND_HOST_ARGV[name], name=name, timeout=COMMAND_HOST_CONFIG["timeout"])
+        return host
+
+def close_command_hosts():
+    with COMMAND_HOSTS_LOCK:
+        hosts = list(COMMAND_HOSTS.values())
+        COMMAND_HOSTS.clear()
+    for host in hosts:
+        host.close()
+
+# Laufstatus aller Dienste. Fehler werden nicht in ein leeres Ergebnis umgewandelt, damit der
+# CollectorExecutor die Quelle als fehlgeschlagen führt statt alle Dienste als entfernt zu melden.
+def check_system_services(host=None):
+    host = host or get_command_host("powershell")
+    result = host.request("services")
+    return {str(name): str(status) for name, status in (result or {}).items()}
+
+ADDED = "added"
+REMOVED = "removed"
+MODIFIED = "modified"
+# Eintrag unverändert, aber Inhalt der Zieldatei geändert
+MODIFIED_TARGET = "modified_target"
+
+# Zuordnung der Quellen zu Kategorien für Texte und Dialog-Buttons; alles andere ist Registry
+SOURCE_CATEGORIES = {
+    "startup_folders": "startup",
+    "services": "services",
+    "service_status": "services",
+    "user_startup_folders": "startup",
+    "tasks": "tasks"
+}
 
-def get_services_with_powershell():
-    services = {}
-    try:
-        result = subprocess.check_output(["powershell.exe", "-Command", "Get-Service"])
-        services_list = result.decode('utf-8').split('\n')
-        for line in services_list:
-            if 'Running' in line or 'Stopped' in line:
-                parts = line.split()
-                service_name = parts[0].strip()
-                status = parts[-1].strip()
-                services[service_name] = status
-        return services
-    except Exception as e:
-        logging.error(f"Fehler beim Lesen der Dienste via PowerShell: {e}")
-        return {}
+class ChangeEvent:
+    __slots__ = ("source", "kind", "key", "old", "new")
+
+    def __init__(self, source, kind, key, old=None, new=None):
+        self.source = source
+        self.kind = kind
+        self.key = key
+        self.old = old
+        self.new = new
+
+    @property
+    def category(self):
+        return SOURCE_CATEGORIES.get(base_source(self.source), "registry")
+
+    def __eq__(self, other):
+        if not isinstance(other, ChangeEvent):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"ChangeEvent({self.source!r}, {self.kind!r}, {self.key!r}, old={self.old!r}, new={self.new!r})"
+
+EVENT_TEXTS = {
+    "de": {
+        ("registry", MODIFIED): "Registry {key} geändert: von {old} zu {new}",
+        ("registry", ADDED): "Registry {key} hinzugefügt: {new}",
+        ("registry", REMOVED): "Registry {key} entfernt: {old}",
+        ("registry", MODIFIED_TARGET): "Registry {key}: Zieldatei geändert, SHA-256 von {old} zu {new}",
+        ("services", MODIFIED): "Dienst '{key}' Startwert geändert: von {old} nach {new}",
+        ("services", ADDED): "Dienst '{key}' hinzugefügt mit Startwert {new}",
+        ("services", REMOVED): "Dienst '{key}' entfernt",
+        ("services", MODIFIED_TARGET): "Dienst '{key}' Programmdatei geändert, SHA-256 von {old} zu {new}",
+        ("service_status", MODIFIED): "Dienst '{key}' Status geändert: von {old} nach {new}",
+        ("service_status", ADDED): "Dienst '{key}' hinzugefügt mit Status {new}",
+        ("startup", ADDED): "Startup-Ordner ({scope}) Hinzugefügt: {name}",
+        ("startup", REMOVED): "Startup-Ordner ({scope}) Entfernt: {name}",
+        ("startup", MODIFIED_TARGET): "Startup-Ordner ({scope}) Inhalt geändert: {name}",
+        ("tasks", ADDED): "Geplante Tasks Hinzugefügt: {key}",
+        ("tasks", REMOVED): "Geplante Tasks Entfernt: {key}",
+        ("tasks", MODIFIED): "Geplanter Task {key} geändert: von {old} zu {new}"
+    },
+    "en": {
+        ("registry", MODIFIED): "Registry {key} changed: from {old} to {new}",
+        ("registry", ADDED): "Registry {key} added: {new}",
+        ("registry", REMOVED): "Registry {key} removed: {old}",
+        ("registry", MODIFIED_TARGET): "Registry {key}: target file changed, SHA-256 from {old} to {new}",
+        ("services", MODIFIED): "Service '{key}' start value changed: from {old} to {new}",
+        ("services", ADDED): "Service '{key}' added with start value {new}",
+        ("services", REMOVED): "Service '{key}' removed",
+        ("services", MODIFIED_TARGET): "Service '{key}' binary changed, SHA-256 from {old} to {new}",
+        ("service_status", MODIFIED): "Service '{key}' status changed: from {old} to {new}",
+        ("service_status", ADDED): "Service '{key}' added with status {new}",
+        ("startup", ADDED): "Startup folder ({scope}) added: {name}",
+        ("startup", REMOVED): "Startup folder ({scope}) removed: {name}",
+        ("startup", MODIFIED_TARGET): "Startup folder ({scope}) content changed: {name}",
+        ("tasks", ADDED): "Scheduled task added: {key}",
+        ("tasks", REMOVED): "Scheduled task removed: {key}",
+        ("tasks", MODIFIED): "Scheduled task {key} changed: from {old} to {new}"
+    }
+}
 
-def check_services_start_values():
-    services = {}
-    try:
-        with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, r"SYSTEM\CurrentControlSet\Services") as key:
+def render_event(event, language="de"):
+    texts = EVENT_TEXTS.get(language, EVENT_TEXTS["de"])
+    # Quellenspezifische Texte vor den Texten der Kategorie
+    template = texts.get((event.source, event.kind)) or texts.get((event.category, event.kind), "{source}: {kind} {key}")
+    scope, _, name = str(event.key).partition("\\")
+    return template.format(
+        source=event.source,
+        kind=event.kind,
+        key=event.key,
+        scope=scope,
+        name=name,
+        old=format_value(event.old),
+        new=format_value(event.new)
+    )
+
+def render_events(events, language="de"):
+    return "\n".join(render_event(event, language) for event in events)
+
+SERVICES_KEY_PATH = r"SYSTEM\CurrentControlSet\Services"
+
+# Cache für check_services_start_values, gefüllt anhand der Last-Write-Zeitstempel aus QueryInfoKey.
+# Der Zeitstempel des Services-Schlüssels ändert sich nur beim Anlegen/Löschen von Diensten und
+# spart dann die Aufzählung; Wertänderungen eines Dienstes erkennt nur dessen eigener Zeitstempel.
+# Daher bleiben die Handles der Dienstschlüssel offen und es wird nur bei neuem Zeitstempel gelesen.
+class ServicesStartCache:
+    def __init__(self):
+        self.reg = None
+        self.root = None
+        self.root_stamp = None
+        self.names = []
+        self.handles = {}
+        self.entries = {}
+        self.image_paths = {}
+
+    def close(self):
+        for handle in self.handles.values():
+            handle.Close()
+        if self.root is not None:
+            self.root.Close()
+        self.__init__()
+
+    def _drop(self, name):
+        handle = self.handles.pop(name, None)
+        if handle is not None:
+            handle.Close()
+        self.entries.pop(name, None)
+
+    def scan(self, reg):
+        if self.reg is not reg:
+            self.close()
+            self.reg = reg
+        if self.root is None:
+            self.root = reg.OpenKey(reg.HKEY_LOCAL_MACHINE, SERVICES_KEY_PATH)
+        _, _, root_stamp = reg.QueryInfoKey(self.root)
+        if root_stamp != self.root_stamp:
+            names = []
             i = 0
             while True:
                 try:
-                    service_name = winreg.EnumKey(key, i)
-                    try:
-                        with winreg.OpenKey(key, service_name) as service_key:
-                            start_value, _ = winreg.QueryValueEx(service_key, "Start")
-                            services[service_name] = start_value
-                    except OSError:
-                        logging.error(f"Fehler beim Lesen des Dienstes {service_name}")
-                        services[service_name] = None
+                    names.append(reg.EnumKey(self.root, i))
                     i += 1
                 except OSError:
                     break
+            for name in set(self.names) - set(names):
+                self._drop(name)
+            self.names = names
+            self.root_stamp = root_stamp
+
+        services = {}
+        # ImagePath wird mitgelesen, damit die Zieldateien der Dienste gehasht werden können
+        image_paths = {}
+        for service_name in self.names:
+            try:
+                handle = self.handles.get(service_name)
+                if handle is None:
+                    handle = self.handles[service_name] = reg.OpenKey(self.root, service_name)
+                _, _, stamp = reg.QueryInfoKey(handle)
+            except OSError:
+                COLLECTOR_LOG.error(f"Fehler beim Lesen des Dienstes {service_name}")
+                record_collector_error()
+                self._drop(service_name)
+                services[service_name] = None
+                continue
+            cached = self.entries.get(service_name)
+            if cached is None or cached[0] != stamp:
+                try:
+                    start_value, _ = reg.QueryValueEx(handle, "Start")
+                except OSError:
+                    COLLECTOR_LOG.error(f"Fehler beim Lesen des Dienstes {service_name}")
+                    record_collector_error()
+                    start_value = None
+                try:
+                    image_path, _ = reg.QueryValueEx(handle, "ImagePath")
+                except OSError:
+                    image_path = None
+                cached = self.entries[service_name] = (stamp, start_value, image_path)
+            services[service_name] = cached[1]
+            if cached[2]:
+                image_paths[service_name] = cached[2]
+        self.image_paths = image_paths
         return services
-    except Exception as e:
-        logging.error(f"Fehler beim Lesen der Dienste: {e}")
-        return {}
 
-def compare_services(prev, current):
-    messages = []
+SERVICES_CACHE = ServicesStartCache()
+
+def check_services_start_values(reg=None, cache=None):
+    reg = reg or winreg
+    if cache is not None:
+        try:
+            return cache.scan(reg)
+        except Exception:
+            # Handles verwerfen; der Fehler selbst geht an den CollectorExecutor
+            cache.close()
+            raise
+    services = {}
+    with reg.OpenKey(reg.HKEY_LOCAL_MACHINE, SERVICES_KEY_PATH) as key:
+        i = 0
+        while True:
+            try:
+                service_name = reg.EnumKey(key, i)
+                try:
+                    with reg.OpenKey(key, service_name) as service_key:
+                        start_value, _ = reg.QueryValueEx(service_key, "Start")
+                        services[service_name] = start_value
+                except OSError:
+                    COLLECTOR_LOG.error(f"Fehler beim Lesen des Dienstes {service_name}")
+                    record_collector_error()
+                    services[service_name] = None
+                i += 1
+            except OSError:
+                break
+    return services
+
+# Kompakter Quellenstand im Speicher: statt Dict bzw. Set je Quelle zwei parallele, nach Schlüssel
+# sortierte Tupel. Gleiche Strings innerhalb eines Zyklus (z.B. Wertnamen und Befehlszeilen aller
+# Benutzer) werden nur einmal gehalten. Lesend verhalten sich die Klassen wie dict bzw. set; die
+# Vergleiche laufen für zwei kompakte Stände als linearer Durchlauf über beide sortierten Folgen.
+class CompactMapping:
+    __slots__ = ("_keys", "_values")
+
+    def __init__(self, keys=(), values=()):
+        self._keys = keys
+        self._values = values
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __contains__(self, key):
+        index = bisect.bisect_left(self._keys, key) if isinstance(key, str) else len(self._keys)
+        return index < len(self._keys) and self._keys[index] == key
+
+    def __getitem__(self, key):
+        index = bisect.bisect_left(self._keys, key) if isinstance(key, str) else len(self._keys)
+        if index < len(self._keys) and self._keys[index] == key:
+            return self._values[index]
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        return self._keys
+
+    def values(self):
+        return self._values
+
+    def items(self):
+        return zip(self._keys, self._values)
+
+    def __eq__(self, other):
+        if isinstance(other, CompactMapping):
+            return self._keys == other._keys and self._values == other._values
+        if isinstance(other, dict):
+            return len(other) == len(self._keys) and all(key in other and other[key] == value for key, value in self.items())
+        return NotImplemented
+
+    def __repr__(self):
+        return f"CompactMapping({len(self._keys)} Einträge)"
+
+class CompactSet:
+    __slots__ = ("_items",)
+
+    def __init__(self, items=()):
+        self._items = items
+
+    def __len__(self):
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __contains__(self, item):
+        index = bisect.bisect_left(self._items, item) if isinstance(item, str) else len(self._items)
+        return index < len(self._items) and self._items[index] == item
+
+    # Mengenoperationen mit gewöhnlichen Sets liefern gewöhnliche Sets
+    def __sub__(self, other):
+        return set(self._items).difference(other)
+
+    def __rsub__(self, other):
+        return set(other).difference(self._items)
+
+    def __and__(self, other):
+        return set(self._items).intersection(other)
+
+    __rand__ = __and__
+
+    def __or__(self, other):
+        return set(self._items).union(other)
+
+    __ror__ = __or__
+
+    def __eq__(self, other):
+        if isinstance(other, CompactSet):
+            return self._items == other._items
+        if isinstance(other, (set, frozenset)):
+            return len(other) == len(self._items) and all(item in other for item in self._items)
+        return NotImplemented
+
+    def __repr__(self):
+        return f"CompactSet({len(self._items)} Einträge)"
+
+# Keine ABC-Unterklassen: isinstance gegen die konkreten Klassen bleibt so in _feed_digest billig
+collections.abc.Mapping.register(CompactMapping)
+collections.abc.Set.register(CompactSet)
+
+# Wandelt Daten eines Collectors in die kompakte Form. previous ist der letzte kompakte Stand derselben
+# Quelle, pool ein für den Zyklus gemeinsamer Vorrat bereits gesehener Strings. nested: Dict je
+# Benutzer (Mehrbenutzer-Quellen), dessen innere Dicts ebenfalls kompakt werden.
+# Andere Formen (z.B. nicht-String-Schlüssel) bleiben unverändert.
+def compact_snapshot(data, previous=None, nested=False, pool=None):
+    intern = ({} if pool is None else pool).setdefault
+    if isinstance(data, (set, frozenset)):
+        if not all(isinstance(item, str) for item in data):
+            return data
+        previous_items = previous._items if isinstance(previous, CompactSet) else ()
+        items = []
+        j, count = 0, len(previous_items)
+        for item in sorted(data):
+            while j < count and previous_items[j] < item:
+                j += 1
+            items.append(previous_items[j] if j < count and previous_items[j] == item else intern(item, item))
+        return CompactSet(tuple(items))
+    if not isinstance(data, dict) or not all(isinstance(key, str) for key in data):
+        return data
+    if isinstance(previous, CompactMapping):
+        previous_keys, previous_values = previous._keys, previous._values
+    else:
+        previous_keys = previous_values = ()
+    keys = []
+    values = []
+    j, count = 0, len(previous_keys)
+    # Gemeinsame Schlüssel und gleiche Werte übernehmen die Objekte des vorherigen Stands; der Vergleich
+    # erkennt Unverändertes dann schon an der Identität
+    for key in sorted(data):
+        value = data[key]
+        while j < count and previous_keys[j] < key:
+            j += 1
+        if j < count and previous_keys[j] == key:
+            old = previous_values[j]
+            keys.append(previous_keys[j])
+        else:
+            old = None
+            keys.append(intern(key, key))
+        if nested or isinstance(value, (set, frozenset)):
+            value = compact_snapshot(value, old, pool=pool)
+        elif old is not None and type(old) is type(value) and old == value:
+            value = old
+        elif type(value) is str:
+            value = intern(value, value)
+        values.append(value)
+    return CompactMapping(tuple(keys), tuple(values))
+
+def compact_source(name, data, previous=None, pool=None):
+    return compact_snapshot(data, previous, name in MULTI_USER_SOURCES, pool)
+
+# Linearer Vergleich zweier kompakter Stände; Reihenfolge wie beim Dict-Vergleich: geändert, neu, entfernt
+def compare_compact(prev, curr, source):
+    modified = []
+    added = []
+    removed = []
+    prev_keys, prev_values = prev._keys, prev._values
+    curr_keys, curr_values = curr._keys, curr._values
+    i = j = 0
+    prev_count, curr_count = len(prev_keys), len(curr_keys)
+    while i < prev_count and j < curr_count:
+        old_key = prev_keys[i]
+        new_key = curr_keys[j]
+        if old_key == new_key:
+            old = prev_values[i]
+            new = curr_values[j]
+            # Unveränderte Werte sind meist dasselbe Objekt
+            if old is not new and old != new:
+                modified.append(ChangeEvent(source, MODIFIED, new_key, old, new))
+            i += 1
+            j += 1
+        elif old_key < new_key:
+            removed.append(ChangeEvent(source, REMOVED, old_key, old=prev_values[i]))
+            i += 1
+        else:
+            added.append(ChangeEvent(source, ADDED, new_key, new=curr_values[j]))
+            j += 1
+    added.extend(ChangeEvent(source, ADDED, curr_keys[index], new=curr_values[index]) for index in range(j, curr_count))
+    removed.extend(ChangeEvent(source, REMOVED, prev_keys[index], old=prev_values[index]) for index in range(i, prev_count))
+    return modified + added + removed
+
+# Neue und entfernte Einträge zweier kompakter Sets, jeweils sortiert
+def merge_compact_sets(prev, curr):
+    added = []
+    removed = []
+    prev_items, curr_items = prev._items, curr._items
+    i = j = 0
+    prev_count, curr_count = len(prev_items), len(curr_items)
+    while i < prev_count and j < curr_count:
+        if prev_items[i] == curr_items[j]:
+            i += 1
+            j += 1
+        elif prev_items[i] < curr_items[j]:
+            removed.append(prev_items[i])
+            i += 1
+        else:
+            added.append(curr_items[j])
+            j += 1
+    added.extend(curr_items[j:])
+    removed.extend(prev_items[i:])
+    return added, removed
+
+def compare_services(prev, current, source="services"):
+    if isinstance(prev, CompactMapping) and isinstance(current, CompactMapping):
+        return compare_compact(prev, current, source)
+    events = []
     prev_services = prev or {}
     curr_services = current or {}
 
     for service in prev_services:
         if service in curr_services:
             if prev_services[service] != curr_services[service]:
-                messages.append(f"Dienst '{service}' Startwert geändert: von {prev_services[service]} nach {curr_services[service]}")
+                events.append(ChangeEvent(source, MODIFIED, service, prev_services[service], curr_services[service]))
     for service in curr_services:
         if service not in prev_services:
-            messages.append(f"Dienst '{service}' hinzugefügt mit Startwert {curr_services[service]}")
+            events.append(ChangeEvent(source, ADDED, service, new=curr_services[service]))
     for service in prev_services:
         if service not in curr_services:
-            messages.append(f"Dienst '{service}' entfernt")
-    return messages
-
-def check_scheduled_tasks():
-    return ["TaskA", "TaskB"]
-
-def compare_startup_folders(prev, current):
-    messages = []
-    prev_user = prev.get('user', set())
-    curr_user = current.get('user', set())
-    added = curr_user - prev_user
-    removed = prev_user - curr_user
-    if added:
-        messages.append("Startup-Ordner (user) Hinzugefügt: " + ", ".join(added))
-    if removed:
-        messages.append("Startup-Ordner (user) Entfernt: " + ", ".join(removed))
-    prev_common = prev.get('common', set())
-    curr_common = current.get('common', set())
-    added = curr_common - prev_common
-    removed = prev_common - curr_common
-    if added:
-        messages.append("Startup-Ordner (common) Hinzugefügt: " + ", ".join(added))
-    if removed:
-        messages.append("Startup-Ordner (common) Entfernt: " + ", ".join(removed))
-    return messages
-
-def compare_registry_entries(prev, curr):
-    messages = []
+            events.append(ChangeEvent(source, REMOVED, service, old=prev_services[service]))
+    return events
+
+TASKS_DIR = os.path.join(os.environ.get("SystemRoot", r"C:\Windows"), "System32", "Tasks")
+TASK_SECTIONS = ("Actions", "Triggers")
+
+# Liest eine Task-Definition per iterparse. Aktionen und Trigger werden als "Typ(Pfad=Text, ...)"
+# aus allen Blattelementen beschrieben, damit jede Änderung am Inhalt auffällt.
+def parse_task_xml(path):
+    from xml.etree.ElementTree import iterparse
+    enabled = True
+    sections = {name: [] for name in TASK_SECTIONS}
+    stack = []
+    fields = None
+    for event, elem in iterparse(path, events=("start", "end")):
+        name = elem.tag.rpartition("}")[2]
+        if event == "start":
+            stack.append(name)
+            if len(stack) == 3 and stack[1] in sections:
+                fields = []
+            continue
+        depth = len(stack)
+        if fields is not None and depth > 3 and len(elem) == 0 and elem.text and elem.text.strip():
+            fields.append(f"{'/'.join(stack[3:])}={elem.text.strip()}")
+        if depth == 3 and stack[1] in sections:
+            sections[stack[1]].append(f"{name}({', '.join(fields)})" if fields else name)
+            fields = None
+        elif depth == 3 and stack[1] == "Settings" and name == "Enabled":
+            enabled = (elem.text or "").strip().lower() != "false"
+        stack.pop()
+        if depth <= 2:
+            elem.clear()
+    return {"enabled": enabled, "actions": tuple(sections["Actions"]), "triggers": tuple(sections["Triggers"])}
+
+# Cache je Task-Datei nach (mtime, size) aus os.scandir; unter Windows liefert scandir diese
+# Angaben ohne zusätzlichen Systemaufruf, geparst werden nur neue oder geänderte Dateien.
+class ScheduledTaskCache:
+    def __init__(self):
+        self.root = None
+        self.entries = {}
+        self.denied = set()
+        self.last = {}
+        self.parsed = 0
+
+    def scan(self, root):
+        if root != self.root:
+            self.entries.clear()
+            self.denied.clear()
+            self.last = {}
+            self.root = root
+        tasks = {}
+        seen = set()
+        pending = [root]
+        while pending:
+            directory = pending.pop()
+            try:
+                with os.scandir(directory) as iterator:
+                    entries = list(iterator)
+            except OSError as e:
+                # Nicht lesbare Ordner gleichbleibend überspringen und nur einmal melden, aber in jedem Zyklus zählen
+                if directory not in self.denied:
+                    self.denied.add(directory)
+                    COLLECTOR_LOG.error(f"Task-Ordner {directory} nicht lesbar: {e}")
+                if directory == root:
+                    # Letzten bekannten Stand liefern statt alle Tasks als entfernt zu melden
+                    record_collector_error("error")
+                    return dict(self.last)
+                record_collector_error()
+                continue
+            if directory in self.denied:
+                self.denied.discard(directory)
+                COLLECTOR_LOG.info(f"Task-Ordner {directory} wieder lesbar")
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+                    continue
+                if not entry.is_file(follow_symlinks=False):
+                    continue
+                try:
+                    stat = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                stamp = (stat.st_mtime_ns, stat.st_size)
+                cached = self.entries.get(entry.path)
+                if cached is None or cached[0] != stamp:
+                    try:
+                        task = parse_task_xml(entry.path)
+                    except Exception as e:
+                        COLLECTOR_LOG.error(f"Fehler beim Lesen der Task-Definition {entry.path}: {e}")
+                        record_collector_error()
+                        task = None
+                    cached = self.entries[entry.path] = (stamp, task)
+                    self.parsed += 1
+                seen.add(entry.path)
+                # Tasknamen wie in der Aufgabenplanung: "\Ordner\Name"
+                tasks["\\" + os.path.relpath(entry.path, root).replace(os.sep, "\\")] = cached[1]
+        for path in set(self.entries) - seen:
+            del self.entries[path]
+        self.last = tasks
+        return tasks
+
+TASKS_CACHE = ScheduledTaskCache()
+
+def check_scheduled_tasks(root=None, cache=None):
+    return (cache or ScheduledTaskCache()).scan(root or TASKS_DIR)
+
+def compare_startup_folders(prev, current, source="startup_folders", scopes=("user", "common")):
+    events = []
+    for scope in scopes:
+        prev_files = prev.get(scope, set())
+        curr_files = current.get(scope, set())
+        if isinstance(prev_files, CompactSet) and isinstance(curr_files, CompactSet):
+            added, removed = merge_compact_sets(prev_files, curr_files)
+        else:
+            added, removed = sorted(curr_files - prev_files), sorted(prev_files - curr_files)
+        for name in added:
+            events.append(ChangeEvent(source, ADDED, f"{scope}\\{name}"))
+        for name in removed:
+            events.append(ChangeEvent(source, REMOVED, f"{scope}\\{name}"))
+    return events
+
+# Nur Benutzer vergleichen, die in beiden Ständen vorkommen: An- und Abmelden (Hive geladen
+# oder nicht) sowie neu angelegte Profile sind keine Autostart-Änderungen
+def compare_user_startup_folders(prev, current, source="user_startup_folders"):
+    return compare_startup_folders(prev, current, source, sorted(set(prev) & set(current)))
+
+def compare_user_registry(prev, current, source="user_registry"):
+    events = []
+    for user in sorted(set(prev) & set(current)):
+        for event in compare_registry_entries(prev[user], current[user], source):
+            event.key = f"{user}\\{event.key}"
+            events.append(event)
+    return events
+
+def format_value(value, limit=80):
+    # Große REG_BINARY- und REG_MULTI_SZ-Werte nur gekürzt ausgeben
+    if isinstance(value, (bytes, bytearray)):
+        preview = bytes(value[:limit // 3]).hex(" ")
+        return preview + (f" … ({len(value)} Bytes)" if len(value) > limit // 3 else "")
+    if isinstance(value, (list, tuple)):
+        text = "; ".join(str(item) for item in value[:10])
+        if len(value) > 10:
+            text += f" … ({len(value)} Einträge)"
+    elif isinstance(value, dict):
+        text = "; ".join(f"{name}={format_value(item, limit)}" for name, item in value.items())
+    else:
+        text = str(value)
+    return text if len(text) <= limit else text[:limit] + " …"
+
+def compare_registry_entries(prev, curr, source="registry"):
+    if isinstance(prev, CompactMapping) and isinstance(curr, CompactMapping):
+        return compare_compact(prev, curr, source)
+    events = []
     prev_keys = set(prev.keys())
     curr_keys = set(curr.keys())
     common_keys = prev_keys.intersection(curr_keys)
     for key in common_keys:
         try:
-            if str(prev[key]) != str(curr[key]):
-                messages.append(f"Registry {key} geändert: von {prev[key]} zu {curr[key]}")
+            # Typisierter Vergleich: bytes/Listen direkt, ohne sie in Strings umzuwandeln
+            if prev[key] != curr[key]:
+                events.append(ChangeEvent(source, MODIFIED, key, prev[key], curr[key]))
         except Exception as e:
-            logging.error(f"Fehler beim Vergleich von Registry Eintrag {key}: {e}")
+            ENGINE_LOG.error(f"Fehler beim Vergleich von Registry Eintrag {key}: {e}")
     for key in curr_keys - prev_keys:
-        messages.append(f"Registry {key} hinzugefügt: {curr[key]}")
+        events.append(ChangeEvent(source, ADDED, key, new=curr[key]))
     for key in prev_keys - curr_keys:
-        messages.append(f"Registry {key} entfernt: {prev[key]}")
-    return messages
-
-def compare_tasks(prev, current):
-    messages = []
-    prev_set = set(prev)
-    curr_set = set(current)
-    added = curr_set - prev_set
-    removed = prev_set - curr_set
-    if added:
-        messages.append("Geplante Tasks Hinzugefügt: " + ", ".join(added))
-    if removed:
-        messages.append("Geplante Tasks Entfernt: " + ", ".join(removed))
-    return messages
-
-class CustomDialog(QDialog):
-    def __init__(self, title: str, message: str, change_type: str, parent=None):
-        super().__init__(parent)
-        self.setWindowTitle(title)
-        self.message = message
-        self.change_type = change_type
-
-        layout = QVBoxLayout()
-        self.setLayout(layout)
-
-        text_label = QLabel(message)
-        text_label.setWordWrap(True)
-        layout.addWidget(text_label)
-
-        button_box = QHBoxLayout()
-
-        if change_type == "registry":
-            reg_button = QPushButton("Regedit öffnen")
-            reg_button.clicked.connect(lambda: os.startfile("regedit.exe"))
-            button_box.addWidget(reg_button)
-
-        if change_type == "tasks":
-            tasks_button = QPushButton("Taskplanung öffnen")
-            tasks_button.clicked.connect(lambda: os.startfile("taskschd.msc"))
-            button_box.addWidget(tasks_button)
-
-        if change_type == "services":
-            services_button = QPushButton("Dienste öffnen")
-            services_button.clicked.connect(lambda: os.startfile("services.msc"))
-            button_box.addWidget(services_button)
-
-        autoruns_button = QPushButton("Autoruns.exe starten")
-        autoruns_button.clicked.connect(self.start_autoruns)
-        button_box.addWidget(autoruns_button)
-
-        cancel_button = QPushButton("Abbrechen")
-        cancel_button.clicked.connect(self.reject)
-        button_box.addWidget(cancel_button)
-
-        layout.addLayout(button_box)
-
-    def start_autoruns(self):
-        try:
-            if not os.path.exists("autoruns.exe"):
-                url = "https://live.sysinternals.com/autoruns.exe"
-                response = subprocess.check_output([
-                    "powershell.exe",
-                    "-Command",
-                    f"Invoke-WebRequest -Uri '{url}' -OutFile 'autoruns.exe'"
-                ])
-            subprocess.Popen(["autoruns.exe"])
-        except Exception as e:
-            logging.error(f"Fehler beim Starten von Autoruns.exe: {e}")
+        events.append(ChangeEvent(source, REMOVED, key, old=prev[key]))
+    return events
+
+TASK_FIELDS = ("enabled", "actions", "triggers")
+
+def compare_tasks(prev, current, source="tasks"):
+    events = []
+    # Ältere Basis bestand nur aus Namen ohne Felder und taugt nicht zum Vergleich
+    if not isinstance(prev, (dict, CompactMapping)) or not isinstance(current, (dict, CompactMapping)):
+        return events
+    if isinstance(prev, CompactMapping) and isinstance(current, CompactMapping):
+        merged = compare_compact(prev, current, source)
+        events.extend(event for event in merged if event.kind != MODIFIED)
+        common = [(event.key, event.old, event.new) for event in merged if event.kind == MODIFIED]
+    else:
+        prev_set = set(prev)
+        curr_set = set(current)
+        for name in sorted(curr_set - prev_set):
+            events.append(ChangeEvent(source, ADDED, name, new=current[name]))
+        for name in sorted(prev_set - curr_set):
+            events.append(ChangeEvent(source, REMOVED, name, old=prev[name]))
+        common = [(name, prev[name], current[name]) for name in sorted(prev_set & curr_set)]
+    for name, old_task, new_task in common:
+        old_task = old_task or {}
+        new_task = new_task or {}
+        # Je Task nur die geänderten Felder melden
+        changed = [field for field in TASK_FIELDS if old_task.get(field) != new_task.get(field)]
+        if changed:
+            events.append(ChangeEvent(
+                source, MODIFIED, name,
+                {field: old_task.get(field) for field in changed},
+                {field: new_task.get(field) for field in changed}
+            ))
+    return events
+
+COLLECTORS = {
+    "startup_folders": check_startup_folders,
+    **{name: functools.partial(check_registry_location, name) for name in ASEP_LOCATIONS},
+    "services": functools.partial(check_services_start_values, cache=SERVICES_CACHE),
+    "service_status": check_system_services,
+    "tasks": functools.partial(check_scheduled_tasks, cache=TASKS_CACHE),
+    "user_registry": check_user_registry,
+    "user_startup_folders": check_user_startup_folders
+}
 
-class AutostartMonitorWindow(QMainWindow):
-    def __init__(self):
-        super().__init__()
-        self.settings = DEFAULT_SETTINGS.copy()
-        self.load_settings()
-        self.setWindowTitle("Autostart Monitor")
-        self.resize(600, 500)
-
-        self.central = QWidget()
-        self.setCentralWidget(self.central)
-        self.main_layout = QVBoxLayout(self.central)
-        self.main_layout.setContentsMargins(20, 20, 20, 20)
-        self.main_layout.setSpacing(15)
-
-        header = QLabel("Autostart Monitor")
-        header.setFont(QFont("Segoe UI", 18, QFont.Weight.Bold))
-        header.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.main_layout.addWidget(header)
-
-        self.grp_methods = QGroupBox("Zu überwachende Methoden:")
-        self.grp_methods.setFont(QFont("Segoe UI", 10, QFont.Weight.Bold))
-        self.methods_layout = QVBoxLayout()
-        self.grp_methods.setLayout(self.methods_layout)
-        self.chk_startup = QCheckBox("Startup-Ordner")
-        self.chk_registry = QCheckBox("Registry-Einträge (HKCU)")
-        self.chk_reg_hklm_run = QCheckBox("Registry (HKLM Run)")
-        self.chk_ctx_star = QCheckBox("Kontextmenü Handler (* ShellEx)")
-        self.chk_ctx_allfilesystem = QCheckBox("Kontextmenü Handler (AllFilesystemObjects)")
-        self.chk_ctx_directory = QCheckBox("Kontextmenü Handler (Directory)")
-        self.chk_ctx_directory_bg = QCheckBox("Kontextmenü Handler (Directory Hintergrund)")
-        self.chk_folder_ctx = QCheckBox("Kontextmenü Handler (Folder)")
-        self.chk_directory_dragdrop = QCheckBox("Kontextmenü Handler (Directory)")
-        self.chk_services = QCheckBox("Dienste")
-        self.chk_tasks = QCheckBox("Geplante Tasks")
-        self.methods_layout.addWidget(self.chk_startup)
-        self.methods_layout.addWidget(self.chk_registry)
-        self.methods_layout.addWidget(self.chk_reg_hklm_run)
-        self.methods_layout.addWidget(self.chk_ctx_star)
-        self.methods_layout.addWidget(self.chk_ctx_allfilesystem)
-        self.methods_layout.addWidget(self.chk_ctx_directory)
-        self.methods_layout.addWidget(self.chk_ctx_directory_bg)
-        self.methods_layout.addWidget(self.chk_folder_ctx)
-        self.methods_layout.addWidget(self.chk_directory_dragdrop)
-        self.methods_layout.addWidget(self.chk_services)
-        self.methods_layout.addWidget(self.chk_tasks)
-        self.main_layout.addWidget(self.grp_methods)
-
-        self.grp_notifications = QGroupBox("Benachrichtigungswege:")
-        self.grp_notifications.setFont(QFont("Segoe UI", 10, QFont.Weight.Bold))
-        self.noti_layout = QVBoxLayout()
-        self.grp_notifications.setLayout(self.noti_layout)
-        self.chk_toast = QCheckBox("Windows-Benachrichtigung")
-        self.chk_dialog = QCheckBox("Dialog")
-        self.noti_layout.addWidget(self.chk_toast)
-        self.noti_layout.addWidget(self.chk_dialog)
-        self.main_layout.addWidget(self.grp_notifications)
-
-        self.grp_settings = QGroupBox("Einstellungen:")
-        self.grp_settings.setFont(QFont("Segoe UI", 10, QFont.Weight.Bold))
-        self.settings_layout = QFormLayout()
-        self.grp_settings.setLayout(self.settings_layout)
-
-        self.cmb_language = QComboBox()
-        self.cmb_language.addItems(["de", "en"])
-        self.settings_layout.addRow("Sprache:", self.cmb_language)
-
-        self.chk_dark_mode = QCheckBox("Dark Mode")
-        self.settings_layout.addRow("Dark Mode:", self.chk_dark_mode)
-
-        self.sld_interval = QSlider(Qt.Orientation.Horizontal)
-        self.sld_interval.setRange(10, 300)
-        self.sld_interval.setTickInterval(10)
-        self.lbl_interval = QLabel("60 Sek.")
-        interval_layout = QHBoxLayout()
-        interval_layout.addWidget(self.sld_interval)
-        interval_layout.addWidget(self.lbl_interval)
-        self.settings_layout.addRow("Scanintervall:", interval_layout)
-        self.main_layout.addWidget(self.grp_settings)
-
-        self.chk_autostart = QCheckBox("Automatisch beim Programmstart nach 20 Sekunden verstecken")
-        self.main_layout.addWidget(self.chk_autostart)
-
-        self.btn_toggle = QPushButton("Überwachung starten")
-        self.btn_toggle.setFont(QFont("Segoe UI", 11))
-        self.main_layout.addWidget(self.btn_toggle)
-
-        self.monitoring_active = False
-        self.monitor_thread = None
-        self.stop_flag = threading.Event()
-
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.update_interval_label)
-        self.sld_interval.valueChanged.connect(self.update_interval_label)
-
-        self.theme_animation = QVariantAnimation(
-            self,
-            startValue=QColor("#E0E0E0"),
-            endValue=QColor("#2E2E2E"),
-            duration=300,
-            valueChanged=self.on_theme_animate,
-            easingCurve=QEasingCurve.Type.InOutQuad
-        )
+COMPARATORS = {
+    "startup_folders": compare_startup_folders,
+    **{name: compare_registry_entries for name in ASEP_LOCATIONS},
+    "services": compare_services,
+    "service_status": compare_services,
+    "tasks": compare_tasks,
+    "user_registry": compare_user_registry,
+    "user_startup_folders": compare_user_startup_folders
+}
 
-        self.setup_signals()
-        self.apply_settings()
-        self.apply_style()
-
-    def setup_signals(self):
-        self.btn_toggle.clicked.connect(self.toggle_monitoring)
-        self.cmb_language.currentTextChanged.connect(self.update_language)
-        self.chk_dark_mode.stateChanged.connect(self.toggle_theme)
-        self.chk_autostart.stateChanged.connect(self.toggle_autostart)
-        self.chk_startup.stateChanged.connect(self.save_settings)
-        self.chk_registry.stateChanged.connect(self.save_settings)
-        self.chk_reg_hklm_run.stateChanged.connect(self.save_settings)
-        self.chk_ctx_star.stateChanged.connect(self.save_settings)
-        self.chk_ctx_allfilesystem.stateChanged.connect(self.save_settings)
-        self.chk_ctx_directory.stateChanged.connect(self.save_settings)
-        self.chk_ctx_directory_bg.stateChanged.connect(self.save_settings)
-        self.chk_folder_ctx.stateChanged.connect(self.save_settings)
-        self.chk_directory_dragdrop.stateChanged.connect(self.save_settings)
-        self.chk_services.stateChanged.connect(self.save_settings)
-        self.chk_tasks.stateChanged.connect(self.save_settings)
-        self.chk_toast.stateChanged.connect(self.save_settings)
-        self.chk_dialog.stateChanged.connect(self.save_settings)
-        self.cmb_language.currentTextChanged.connect(self.save_settings)
-        self.sld_interval.valueChanged.connect(self.save_settings)
-        self.chk_dark_mode.stateChanged.connect(self.save_settings)
-        self.chk_autostart.stateChanged.connect(self.save_settings)
-
-    def apply_settings(self):
-        s = self.settings
-        self.chk_startup.setChecked(s["selected_methods"].get("startup_folders", True))
-        self.chk_registry.setChecked(s["selected_methods"].get("registry", True))
-        self.chk_reg_hklm_run.setChecked(s["selected_methods"].get("registry_hklm_run", True))
-        self.chk_ctx_star.setChecked(s["selected_methods"].get("context_handlers_star", True))
-        self.chk_ctx_allfilesystem.setChecked(s["selected_methods"].get("context_handlers_allfilesystem", True))
-        self.chk_ctx_directory.setChecked(s["selected_methods"].get("context_handlers_directory", True))
-        self.chk_ctx_directory_bg.setChecked(s["selected_methods"].get("context_handlers_directory_bg", True))
-        self.chk_folder_ctx.setChecked(s["selected_methods"].get("folder_context_handlers", True))
-        self.chk_directory_dragdrop.setChecked(s["selected_methods"].get("directory_dragdrop_handlers", True))
-        self.chk_services.setChecked(s["selected_methods"].get("services", True))
-        self.chk_tasks.setChecked(s["selected_methods"].get("tasks", True))
-        self.chk_toast.setChecked(s["notification_methods"].get("windows_toast", True))
-        self.chk_dialog.setChecked(s["notification_methods"].get("dialog", True))
-        self.chk_autostart.setChecked(s.get("auto_start", False))
-        self.cmb_language.setCurrentText(s.get("language", "de"))
-        self.chk_dark_mode.setChecked(s.get("dark_mode", False))
-        self.sld_interval.setValue(s.get("scan_interval", 60))
-        self.lbl_interval.setText(f"{self.sld_interval.value()} Sek.")
-        self.update_language()
-
-    def apply_style(self):
-        base_color = "#2E2E2E" if self.chk_dark_mode.isChecked() else "#E0E0E0"
-        text_color = "#FFFFFF" if self.chk_dark_mode.isChecked() else "#000000"
-        accent_color = "#5DADE2"
-        self.setStyleSheet(f"""
-            QWidget {{
-                background-color: {base_color};
-                color: {text_color};
-                font-family: "Segoe UI";
-            }}
-            QGroupBox {{
-                border: 2px solid {accent_color};
-                border-radius: 10px;
-                margin-top: 10px;
-            }}
-            QGroupBox::title {{
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 5px;
-            }}
-            QCheckBox::indicator {{
-                width: 18px;
-                height: 18px;
-            }}
-            QSlider::groove:horizontal {{
-                border: 1px solid #999;
-                height: 8px;
-                border-radius: 4px;
-                background: {accent_color};
-            }}
-            QSlider::handle:horizontal {{
-                background: {text_color};
-                border: 1px solid {accent_color};
-                width: 18px;
-                margin: -5px 0;
-                border-radius: 9px;
-            }}
-            QPushButton {{
-                background-color: {accent_color};
-                border: none;
-                border-radius: 10px;
-                padding: 10px;
-            }}
-            QPushButton:hover {{
-                background-color: #3498DB;
-            }}
-        """)
-
-    def on_theme_animate(self, value):
-        self.central.setStyleSheet(f"background-color: {value.name()};")
-        
-    def toggle_theme(self):
-        # Angepasst: Setzt explizit Start- und Endfarbe, je nachdem ob Dark Mode aktiviert ist
-        if self.chk_dark_mode.isChecked():
-            self.theme_animation.setStartValue(QColor("#E0E0E0"))
-            self.theme_animation.setEndValue(QColor("#2E2E2E"))
+TARGETS_SUFFIX = ":targets"
+SYSTEM_ROOT = os.environ.get("SystemRoot", r"C:\Windows")
+
+def target_source(name):
+    return name + TARGETS_SUFFIX
+
+def base_source(name):
+    return name[:-len(TARGETS_SUFFIX)] if name.endswith(TARGETS_SUFFIX) else name
+
+# Löst eine Befehlszeile wie Windows auf: Anführungszeichen, sonst das kürzeste vorhandene Präfix
+# vor einem Leerzeichen ("C:\Program Files\x.exe -a"); rundll32 zeigt auf die DLL im Argument.
+def resolve_command_path(command):
+    if not isinstance(command, str) or not command.strip():
+        return None
+    command = os.path.expandvars(command.strip())
+    if command.startswith('"'):
+        path, _, rest = command[1:].partition('"')
+    else:
+        parts = command.split(" ")
+        path, rest = parts[0], " ".join(parts[1:])
+        for i in range(1, len(parts) + 1):
+            candidate = " ".join(parts[:i])
+            if os.path.isfile(candidate) or os.path.isfile(candidate + ".exe"):
+                path, rest = candidate, " ".join(parts[i:])
+                break
+    if not os.path.isfile(path) and os.path.isfile(path + ".exe"):
+        path += ".exe"
+    if os.path.basename(path).lower() == "rundll32.exe" and rest.strip():
+        return resolve_command_path(rest.strip().split(",")[0])
+    if not os.path.dirname(path):
+        path = shutil.which(path) or path
+    return path
+
+def resolve_registry_targets(data):
+    return {name: resolve_command_path(value) for name, value in data.items() if isinstance(value, str)}
+
+def resolve_startup_targets(data):
+    # .lnk-Dateien werden selbst gehasht; ein geändertes Verknüpfungsziel ändert deren Inhalt
+    directories = {"user": USER_STARTUP_DIR, "common": COMMON_STARTUP_DIR}
+    return {
+        f"{scope}\\{name}": os.path.join(directories[scope], name)
+        for scope, names in data.items() if scope in directories for name in names
+    }
+
+def resolve_user_registry_targets(data):
+    return {
+        f"{user}\\{key}": resolve_command_path(value)
+        for user, entries in data.items() for key, value in entries.items()
+        if isinstance(value, str) and ASEP_LOCATIONS[key.partition("\\")[0]].targets
+    }
+
+def resolve_user_startup_targets(data, scanner=None):
+    directories = (scanner or USER_SCANNER).startup_dirs
+    return {
+        f"{user}\\{name}": os.path.join(directories[user], name)
+        for user, names in data.items() if user in directories for name in names
+    }
+
+def resolve_service_targets(data, cache=None):
+    targets = {}
+    for name, image_path in (cache.image_paths if cache is not None else {}).items():
+        if name not in data:
+            continue
+        # Treiber stehen oft als "\SystemRoot\..." , "\??\C:\..." oder relativ zu SystemRoot
+        if image_path.lower().startswith("\\systemroot\\"):
+            image_path = os.path.join(SYSTEM_ROOT, image_path[len("\\systemroot\\"):])
+        elif image_path.startswith("\\??\\"):
+            image_path = image_path[4:]
+        elif image_path.lower().startswith("system32\\"):
+            image_path = os.path.join(SYSTEM_ROOT, image_path)
+        targets[name] = resolve_command_path(image_path)
+    return targets
+
+HASH_MMAP_THRESHOLD = 16 * 1024 * 1024
+HASH_CHUNK_SIZE = 1024 * 1024
+
+def hash_file(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size >= HASH_MMAP_THRESHOLD:
+            import mmap
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                digest.update(view)
         else:
-            self.theme_animation.setStartValue(QColor("#2E2E2E"))
-            self.theme_animation.setEndValue(QColor("#E0E0E0"))
-        self.theme_animation.start()
-        self.apply_style()
-
-    def update_language(self):
-        lang = self.cmb_language.currentText()
-        if lang == "de":
-            self.grp_methods.setTitle("Zu überwachende Methoden:")
-            self.chk_startup.setText("Startup-Ordner")
-            self.chk_registry.setText("Registry-Einträge (HKCU)")
-            self.chk_reg_hklm_run.setText("Registry (HKLM Run)")
-            self.chk_ctx_star.setText("Kontextmenü Handler (* ShellEx)")
-            self.chk_ctx_allfilesystem.setText("Kontextmenü Handler (AllFilesystemObjects)")
-            self.chk_ctx_directory.setText("Kontextmenü Handler (Directory)")
-            self.chk_ctx_directory_bg.setText("Kontextmenü Handler (Directory Hintergrund)")
-            self.chk_folder_ctx.setText("Kontextmenü Handler (Folder)")
-            self.chk_directory_dragdrop.setText("Kontextmenü Handler (Directory)")
-            self.chk_services.setText("Dienste")
-            self.chk_tasks.setText("Geplante Tasks")
-            self.grp_notifications.setTitle("Benachrichtigungswege:")
-            self.chk_toast.setText("Windows-Benachrichtigung")
-            self.chk_dialog.setText("Dialog")
-            self.chk_autostart.setText("Automatisch beim Programmstart nach 20 Sekunden verstecken")
-            self.btn_toggle.setText("Überwachung starten" if not self.monitoring_active else "Überwachung stoppen")
+            while True:
+                chunk = f.read(HASH_CHUNK_SIZE)
+                if not chunk:
+                    break
+                digest.update(chunk)
+    return digest.hexdigest()
+
+# Hashes der Zieldateien, zwischengespeichert nach (Größe, mtime, Inode bzw. Datei-ID unter Windows).
+# Unveränderte Dateien kosten nur ein stat(); neu zu lesende werden parallel gehasht.
+class TargetHasher:
+    def __init__(self, max_workers=2, max_age=86400):
+        self.pool = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="hasher")
+        self.lock = threading.Lock()
+        self.entries = {}
+        self.max_age = max_age
+        self.hashed = 0
+
+    # previous: letzter Stand der Zielquelle (Schlüssel -> (Pfad, Hash)). Scheitert das Hashen
+    # vorübergehend, bleibt der Eintrag mit dem bisherigen Hash (sonst None) erhalten, damit ein
+    # in dieser Zeit ausgetauschtes Ziel beim nächsten erfolgreichen Hash noch gemeldet wird
+    def hash_targets(self, targets, previous=None):
+        now = time.monotonic()
+        pending = {}
+        digests = {}
+        failed = set()
+        for path in set(filter(None, targets.values())):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                failed.add(path)
+                continue
+            stamp = (stat.st_size, stat.st_mtime_ns, stat.st_ino)
+            with self.lock:
+                cached = self.entries.get(path)
+            if cached is not None and cached[0] == stamp:
+                digests[path] = cached[1]
+                with self.lock:
+                    self.entries[path] = (stamp, cached[1], now)
+            else:
+                pending[path] = (stamp, self.pool.submit(hash_file, path))
+        for path, (stamp, future) in pending.items():
+            try:
+                digests[path] = future.result()
+            except Exception as e:
+                COLLECTOR_LOG.error(f"Fehler beim Hashen von {path}: {e}")
+                failed.add(path)
+                continue
+            with self.lock:
+                self.entries[path] = (stamp, digests[path], now)
+                self.hashed += 1
+        with self.lock:
+            for path in [path for path, entry in self.entries.items() if now - entry[2] > self.max_age]:
+                del self.entries[path]
+        result = {}
+        for key, path in targets.items():
+            if path in digests:
+                result[key] = (path, digests[path])
+            elif path in failed:
+                old = previous.get(key) if previous is not None else None
+                result[key] = (path, old[1] if old is not None and old[0] == path else None)
+        return result
+
+    def shutdown(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+# Meldet nur Inhaltsänderungen bei gleichem Pfad; neue, entfernte oder umgebogene Einträge
+# meldet bereits der Vergleich der Basisquelle. Ohne Hash (None) gibt es nichts zu vergleichen.
+def compare_targets(prev, current, source):
+    events = []
+    for key in sorted(set(prev) & set(current), key=str):
+        old_path, old_digest = prev[key]
+        new_path, new_digest = current[key]
+        if old_path == new_path and None not in (old_digest, new_digest) and old_digest != new_digest:
+            events.append(ChangeEvent(source, MODIFIED_TARGET, key, old_digest, new_digest))
+    return events
+
+TARGET_RESOLVERS = {
+    "startup_folders": resolve_startup_targets,
+    **{name: resolve_registry_targets for name, location in ASEP_LOCATIONS.items() if location.targets},
+    "services": functools.partial(resolve_service_targets, cache=SERVICES_CACHE),
+    "user_registry": resolve_user_registry_targets,
+    "user_startup_folders": resolve_user_startup_targets
+}
+
+COMPARATORS.update({target_source(name): compare_targets for name in TARGET_RESOLVERS})
+
+def _digest_sort_key(value):
+    return (type(value).__name__, value)
+
+def _feed_digest(h, value):
+    if isinstance(value, (dict, CompactMapping)):
+        h.update(b"d%d:" % len(value))
+        for key in sorted(value, key=_digest_sort_key):
+            _feed_digest(h, key)
+            _feed_digest(h, value[key])
+    elif isinstance(value, (set, frozenset, CompactSet)):
+        h.update(b"S%d:" % len(value))
+        for item in sorted(value, key=_digest_sort_key):
+            _feed_digest(h, item)
+    elif isinstance(value, (list, tuple)):
+        # Reihenfolge ist bei REG_MULTI_SZ relevant und bleibt erhalten
+        h.update(b"l%d:" % len(value))
+        for item in value:
+            _feed_digest(h, item)
+    elif isinstance(value, (bytes, bytearray)):
+        h.update(b"b%d:" % len(value))
+        h.update(value)
+    elif isinstance(value, str):
+        data = value.encode("utf-8", "surrogatepass")
+        h.update(b"s%d:" % len(data))
+        h.update(data)
+    elif isinstance(value, bool):
+        h.update(b"T" if value else b"F")
+    elif isinstance(value, int):
+        h.update(b"i%d;" % value)
+    elif value is None:
+        h.update(b"n")
+    else:
+        data = repr(value).encode("utf-8", "surrogatepass")
+        h.update(b"r%d:" % len(data))
+        h.update(data)
+
+def snapshot_digest(data):
+    h = hashlib.blake2b(digest_size=16)
+    _feed_digest(h, data)
+    return h.digest()
+
+SNAPSHOT_FILE = "snapshot.json.gz"
+SNAPSHOT_SCHEMA_VERSION = 1
+
+def _encode_snapshot_value(value):
+    if isinstance(value, (dict, CompactMapping)):
+        encoded = {key: _encode_snapshot_value(item) for key, item in value.items()}
+        # Einzelne Schlüssel mit "$" würden sonst mit den Typ-Markern kollidieren
+        if len(value) == 1 and next(iter(value)).startswith("$"):
+            return {"$dict": [[key, item] for key, item in encoded.items()]}
+        return encoded
+    if isinstance(value, (set, frozenset, CompactSet)):
+        return {"$set": sorted(_encode_snapshot_value(item) for item in value)}
+    if isinstance(value, (bytes, bytearray)):
+        return {"$bytes": base64.b64encode(value).decode("ascii")}
+    if isinstance(value, tuple):
+        return {"$tuple": [_encode_snapshot_value(item) for item in value]}
+    if isinstance(value, list):
+        return [_encode_snapshot_value(item) for item in value]
+    return value
+
+def _decode_snapshot_value(value):
+    if isinstance(value, dict):
+        if len(value) == 1:
+            marker, item = next(iter(value.items()))
+            if marker == "$set":
+                return {_decode_snapshot_value(entry) for entry in item}
+            if marker == "$bytes":
+                return base64.b64decode(item)
+            if marker == "$tuple":
+                return tuple(_decode_snapshot_value(entry) for entry in item)
+            if marker == "$dict":
+                return {key: _decode_snapshot_value(entry) for key, entry in item}
+        return {key: _decode_snapshot_value(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_decode_snapshot_value(item) for item in value]
+    return value
+
+def encode_snapshot(state, digests):
+    payload = {
+        "schema": SNAPSHOT_SCHEMA_VERSION,
+        "saved": time.time(),
+        "sources": {
+            name: {"digest": digests[name].hex(), "data": _encode_snapshot_value(data)}
+            for name, data in state.items() if name in digests
+        }
+    }
+    return gzip.compress(json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8"), compresslevel=6)
+
+def decode_snapshot(data, origin="Snapshot"):
+    payload = json.loads(gzip.decompress(data).decode("utf-8"))
+    if payload.get("schema") != SNAPSHOT_SCHEMA_VERSION:
+        ENGINE_LOG.warning(f"{origin} hat Schema {payload.get('schema')}, erwartet {SNAPSHOT_SCHEMA_VERSION}; wird ignoriert")
+        return {}, {}
+    state = {}
+    digests = {}
+    for name, entry in payload["sources"].items():
+        state[name] = _decode_snapshot_value(entry["data"])
+        digests[name] = bytes.fromhex(entry["digest"])
+    return state, digests
+
+def save_snapshot(state, digests, path=SNAPSHOT_FILE):
+    data = encode_snapshot(state, digests)
+    # Atomar schreiben: temporäre Datei im selben Verzeichnis, dann ersetzen
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=".snapshot-", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+def load_snapshot(path=SNAPSHOT_FILE):
+    if not os.path.exists(path):
+        return {}, {}
+    try:
+        with open(path, "rb") as f:
+            return decode_snapshot(f.read(), f"Snapshot {path}")
+    except Exception as e:
+        ENGINE_LOG.error(f"Fehler beim Laden des Snapshots {path}: {e}")
+        return {}, {}
+
+HISTORY_FILE = "history.sqlite3"
+# Aufbewahrung löscht höchstens so viele Zeilen bzw. gibt so viele Seiten je Sperrphase frei
+HISTORY_RETENTION_BATCH = 5000
+HISTORY_VACUUM_PAGES = 2000
+HISTORY_RETENTION_PAUSE = 0.005
+
+def _encode_history_value(value):
+    if value is None:
+        return None
+    return json.dumps(_encode_snapshot_value(value), ensure_ascii=False, separators=(",", ":"))
+
+def decode_history_value(text):
+    if text is None:
+        return None
+    return _decode_snapshot_value(json.loads(text))
+
+# Eingebettete Änderungshistorie (SQLite) mit Indizes auf Zeit, Quelle und Schlüssel.
+# Eine Verbindung für alle Threads, abgesichert über ein Lock; Seiten werden per
+# Keyset-Paginierung über die id gelesen, damit auch Millionen Zeilen schnell bleiben.
+class ChangeHistory:
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS changes (
+            id INTEGER PRIMARY KEY,
+            ts REAL NOT NULL,
+            source TEXT NOT NULL,
+            kind TEXT NOT NULL,
+            key TEXT NOT NULL,
+            old TEXT,
+            new TEXT
+        );
+        CREATE INDEX IF NOT EXISTS changes_ts ON changes(ts);
+        CREATE INDEX IF NOT EXISTS changes_source ON changes(source, id);
+        CREATE INDEX IF NOT EXISTS changes_key ON changes(key, id);
+    """
+    COLUMNS = "id, ts, source, kind, key, old, new"
+
+    def __init__(self, path=HISTORY_FILE):
+        import sqlite3
+        self.path = path
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        with self.lock:
+            # auto_vacuum muss vor dem Anlegen der Tabellen gesetzt sein
+            self.connection.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+            self.connection.executescript(self.SCHEMA)
+            self.connection.commit()
+        self.last_maintenance = 0.0
+        self.maintenance = None
+        self.closed = False
+
+    def record(self, events, ts=None):
+        ts = time.time() if ts is None else ts
+        rows = [
+            (ts, event.source, event.kind, str(event.key), _encode_history_value(event.old), _encode_history_value(event.new))
+            for event in events
+        ]
+        with self.lock:
+            self.connection.executemany(
+                "INSERT INTO changes (ts, source, kind, key, old, new) VALUES (?, ?, ?, ?, ?, ?)", rows
+            )
+            self.connection.commit()
+
+    def _where(self, before_id=None, source=None, key=None, since=None, until=None):
+        clauses = []
+        params = []
+        if before_id is not None:
+            clauses.append("id < ?")
+            params.append(before_id)
+        if source:
+            clauses.append("source = ?")
+            params.append(source)
+        if key:
+            clauses.append("key = ?")
+            params.append(key)
+        if since is not None:
+            clauses.append("ts >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("ts < ?")
+            params.append(until)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    # Neueste zuerst; before_id ist die kleinste id der vorherigen Seite
+    def page(self, before_id=None, limit=500, source=None, key=None, since=None, until=None):
+        where, params = self._where(before_id, source, key, since, until)
+        with self.lock:
+            return self.connection.execute(
+                f"SELECT {self.COLUMNS} FROM changes{where} ORDER BY id DESC LIMIT ?", params + [limit]
+            ).fetchall()
+
+    def count(self, source=None, key=None, since=None, until=None):
+        where, params = self._where(None, source, key, since, until)
+        with self.lock:
+            return self.connection.execute(f"SELECT COUNT(*) FROM changes{where}", params).fetchone()[0]
+
+    def sources(self):
+        with self.lock:
+            return [row[0] for row in self.connection.execute("SELECT DISTINCT source FROM changes ORDER BY source")]
+
+    def apply_retention(self, max_age_days=None, max_rows=None, batch=HISTORY_RETENTION_BATCH):
+        # In Blöcken löschen und die Sperre dazwischen freigeben, damit Verlaufs-Tab und record()
+        # bei großen Historien nicht sekundenlang warten
+        deleted = 0
+        if max_age_days:
+            deleted += self._delete_batches(
+                "DELETE FROM changes WHERE id IN (SELECT id FROM changes WHERE ts < ? LIMIT ?)",
+                time.time() - max_age_days * 86400, batch
+            )
+        if max_rows:
+            with self.lock:
+                row = self.connection.execute(
+                    "SELECT id FROM changes ORDER BY id DESC LIMIT 1 OFFSET ?", (max_rows,)
+                ).fetchone()
+            if row is not None:
+                deleted += self._delete_batches(
+                    "DELETE FROM changes WHERE id IN (SELECT id FROM changes WHERE id <= ? ORDER BY id LIMIT ?)",
+                    row[0], batch
+                )
+        return deleted
+
+    def _delete_batches(self, statement, bound, batch):
+        deleted = 0
+        while True:
+            with self.lock:
+                count = self.connection.execute(statement, (bound, batch)).rowcount
+                self.connection.commit()
+            deleted += count
+            if count < batch:
+                return deleted
+            # Wartenden Threads die Sperre überlassen
+            time.sleep(HISTORY_RETENTION_PAUSE)
+
+    def compact(self, pages=HISTORY_VACUUM_PAGES):
+        while True:
+            with self.lock:
+                # execute() führt das Pragma nur einen Schritt (eine Seite) weit aus, executescript komplett
+                self.connection.executescript(f"PRAGMA incremental_vacuum({int(pages)});")
+                remaining = self.connection.execute("PRAGMA freelist_count").fetchone()[0]
+            if not remaining:
+                break
+            time.sleep(HISTORY_RETENTION_PAUSE)
+        with self.lock:
+            self.connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self.connection.commit()
+
+    def maintain(self, max_age_days=None, max_rows=None, every=86400):
+        if time.time() - self.last_maintenance < every:
+            return
+        if self.maintenance is not None and self.maintenance.is_alive():
+            return
+        self.last_maintenance = time.time()
+        # Eigener Thread, damit der Scan-Zyklus nicht auf eine lange Aufbewahrung wartet
+        self.maintenance = threading.Thread(
+            target=self._maintain, args=(max_age_days, max_rows), name="history-maintenance", daemon=True
+        )
+        self.maintenance.start()
+
+    def _maintain(self, max_age_days, max_rows):
+        try:
+            deleted = self.apply_retention(max_age_days, max_rows)
+            if deleted:
+                self.compact()
+                HISTORY_LOG.info(f"Änderungshistorie: {deleted} alte Einträge entfernt")
+        except Exception as e:
+            if not self.closed:
+                HISTORY_LOG.error(f"Fehler bei der Pflege der Änderungshistorie: {e}")
+
+    def close(self):
+        with self.lock:
+            self.closed = True
+            self.connection.close()
+
+FLEET_SPOOL_FILE = "fleet_spool.sqlite3"
+FLEET_PROTOCOL_VERSION = 1
+# Rahmen: Länge (4 Byte) + Typ (1 Byte) + zlib-komprimiertes JSON
+FLEET_HELLO, FLEET_WELCOME, FLEET_BATCH, FLEET_ACK = 1, 2, 3, 4
+FLEET_FRAME_HEADER = struct.Struct(">IB")
+FLEET_MAX_FRAME = 64 * 1024 * 1024
+
+def write_fleet_frame(sock, kind, message):
+    raw = message if isinstance(message, bytes) else json.dumps(message, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    body = zlib.compress(raw, 6)
+    sock.sendall(FLEET_FRAME_HEADER.pack(len(body), kind) + body)
+    return len(raw), FLEET_FRAME_HEADER.size + len(body)
+
+def _recv_exact(sock, size):
+    buffer = bytearray()
+    while len(buffer) < size:
+        chunk = sock.recv(size - len(buffer))
+        if not chunk:
+            raise ConnectionError("Verbindung geschlossen")
+        buffer += chunk
+    return bytes(buffer)
+
+def read_fleet_frame(sock):
+    size, kind = FLEET_FRAME_HEADER.unpack(_recv_exact(sock, FLEET_FRAME_HEADER.size))
+    if size > FLEET_MAX_FRAME:
+        raise ValueError(f"Rahmen zu groß: {size} Bytes")
+    return kind, json.loads(zlib.decompress(_recv_exact(sock, size)).decode("utf-8"))
+
+# "host:port" für TCP, "unix:<pfad>" für einen Unix-Socket
+def connect_fleet(address, timeout=10):
+    if address.startswith("unix:"):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(timeout)
+        sock.connect(address[5:])
+    else:
+        host, _, port = address.rpartition(":")
+        sock = socket.create_connection((host or "127.0.0.1", int(port)), timeout=timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    return sock
+
+def encode_fleet_event(event):
+    return [event.source, event.kind, str(event.key), _encode_snapshot_value(event.old), _encode_snapshot_value(event.new)]
+
+def decode_fleet_event(item):
+    source, kind, key, old, new = item
+    return ChangeEvent(source, kind, key, _decode_snapshot_value(old), _decode_snapshot_value(new))
+
+# Inhaltsadresse eines Werts im Snapshot-Format (JSON); Agent und Collector bilden sie gleich
+def value_fingerprint(value):
+    text = json.dumps(value, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=12).digest()
+
+def _flat_entries(data):
+    if isinstance(data, collections.abc.Mapping):
+        return data.items()
+    return ((key, None) for key in data)
+
+# Wert-Fingerabdrücke aller Einträge einer Quelle mit Schlüsseln wie in den Änderungen:
+# Startup-Ordner und Mehrbenutzer-Quellen als "<Scope bzw. Benutzer>\<Eintrag>" (Dateien ohne Wert),
+# Zieldateien mit ihrem Hash als Wert
+def fleet_entries(name, data):
+    if name.endswith(TARGETS_SUFFIX):
+        items = ((key, value[1]) for key, value in data.items())
+    elif name == "startup_folders" or name in MULTI_USER_SOURCES:
+        items = ((f"{outer}\\{key}", value) for outer, inner in data.items() for key, value in _flat_entries(inner))
+    else:
+        items = _flat_entries(data)
+    return {str(key): value_fingerprint(_encode_snapshot_value(value)).hex() for key, value in items}
+
+# Lokale Warteschlange (SQLite) für alles, was noch nicht vom Collector bestätigt ist.
+# AUTOINCREMENT vergibt Sequenznummern nie doppelt; die spool-ID erkennt der Collector,
+# wenn der Spool neu angelegt wurde und die Nummern wieder bei 1 beginnen.
+class FleetSpool:
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS outbox (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            kind TEXT NOT NULL,
+            payload TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+    """
+
+    def __init__(self, path=FLEET_SPOOL_FILE, max_rows=100000):
+        import sqlite3
+        import uuid
+        self.path = path
+        self.max_rows = max_rows
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        with self.lock:
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+            self.connection.executescript(self.SCHEMA)
+            row = self.connection.execute("SELECT value FROM meta WHERE key = 'spool_id'").fetchone()
+            if row is None:
+                row = (uuid.uuid4().hex,)
+                self.connection.execute("INSERT INTO meta (key, value) VALUES ('spool_id', ?)", row)
+            self.connection.commit()
+        self.spool_id = row[0]
+
+    def append(self, kind, payload):
+        text = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+        with self.lock:
+            seq = self.connection.execute("INSERT INTO outbox (kind, payload) VALUES (?, ?)", (kind, text)).lastrowid
+            # Bei langer Offline-Zeit die ältesten Einträge verwerfen
+            first = self.connection.execute("SELECT MIN(seq) FROM outbox").fetchone()[0]
+            dropped = 0
+            if seq - first + 1 > self.max_rows:
+                dropped = self.connection.execute("DELETE FROM outbox WHERE seq <= ?", (seq - self.max_rows,)).rowcount
+            self.connection.commit()
+        if dropped:
+            FLEET_LOG.warning(f"Fleet-Spool voll: {dropped} älteste Einträge verworfen")
+        return seq
+
+    def pending(self, after, limit):
+        with self.lock:
+            return self.connection.execute(
+                "SELECT seq, kind, payload FROM outbox WHERE seq > ? ORDER BY seq LIMIT ?", (after, limit)
+            ).fetchall()
+
+    def ack(self, seq):
+        with self.lock:
+            self.connection.execute("DELETE FROM outbox WHERE seq <= ?", (seq,))
+            self.connection.commit()
+
+    def count(self):
+        with self.lock:
+            return self.connection.execute("SELECT COUNT(*) FROM outbox").fetchone()[0]
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+# Agent-Modus: Änderungen und Fingerabdrücke landen zuerst im Spool; ein Sender-Thread
+# überträgt sie in Stapeln über eine dauerhafte Verbindung und löscht sie erst nach ACK.
+# Nach einer Unterbrechung meldet der Collector die zuletzt bestätigte Sequenznummer,
+# ab der weitergesendet wird.
+class FleetAgent:
+    def __init__(self, address, host_id=None, spool=None, batch_rows=100, digest_interval=300, retry_max=60, timeout=30):
+        self.address = address
+        self.host_id = host_id or socket.gethostname()
+        self.spool = spool if spool is not None else FleetSpool()
+        self.batch_rows = batch_rows
+        self.digest_interval = digest_interval
+        self.retry_max = retry_max
+        self.timeout = timeout
+        self.wakeup = threading.Event()
+        self.stopping = threading.Event()
+        self.thread = None
+        self.connected = False
+        self.backoff = 1.0
+        self.last_digests = None
+        # Stand je Quelle, zu dem der Collector zuletzt alle Einträge bekommen hat
+        self.entry_digests = {}
+        self.resync = False
+        self.acked = None
+        self.bytes_raw = 0
+        self.bytes_sent = 0
+        self.batches = 0
+
+    def start(self):
+        self.thread = threading.Thread(target=self._run, name="fleet-agent", daemon=True)
+        self.thread.start()
+        return self
+
+    def submit_events(self, events, ts=None):
+        self.spool.append("events", {"ts": time.time() if ts is None else ts, "events": [encode_fleet_event(event) for event in events]})
+        self.wakeup.set()
+
+    # Vollständige Fingerabdrücke in festem Abstand, dazwischen nur die geänderten Quellen.
+    # Mit state gehen bei vollständigen Meldungen zusätzlich die Einträge aller Quellen mit, deren
+    # Stand der Collector noch nicht vollständig kennt: beim ersten Bericht, nach einem Neustart des
+    # Collectors und für Quellen, die sich seit der letzten vollständigen Meldung geändert haben
+    # (repariert auch Änderungen, die ein voller Spool verworfen hat)
+    def submit_digests(self, digests, changed=None, ts=None, state=None):
+        full = changed is None or self.digests_due()
+        names = digests if full else changed
+        payload = {
+            "ts": time.time() if ts is None else ts,
+            "full": full,
+            "digests": {name: digests[name].hex() for name in names if name in digests}
+        }
+        sent = {}
+        if full and state is not None:
+            if self.resync:
+                self.resync = False
+                self.entry_digests.clear()
+            sent = {name: digest for name, digest in digests.items() if name in state and self.entry_digests.get(name) != digest}
+            if sent:
+                payload["entries"] = {name: fleet_entries(name, state[name]) for name in sent}
+        self.spool.append("digests", payload)
+        if full:
+            self.last_digests = time.monotonic()
+            self.entry_digests = {name: digest for name, digest in self.entry_digests.items() if name in digests}
+        self.entry_digests.update(sent)
+        self.wakeup.set()
+
+    def digests_due(self):
+        return self.resync or self.last_digests is None or time.monotonic() - self.last_digests >= self.digest_interval
+
+    def stop(self, timeout=5):
+        self.stopping.set()
+        self.wakeup.set()
+        if self.thread is not None:
+            self.thread.join(timeout=timeout)
+            # Hängt der Sender noch (z.B. in read_fleet_frame), schließt er den Spool selbst beim Beenden
+            if self.thread.is_alive():
+                FLEET_LOG.warning(f"Fleet-Agent beendet sich nicht innerhalb von {timeout} Sek., Spool wird danach geschlossen")
+                return
+        self.spool.close()
+
+    def _run(self):
+        try:
+            while not self.stopping.is_set():
+                try:
+                    self._session()
+                except (OSError, ValueError) as e:
+                    if self.connected or self.backoff == 1.0:
+                        FLEET_LOG.warning(f"Fleet-Collector {self.address} nicht erreichbar: {e}")
+                self.connected = False
+                if self.stopping.wait(self.backoff * random.uniform(0.5, 1.0)):
+                    break
+                self.backoff = min(self.backoff * 2, self.retry_max)
+        finally:
+            # Nur nach stop(); sonst schließt stop() selbst (doppeltes close() ist unschädlich)
+            if self.stopping.is_set():
+                self.spool.close()
+
+    def _session(self):
+        with connect_fleet(self.address, self.timeout) as sock:
+            write_fleet_frame(sock, FLEET_HELLO, {"host": self.host_id, "spool": self.spool_id, "version": FLEET_PROTOCOL_VERSION})
+            kind, welcome = read_fleet_frame(sock)
+            if kind != FLEET_WELCOME:
+                raise ValueError(f"Unerwartete Antwort {kind} auf HELLO")
+            sent = welcome["acked"]
+            # Kennt der Collector bereits bestätigte Stapel nicht mehr (Neustart), fehlen ihm die
+            # Einträge; die nächste vollständige Meldung schickt sie erneut
+            if self.acked is not None and sent < self.acked:
+                FLEET_LOG.info(f"Fleet-Collector {self.address} ohne bisherigen Stand, Einträge werden neu gesendet")
+                self.resync = True
+            self.acked = sent
+            self.spool.ack(sent)
+            if not self.connected:
+                FLEET_LOG.info(f"Mit Fleet-Collector {self.address} verbunden, fortgesetzt ab Sequenz {sent}")
+            self.connected = True
+            self.backoff = 1.0
+            while not self.stopping.is_set():
+                self.wakeup.clear()
+                rows = self.spool.pending(sent, self.batch_rows)
+                if not rows:
+                    self.wakeup.wait(self.timeout)
+                    continue
+                # Gespeicherte JSON-Texte unverändert einbetten statt neu zu serialisieren
+                batch = '{"items":[' + ",".join(f'[{seq},"{kind}",{payload}]' for seq, kind, payload in rows) + "]}"
+                raw, wire = write_fleet_frame(sock, FLEET_BATCH, batch.encode("utf-8"))
+                kind, ack = read_fleet_frame(sock)
+                if kind != FLEET_ACK:
+                    raise ValueError(f"Unerwartete Antwort {kind} auf BATCH")
+                sent = self.acked = ack["seq"]
+                self.spool.ack(sent)
+                self.bytes_raw += raw
+                self.bytes_sent += wire
+                self.batches += 1
+
+    @property
+    def spool_id(self):
+        return self.spool.spool_id
+
+SUPPRESSIONS_FILE = "suppressions.json"
+GLOB_CHARACTERS = "*?["
+
+# Muster wie in der Regeldatei: Glob (Standard, ohne Groß-/Kleinschreibung) oder "re:<Regex>";
+# beide müssen den ganzen Text treffen
+def _pattern_source(pattern):
+    import fnmatch
+    if pattern.startswith("re:"):
+        return f"(?:{pattern[3:]})\\Z"
+    return fnmatch.translate(pattern)
+
+def _rule_text(value):
+    return "" if value is None else value if isinstance(value, str) else str(value)
+
+class SuppressionRule:
+    __slots__ = ("id", "source", "key", "value", "kinds", "prefix", "key_regex", "value_regex")
+
+    def __init__(self, rule_id, source="*", key="*", value=None, kinds=None):
+        import re
+        self.id = rule_id
+        self.source = source
+        self.key = key
+        self.value = value
+        self.kinds = frozenset(kinds) if kinds else None
+        # Exakte Schlüssel und reine Präfix-Globs brauchen keine eigene Regex
+        self.prefix = None
+        self.key_regex = None
+        if not key.startswith("re:") and not any(char in key for char in GLOB_CHARACTERS):
+            self.prefix = False
+        elif not key.startswith("re:") and key.endswith("*") and not any(char in key[:-1] for char in GLOB_CHARACTERS):
+            self.prefix = True
         else:
-            self.grp_methods.setTitle("Methods to Monitor:")
-            self.chk_startup.setText("Startup folders")
-            self.chk_registry.setText("Registry entries (HKCU)")
-            self.chk_reg_hklm_run.setText("Registry (HKLM Run)")
-            self.chk_ctx_star.setText("Context menu handlers (* ShellEx)")
-            self.chk_ctx_allfilesystem.setText("Context menu handlers (AllFilesystemObjects)")
-            self.chk_ctx_directory.setText("Context menu handlers (Directory)")
-            self.chk_ctx_directory_bg.setText("Context menu handlers (Directory Background)")
-            self.chk_folder_ctx.setText("Context menu handlers (Folder)")
-            self.chk_directory_dragdrop.setText("Context menu handlers (Directory)")
-            self.chk_services.setText("Services")
-            self.chk_tasks.setText("Scheduled tasks")
-            self.grp_notifications.setTitle("Notification methods:")
-            self.chk_toast.setText("Windows notification")
-            self.chk_dialog.setText("Dialog")
-            self.chk_autostart.setText("Automatically hide GUI 20 seconds after program start")
-            self.btn_toggle.setText("Start monitoring" if not self.monitoring_active else "Stop monitoring")
-
-    def update_interval_label(self, value=None):
-        if value is None:
-            value = self.sld_interval.value()
-        self.lbl_interval.setText(f"{value} Sek.")
-
-    def toggle_autostart(self):
-        logging.info("Auto-Hide beim Programmstart: " + ("aktiviert" if self.chk_autostart.isChecked() else "deaktiviert"))
-
-    def toggle_monitoring(self):
-        if not self.monitoring_active:
-            self.monitoring_active = True
-            self.stop_flag.clear()
-            self.btn_toggle.setText("Überwachung stoppen" if self.cmb_language.currentText() == "de" else "Stop monitoring")
-            logging.info("Monitoring gestartet")
-            self.monitor_thread = threading.Thread(target=self.run_monitoring, daemon=True)
-            self.monitor_thread.start()
+            self.key_regex = re.compile(_pattern_source(key), re.IGNORECASE)
+        self.value_regex = re.compile(_pattern_source(value), re.IGNORECASE) if value is not None else None
+
+    # Bei Änderungen müssen alter und neuer Wert zum Muster passen (z.B. Versionsnummern im Pfad)
+    def accepts(self, event):
+        if self.kinds is not None and event.kind not in self.kinds:
+            return False
+        if self.value_regex is None:
+            return True
+        if event.kind == ADDED:
+            values = (event.new,)
+        elif event.kind == REMOVED:
+            values = (event.old,)
         else:
-            self.monitoring_active = False
-            self.stop_flag.set()
-            self.btn_toggle.setText("Überwachung starten" if self.cmb_language.currentText() == "de" else "Start monitoring")
-            logging.info("Monitoring gestoppt")
-
-    def run_monitoring(self):
-        methods = {
-            "startup_folders": self.chk_startup.isChecked(),
-            "registry": self.chk_registry.isChecked(),
-            "registry_hklm_run": self.chk_reg_hklm_run.isChecked(),
-            "context_handlers_star": self.chk_ctx_star.isChecked(),
-            "context_handlers_allfilesystem": self.chk_ctx_allfilesystem.isChecked(),
-            "context_handlers_directory": self.chk_ctx_directory.isChecked(),
-            "context_handlers_directory_bg": self.chk_ctx_directory_bg.isChecked(),
-            "folder_context_handlers": self.chk_folder_ctx.isChecked(),
-            "directory_dragdrop_handlers": self.chk_directory_dragdrop.isChecked(),
-            "services": self.chk_services.isChecked(),
-            "tasks": self.chk_tasks.isChecked()
-        }
-        previous_state = {}
+            values = (event.old, event.new)
+        return all(self.value_regex.match(_rule_text(value)) for value in values)
+
+# Rückverweise (\1, (?P=name)) und bedingte Gruppen; ein maskierter Backslash davor macht aus
+# dem Treffer nur eine unnötige Einzelprüfung
+def _combinable_pattern(rule):
+    import re
+    return not rule.key_regex.groupindex and not re.search(r"\\[1-9]|\(\?P=|\(\?\(", rule.key_regex.pattern)
+
+# Kombinierter Matcher für eine Quelle: exakte Schlüssel im Dict, Globs mit reinem Präfix
+# ("GoogleUpdate*") in einem Dict je Präfixlänge, nur die übrigen Muster in einer gemeinsamen
+# Regex-Alternation als Vorfilter. Der Aufwand hängt so von der Schlüssellänge und der Zahl
+# komplexer Muster ab, nicht von der Gesamtzahl der Regeln.
+class SourceRuleMatcher:
+    def __init__(self, rules):
+        import re
+        self.exact = {}
+        self.prefixes = {}
+        self.patterns = []
+        for rule in rules:
+            if rule.prefix is False:
+                self.exact.setdefault(rule.key.lower(), []).append(rule)
+            elif rule.prefix:
+                self.prefixes.setdefault(rule.key[:-1].lower(), []).append(rule)
+            else:
+                self.patterns.append(rule)
+        self.prefix_lengths = sorted({len(prefix) for prefix in self.prefixes})
+        # Vorfilter als eine Alternation nur für Muster ohne benannte Gruppen und Rückverweise: gleiche
+        # Gruppennamen mehrerer Regeln ließen die Alternation scheitern, Rückverweise zeigten auf fremde
+        # Gruppen. Solche Regeln werden einzeln geprüft.
+        grouped = [rule for rule in self.patterns if not _combinable_pattern(rule)]
+        plain = [rule for rule in self.patterns if _combinable_pattern(rule)]
+        self.combined = None
+        if plain:
+            try:
+                self.combined = re.compile("|".join(f"(?:{_pattern_source(rule.key)})" for rule in plain), re.IGNORECASE)
+            except re.error:
+                # z.B. Inline-Flags, die nur am Anfang eines eigenen Musters erlaubt sind
+                grouped = self.patterns
+                plain = []
+        self.plain = plain
+        self.grouped = grouped
+
+    def candidates(self, key):
+        lowered = key.lower()
+        yield from self.exact.get(lowered, ())
+        for length in self.prefix_lengths:
+            if length > len(lowered):
+                break
+            yield from self.prefixes.get(lowered[:length], ())
+        if self.combined is not None and self.combined.match(key):
+            for rule in self.plain:
+                if rule.key_regex.match(key):
+                    yield rule
+        for rule in self.grouped:
+            if rule.key_regex.match(key):
+                yield rule
+
+    def match(self, event):
+        for rule in self.candidates(str(event.key)):
+            if rule.accepts(event):
+                return rule
+        return None
+
+# Unterdrückungsregeln aus einer JSON-Datei:
+#   {"rules": [{"id": "...", "source": "registry*", "key": "Zoom*", "value": "re:.*\\\\Zoom\\.exe.*", "kinds": ["modified"]}]}
+# refresh() lädt die Datei neu, sobald sich mtime oder Größe ändern; die Matcher der bekannten Quellen
+# werden dabei kompiliert, weitere bei Bedarf. Die Trefferzähler bleiben über Neuladen hinweg je Regel-ID erhalten.
+class SuppressionRules:
+    def __init__(self, path=SUPPRESSIONS_FILE):
+        self.path = path
+        self.stamp = None
+        self.rules = []
+        self.source_patterns = []
+        self.matchers = {}
+        self.hits = collections.Counter()
+
+    def load_rules(self, rules):
+        import re
+        # Gleiche Quellmuster nur einmal kompilieren
+        by_source = {}
+        for rule in rules:
+            by_source.setdefault(rule.source, []).append(rule)
+        source_patterns = [
+            (re.compile(_pattern_source(pattern), re.IGNORECASE), source_rules) for pattern, source_rules in by_source.items()
+        ]
+        # Matcher der bekannten Quellen gleich hier bauen, damit Fehler beim Laden auffallen und nicht
+        # erst im Vergleich; erst danach die bisherigen Regeln ersetzen
+        matchers = {source: self._build_matcher(source_patterns, source) for source in COMPARATORS} if rules else {}
+        self.source_patterns = source_patterns
+        self.rules = rules
+        self.matchers = matchers
+
+    @staticmethod
+    def _build_matcher(source_patterns, source):
+        return SourceRuleMatcher([rule for pattern, source_rules in source_patterns if pattern.match(source) for rule in source_rules])
+
+    def refresh(self):
         try:
-            if methods["startup_folders"]:
-                previous_state["startup_folders"] = check_startup_folders()
-            if methods["registry"]:
-                previous_state["registry"] = check_registry_autostart()
-            if methods["registry_hklm_run"]:
-                previous_state["registry_hklm_run"] = check_registry_autostart_hklm()
-            if methods["context_handlers_star"]:
-                previous_state["context_handlers_star"] = check_context_menu_handler(r"SOFTWARE\Classes\*\ShellEx\ContextMenuHandlers")
-            if methods["context_handlers_allfilesystem"]:
-                previous_state["context_handlers_allfilesystem"] = check_context_menu_handler(r"SOFTWARE\Classes\AllFilesystemObjects\shellex\ContextMenuHandlers")
-            if methods["context_handlers_directory"]:
-                previous_state["context_handlers_directory"] = check_context_menu_handler(r"SOFTWARE\Classes\Directory\shellex\ContextMenuHandlers")
-            if methods["context_handlers_directory_bg"]:
-                previous_state["context_handlers_directory_bg"] = check_context_menu_handler(r"SOFTWARE\Classes\Directory\background\shellex\ContextMenuHandlers")
-            if methods["folder_context_handlers"]:
-                previous_state["folder_context_handlers"] = check_context_menu_handler(r"SOFTWARE\Classes\Folder\ShellEx\ContextMenuHandlers")
-            if methods["directory_dragdrop_handlers"]:
-                previous_state["directory_dragdrop_handlers"] = check_context_menu_handler(r"SOFTWARE\Classes\Directory\shellex\DragDropHandlers")
-            if methods["services"]:
-                previous_state["services"] = check_services_start_values()
-            if methods["tasks"]:
-                previous_state["tasks"] = check_scheduled_tasks()
+            stat = os.stat(self.path)
+            stamp = (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            stamp = None
+        if stamp == self.stamp:
+            return False
+        self.stamp = stamp
+        if stamp is None:
+            self.load_rules([])
+            return True
+        try:
+            with open(self.path, "r", encoding="utf8") as f:
+                raw_rules = json.load(f).get("rules", [])
+            rules = [
+                SuppressionRule(
+                    raw.get("id") or f"rule{index}", raw.get("source", "*"), raw.get("key", "*"), raw.get("value"), raw.get("kinds")
+                )
+                for index, raw in enumerate(raw_rules)
+            ]
+            self.load_rules(rules)
         except Exception as e:
-            logging.error(f"Fehler beim Initialisieren des Zustands: {e}")
+            # Fehlerhafte Datei: bisherige Regeln behalten
+            ENGINE_LOG.error(f"Fehler beim Laden der Unterdrückungsregeln: {e}")
+            return False
+        ENGINE_LOG.info(f"{len(rules)} Unterdrückungsregeln geladen")
+        return True
+
+    def matcher(self, source):
+        matcher = self.matchers.get(source)
+        if matcher is None:
+            matcher = self.matchers[source] = self._build_matcher(self.source_patterns, source)
+        return matcher
+
+    def filter(self, events):
+        if not self.rules:
+            return events
+        kept = []
+        for event in events:
+            rule = self.matcher(event.source).match(event)
+            if rule is None:
+                kept.append(event)
+            else:
+                self.hits[rule.id] += 1
+        return kept
+
+METRICS_FILE = "metrics.prom"
+# Obergrenzen der Latenz-Buckets in Sekunden
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+def _metric_label(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+def _metric_number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class LatencyHistogram:
+    __slots__ = ("counts", "total", "count")
 
-        while self.monitoring_active and not self.stop_flag.is_set():
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.total += seconds
+        self.count += 1
+
+    def lines(self, name, labels):
+        prefix = "".join(f'{key}="{_metric_label(value)}",' for key, value in labels)
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS + ("+Inf",), self.counts):
+            cumulative += count
+            yield f'{name}_bucket{{{prefix}le="{bound}"}} {cumulative}'
+        suffix = "{" + prefix.rstrip(",") + "}" if prefix else ""
+        yield f"{name}_sum{suffix} {self.total!r}"
+        yield f"{name}_count{suffix} {self.count}"
+
+# Messwerte je Quelle und Zyklus; wird aus den Collector-Threads beschrieben und als
+# Prometheus-Textformat in eine Datei bzw. über den lokalen HTTP-Endpunkt ausgegeben.
+class MonitorMetrics:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.collect_seconds = collections.defaultdict(LatencyHistogram)
+        self.compare_seconds = collections.defaultdict(LatencyHistogram)
+        self.stage_seconds = collections.defaultdict(LatencyHistogram)
+        # Optional (z.B. für Replay-Messungen): alle Einzelwerte je Stufe für exakte Perzentile
+        self.samples = None
+        self.cycle_seconds = LatencyHistogram()
+        self.schedule_lag = LatencyHistogram()
+        self.entries = {}
+        self.errors = collections.Counter()
+        self.digest_changes = collections.Counter()
+        self.events = collections.Counter()
+        self.cycles = 0
+        self.last_lag = 0.0
+        self.last_cycle = None
+        self.suppression_hits = None
+        self.started = time.time()
+
+    def observe_collect(self, source, seconds, data):
+        with self.lock:
+            self.collect_seconds[source].observe(seconds)
             try:
-                time.sleep(self.sld_interval.value())
-                current_state = {}
-                if methods["startup_folders"]:
-                    current_state["startup_folders"] = check_startup_folders()
-                if methods["registry"]:
-                    current_state["registry"] = check_registry_autostart()
-                if methods["registry_hklm_run"]:
-                    current_state["registry_hklm_run"] = check_registry_autostart_hklm()
-                if methods["context_handlers_star"]:
-                    current_state["context_handlers_star"] = check_context_menu_handler(r"SOFTWARE\Classes\*\ShellEx\ContextMenuHandlers")
-                if methods["context_handlers_allfilesystem"]:
-                    current_state["context_handlers_allfilesystem"] = check_context_menu_handler(r"SOFTWARE\Classes\AllFilesystemObjects\shellex\ContextMenuHandlers")
-                if methods["context_handlers_directory"]:
-                    current_state["context_handlers_directory"] = check_context_menu_handler(r"SOFTWARE\Classes\Directory\shellex\ContextMenuHandlers")
-                if methods["context_handlers_directory_bg"]:
-                    current_state["context_handlers_directory_bg"] = check_context_menu_handler(r"SOFTWARE\Classes\Directory\background\shellex\ContextMenuHandlers")
-                if methods["folder_context_handlers"]:
-                    current_state["folder_context_handlers"] = check_context_menu_handler(r"SOFTWARE\Classes\Folder\ShellEx\ContextMenuHandlers")
-                if methods["directory_dragdrop_handlers"]:
-                    current_state["directory_dragdrop_handlers"] = check_context_menu_handler(r"SOFTWARE\Classes\Directory\shellex\DragDropHandlers")
-                if methods["services"]:
-                    current_state["services"] = check_services_start_values()
-                if methods["tasks"]:
-                    current_state["tasks"] = check_scheduled_tasks()
-
-                messages = []
-                if methods["startup_folders"]:
-                    messages.extend(compare_startup_folders(
-                        previous_state.get("startup_folders", {}),
-                        current_state.get("startup_folders", {})
-                    ))
-                if methods["registry"]:
-                    messages.extend(compare_registry_entries(
-                        previous_state.get("registry", {}),
-                        current_state.get("registry", {})
-                    ))
-                if methods["registry_hklm_run"]:
-                    messages.extend(compare_registry_entries(
-                        previous_state.get("registry_hklm_run", {}),
-                        current_state.get("registry_hklm_run", {})
-                    ))
-                if methods["context_handlers_star"]:
-                    messages.extend(compare_registry_entries(
-                        previous_state.get("context_handlers_star", {}),
-                        current_state.get("context_handlers_star", {})
-                    ))
-                if methods["context_handlers_allfilesystem"]:
-                    messages.extend(compare_registry_entries(
-                        previous_state.get("context_handlers_allfilesystem", {}),
-                        current_state.get("context_handlers_allfilesystem", {})
-                    ))
-                if methods["context_handlers_directory"]:
-                    messages.extend(compare_registry_entries(
-                        previous_state.get("context_handlers_directory", {}),
-                        current_state.get("context_handlers_directory", {})
-                    ))
-                if methods["context_handlers_directory_bg"]:
-                    messages.extend(compare_registry_entries(
-                        previous_state.get("context_handlers_directory_bg", {}),
-                        current_state.get("context_handlers_directory_bg", {})
-                    ))
-                if methods["folder_context_handlers"]:
-                    messages.extend(compare_registry_entries(
-                        previous_state.get("folder_context_handlers", {}),
-                        current_state.get("folder_context_handlers", {})
-                    ))
-                if methods["directory_dragdrop_handlers"]:
-                    messages.extend(compare_registry_entries(
-                        previous_state.get("directory_dragdrop_handlers", {}),
-                        current_state.get("directory_dragdrop_handlers", {})
-                    ))
-                if methods["services"]:
-                    messages.extend(compare_services(
-                        previous_state.get("services", {}),
-                        current_state.get("services", {})
-                    ))
-                if methods["tasks"]:
-                    messages.extend(compare_tasks(
-                        previous_state.get("tasks", []),
-                        current_state.get("tasks", [])
-                    ))
-
-                if messages:
-                    msg_text = "\n".join(messages)
-                    logging.info("Änderungen gefunden:\n" + msg_text)
-                    print("Änderungen gefunden:", msg_text)
-                    play_alert_sound()
-                    flash_window()
-                    log(f"Autostart Änderung: {msg_text}", "INFO")
-                    if self.chk_toast.isChecked():
-                        show_windows_toast("Autostart Änderung", msg_text)
-                    if self.chk_dialog.isChecked():
-                        self.show_dialog_threadsafe("Autostart Änderung", msg_text, self.get_change_type(msg_text))
-
-                previous_state = current_state
-            except KeyboardInterrupt:
-                logging.info("Monitoring durch KeyboardInterrupt beendet.")
-                break
-            except Exception as e:
-                logging.error(f"Fehler im Monitoring: {e}")
-                continue
+                self.entries[source] = len(data)
+            except TypeError:
+                pass
+
+    def observe_compare(self, source, seconds):
+        with self.lock:
+            self.compare_seconds[source].observe(seconds)
+
+    # Misst die Stufe ab started und liefert den Startzeitpunkt der nächsten Stufe
+    def observe_stage(self, stage, started):
+        now = time.perf_counter()
+        with self.lock:
+            self.stage_seconds[stage].observe(now - started)
+            if self.samples is not None:
+                self.samples[stage].append(now - started)
+        return now
+
+    def record_error(self, source, reason="error"):
+        with self.lock:
+            self.errors[source, reason] += 1
+
+    def record_changes(self, sources, events):
+        with self.lock:
+            self.digest_changes.update(sources)
+            self.events.update((event.source, event.kind) for event in events)
+
+    def observe_cycle(self, seconds, lag):
+        with self.lock:
+            self.cycle_seconds.observe(seconds)
+            if self.samples is not None:
+                self.samples["cycle"].append(seconds)
+            self.schedule_lag.observe(max(0.0, lag))
+            self.last_lag = lag
+            self.last_cycle = time.time()
+            self.cycles += 1
+
+    def render(self):
+        lines = []
+
+        def family(name, kind, text):
+            lines.append(f"# HELP {name} {text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        def counters(name, values, keys):
+            for labels, value in sorted(values.items()):
+                labels = labels if isinstance(labels, tuple) else (labels,)
+                text = ",".join(f'{key}="{_metric_label(label)}"' for key, label in zip(keys, labels))
+                lines.append(f"{name}{{{text}}} {_metric_number(value)}")
+
+        with self.lock:
+            family("autostart_collector_duration_seconds", "histogram", "Laufzeit der Collectors je Quelle")
+            for source, histogram in sorted(self.collect_seconds.items()):
+                lines.extend(histogram.lines("autostart_collector_duration_seconds", (("source", source),)))
+            family("autostart_compare_duration_seconds", "histogram", "Laufzeit des Vergleichs je Quelle")
+            for source, histogram in sorted(self.compare_seconds.items()):
+                lines.extend(histogram.lines("autostart_compare_duration_seconds", (("source", source),)))
+            family("autostart_collector_entries", "gauge", "Einträge im letzten Ergebnis je Quelle")
+            counters("autostart_collector_entries", self.entries, ("source",))
+            family("autostart_collector_errors_total", "counter", "Fehlgeschlagene Collector-Aufrufe und abgefangene Fehler einzelner Einträge (reason partial)")
+            counters("autostart_collector_errors_total", self.errors, ("source", "reason"))
+            family("autostart_digest_changes_total", "counter", "Geänderte Fingerabdrücke je Quelle")
+            counters("autostart_digest_changes_total", self.digest_changes, ("source",))
+            family("autostart_events_total", "counter", "Gemeldete Änderungen je Quelle und Art")
+            counters("autostart_events_total", self.events, ("source", "kind"))
+            family("autostart_stage_duration_seconds", "histogram", "Laufzeit der Stufen eines Scan-Zyklus")
+            for stage, histogram in sorted(self.stage_seconds.items()):
+                lines.extend(histogram.lines("autostart_stage_duration_seconds", (("stage", stage),)))
+            family("autostart_cycle_duration_seconds", "histogram", "Gesamtdauer eines Scan-Zyklus")
+            lines.extend(self.cycle_seconds.lines("autostart_cycle_duration_seconds", ()))
+            family("autostart_schedule_lag_seconds", "histogram", "Verzug des Zyklusstarts gegenüber dem Plan")
+            lines.extend(self.schedule_lag.lines("autostart_schedule_lag_seconds", ()))
+            family("autostart_cycles_total", "counter", "Ausgeführte Scan-Zyklen")
+            lines.append(f"autostart_cycles_total {self.cycles}")
+            if self.last_cycle is not None:
+                family("autostart_last_cycle_timestamp_seconds", "gauge", "Zeitpunkt des letzten Zyklus")
+                lines.append(f"autostart_last_cycle_timestamp_seconds {self.last_cycle!r}")
+            family("autostart_start_timestamp_seconds", "gauge", "Startzeitpunkt der Messung")
+            lines.append(f"autostart_start_timestamp_seconds {self.started!r}")
+        # Trefferzähler der Unterdrückungsregeln werden vom Monitor-Thread geschrieben
+        hits = dict(self.suppression_hits or {})
+        if hits:
+            family("autostart_suppressed_total", "counter", "Unterdrückte Änderungen je Regel")
+            counters("autostart_suppressed_total", hits, ("rule",))
+        return "\n".join(lines) + "\n"
+
+    # Atomar ersetzen, damit ein Textfile-Collector nie eine halbe Datei liest
+    def write(self, path):
+        temp_path = f"{path}.tmp"
+        try:
+            with open(temp_path, "w", encoding="utf8", newline="\n") as f:
+                f.write(self.render())
+            os.replace(temp_path, path)
+        except Exception as e:
+            METRICS_LOG.error(f"Fehler beim Schreiben der Metriken: {e}")
+
+# Optionaler HTTP-Endpunkt (nur 127.0.0.1) für GET /metrics
+class MetricsServer:
+    def __init__(self, metrics, port, host="127.0.0.1"):
+        self.metrics = metrics
+        self.port = port
+        self.host = host
+        self.server = None
+
+    def start(self):
+        from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+        metrics = self.metrics
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode("utf8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
 
-        self.monitoring_active = False
-        logging.info("Monitoring Thread beendet")
+        try:
+            self.server = ThreadingHTTPServer((self.host, self.port), Handler)
+            self.server.daemon_threads = True
+        except OSError as e:
+            METRICS_LOG.error(f"Metrik-Endpunkt auf Port {self.port} nicht verfügbar: {e}")
+            return self
+        self.port = self.server.server_address[1]
+        threading.Thread(target=self.server.serve_forever, name="metrics-http", daemon=True).start()
+        METRICS_LOG.info(f"Metrik-Endpunkt: http://{self.host}:{self.port}/metrics")
+        return self
+
+    def stop(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+# Zeichnet je Zyklus die fälligen Quellen und die Daten der geänderten Quellen auf
+# (gzip, eine JSON-Zeile je Zyklus). Jeder Start hängt ein neues gzip-Member an; nach
+# einem Absturz bleibt alles bis zum letzten flush lesbar.
+class SnapshotRecorder:
+    def __init__(self, path):
+        self.path = path
+        self.file = gzip.open(path, "at", encoding="utf8", compresslevel=6)
+
+    def record(self, due, sources, ts=None):
+        frame = {
+            "t": time.time() if ts is None else ts,
+            "due": list(due),
+            "sources": {name: _encode_snapshot_value(data) for name, data in sources.items()}
+        }
+        self.file.write(json.dumps(frame, ensure_ascii=False, separators=(",", ":")) + "\n")
+        self.file.flush()
 
-    def get_change_type(self, message):
-        if "Registry" in message:
-            return "registry"
-        elif "Tasks" in message:
-            return "tasks"
-        elif "Dienst" in message or "Service" in message:
-            return "services"
-        else:
-            return "unknown"
+    def close(self):
+        self.file.close()
 
-    def show_dialog_threadsafe(self, title: str, message: str, change_type: str):
+# Liefert je aufgezeichnetem Zyklus (Zeit, fällige Quellen, Gesamtstand aller Quellen);
+# der Stand wird fortgeschrieben, nicht geänderte Quellen behalten ihre Daten
+def read_recording(path):
+    state = {}
+    with gzip.open(path, "rt", encoding="utf8") as f:
+        try:
+            for line in f:
+                frame = json.loads(line)
+                for name, data in frame["sources"].items():
+                    state[name] = _decode_snapshot_value(data)
+                yield frame["t"], frame["due"], state
+        except (EOFError, ValueError) as e:
+            ENGINE_LOG.warning(f"Aufzeichnung {path} endet unvollständig: {e}")
+
+def compare_states(previous_state, current_state, names, rules=None, metrics=None):
+    events = []
+    for name in names:
+        # Quellen ohne Vergleichsbasis (erster erfolgreicher Scan) bilden nur die Basis
+        if name not in previous_state or name not in current_state:
+            continue
+        started = time.perf_counter()
         try:
-            self.dialog_title = title
-            self.dialog_message = message
-            self.change_type = change_type
-            QTimer.singleShot(0, self.display_dialog)
+            events.extend(COMPARATORS[name](previous_state[name], current_state[name], name))
         except Exception as e:
-            logging.error(f"Fehler beim threadsicheren Dialog: {e}")
+            ENGINE_LOG.error(f"Fehler beim Vergleich der Quelle {name}: {e}")
+            if metrics is not None:
+                metrics.record_error(name, "compare")
+        if metrics is not None:
+            metrics.observe_compare(name, time.perf_counter() - started)
+    return rules.filter(events) if rules is not None else events
+
+# Führt die aktivierten Collectors parallel auf einem begrenzten Thread-Pool aus.
+# Das Timeout gilt pro Collector ab dessen Start; hängende Collectors werden als
+# fehlgeschlagen gemeldet und erst neu gestartet, wenn ihr alter Aufruf zurückkehrt.
+# Ein hängender Aufruf belegt seinen Worker weiter, daher wird der Pool dann ersetzt.
+class CollectorExecutor:
+    # Wartezeit, bis eingereihte Collectors einen Worker bekommen und ihr Timeout beginnt
+    START_POLL_INTERVAL = 0.05
+
+    def __init__(self, max_workers=4, timeout=30, timeouts=None, hasher=None, metrics=None):
+        self.hasher = hasher
+        self.metrics = metrics
+        self.timeout = timeout
+        self.timeouts = timeouts or {}
+        self.max_workers = max(1, max_workers)
+        self.pool = self._new_pool()
+        self.pending = {}
+
+    def _new_pool(self):
+        return ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="collector")
+
+    def timeout_for(self, name):
+        return self.timeouts.get(name, self.timeout)
+
+    # Gleicher Stand wie zuletzt (einfacher Vergleich, auch gegen den kompakten Stand): Fingerabdruck
+    # übernehmen, statt jeden Wert erneut rekursiv zu hashen
+    @staticmethod
+    def _digest(data, previous):
+        if previous is not None and previous[0] == data:
+            return previous[1]
+        return snapshot_digest(data)
+
+    def _call(self, name, started, baseline):
+        started[name] = time.monotonic()
+        data = call_in_collector_context((name, self.metrics), COLLECTORS[name])
+        if self.metrics is not None:
+            self.metrics.observe_collect(name, time.monotonic() - started[name], data)
+        outputs = {name: (data, self._digest(data, baseline.get(name)))}
+        # Zieldateien werden als eigene Quelle "<name>:targets" im Zustand geführt
+        resolver = TARGET_RESOLVERS.get(name)
+        if self.hasher is not None and resolver is not None:
+            hash_started = time.monotonic()
+            try:
+                previous = baseline.get(target_source(name))
+                targets = self.hasher.hash_targets(resolver(data), previous[0] if previous is not None else None)
+                outputs[target_source(name)] = (targets, self._digest(targets, previous))
+                if self.metrics is not None:
+                    self.metrics.observe_collect(target_source(name), time.monotonic() - hash_started, targets)
+            except Exception as e:
+                ENGINE_LOG.error(f"Fehler beim Hashen der Zieldateien von {name}: {e}")
+                if self.metrics is not None:
+                    self.metrics.record_error(target_source(name))
+        return outputs
+
+    def _failed(self, failed, name, reason):
+        failed.append(name)
+        if self.metrics is not None:
+            self.metrics.record_error(name, reason)
+
+    # baseline: Quelle -> (letzter Stand, Fingerabdruck) für die Übernahme unveränderter Fingerabdrücke
+    def run(self, names, baseline=None):
+        baseline = baseline or {}
+        results = {}
+        digests = {}
+        failed = []
+        futures = {}
+        started = {}
+        for name in names:
+            previous = self.pending.get(name)
+            if previous is not None and not previous.done():
+                ENGINE_LOG.error(f"Collector {name} hängt noch aus einem früheren Zyklus")
+                self._failed(failed, name, "hung")
+                continue
+            future = self.pool.submit(self._call, name, started, baseline)
+            self.pending[name] = future
+            futures[future] = name
+
+        while futures:
+            now = time.monotonic()
+            next_deadline = None
+            queued = False
+            for future, name in list(futures.items()):
+                if future.done():
+                    continue
+                # Eingereihte Collectors warten nur auf einen Worker, ihr Timeout beginnt erst mit dem Start
+                if name not in started:
+                    queued = True
+                    continue
+                deadline = started[name] + self.timeout_for(name)
+                if now >= deadline:
+                    hung = not future.cancel()
+                    ENGINE_LOG.error(f"Collector {name} Timeout nach {self.timeout_for(name)} Sek.")
+                    self._failed(failed, name, "timeout")
+                    del futures[future]
+                    if hung:
+                        self._replace_pool(futures, started, baseline)
+                elif next_deadline is None or deadline < next_deadline:
+                    next_deadline = deadline
+            done = [future for future in futures if future.done()]
+            for future in done:
+                name = futures.pop(future)
+                try:
+                    for source, (data, digest) in future.result().items():
+                        results[source] = data
+                        digests[source] = digest
+                except Exception as e:
+                    ENGINE_LOG.error(f"Collector {name} fehlgeschlagen: {e}")
+                    self._failed(failed, name, "error")
+            if queued and (next_deadline is None or next_deadline > now + self.START_POLL_INTERVAL):
+                next_deadline = now + self.START_POLL_INTERVAL
+            if futures and next_deadline is not None:
+                wait(list(futures), timeout=max(0.0, next_deadline - time.monotonic()), return_when=FIRST_COMPLETED)
+        return results, digests, failed
+
+    # Der alte Pool läuft mit dem hängenden Aufruf aus; noch nicht gestartete Collectors
+    # wandern in einen neuen Pool mit voller Worker-Zahl, damit sie nicht hinter ihm verhungern
+    def _replace_pool(self, futures, started, baseline):
+        old_pool, self.pool = self.pool, self._new_pool()
+        for future, name in list(futures.items()):
+            if name not in started and future.cancel():
+                del futures[future]
+                future = self.pool.submit(self._call, name, started, baseline)
+                self.pending[name] = future
+                futures[future] = name
+        old_pool.shutdown(wait=False)
+
+    def shutdown(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
+        if self.hasher is not None:
+            self.hasher.shutdown()
+
+# Plant jede Quelle mit eigenem Intervall auf einem gemeinsamen Deadline-Heap.
+# stop() weckt den wartenden Monitor-Thread sofort auf.
+class ScanScheduler:
+    def __init__(self, intervals, stop_flag=None):
+        self.intervals = dict(intervals)
+        self.requested = dict(intervals)
+        self.stop_flag = stop_flag or threading.Event()
+        self.condition = threading.Condition()
+        self.deadlines = {}
+        self.floors = {}
+        self.heap = []
+        # Laufende Quellen und solche, für die währenddessen eine Benachrichtigung kam
+        self.running = set()
+        self.retrigger = set()
+        # Verzug des zuletzt gestarteten Zyklus gegenüber der frühesten fälligen Deadline
+        self.lag = 0.0
+        now = time.monotonic()
+        for name, interval in self.intervals.items():
+            self._schedule(name, now + interval)
+
+    def _schedule(self, name, deadline):
+        self.deadlines[name] = deadline
+        heapq.heappush(self.heap, (deadline, name))
+
+    def stopped(self):
+        return self.stop_flag.is_set()
+
+    def stop(self):
+        with self.condition:
+            self.stop_flag.set()
+            self.condition.notify_all()
+
+    def set_interval(self, name, interval):
+        with self.condition:
+            if name not in self.intervals:
+                return
+            self.requested[name] = interval
+            self._apply_interval(name)
+
+    # Untergrenze für das Intervall, z.B. wenn eine Quelle über Benachrichtigungen abgedeckt ist
+    def set_floor(self, name, floor):
+        with self.condition:
+            self.floors[name] = floor
+            if name in self.intervals:
+                self._apply_interval(name)
+
+    def _apply_interval(self, name):
+        last_run = self.deadlines[name] - self.intervals[name]
+        self.intervals[name] = max(self.requested[name], self.floors.get(name, 0))
+        self._schedule(name, last_run + self.intervals[name])
+        self.condition.notify_all()
+
+    def trigger(self, names):
+        with self.condition:
+            now = time.monotonic()
+            for name in names:
+                if name not in self.intervals:
+                    continue
+                # Während des Scans ist die Deadline schon erreicht; erst complete() plant neu
+                if name in self.running:
+                    self.retrigger.add(name)
+                elif self.deadlines[name] > now:
+                    self._schedule(name, now)
+            self.condition.notify_all()
+
+    def next_due(self):
+        with self.condition:
+            while not self.stop_flag.is_set():
+                now = time.monotonic()
+                due = []
+                earliest = None
+                while self.heap and self.heap[0][0] <= now:
+                    deadline, name = heapq.heappop(self.heap)
+                    # Veraltete Heap-Einträge (nach set_interval/trigger) überspringen
+                    if self.deadlines.get(name) == deadline and name not in due:
+                        due.append(name)
+                        earliest = deadline if earliest is None else min(earliest, deadline)
+                if due:
+                    self.lag = now - earliest
+                    self.running.update(due)
+                    return due
+                self.condition.wait(self.heap[0][0] - now if self.heap else None)
+            return []
+
+    def complete(self, names):
+        with self.condition:
+            now = time.monotonic()
+            for name in names:
+                self.running.discard(name)
+                # Änderung während des Scans: sofort erneut scannen statt ein Intervall zu warten
+                if name in self.retrigger:
+                    self.retrigger.discard(name)
+                    self._schedule(name, now)
+                    continue
+                deadline = self.deadlines[name] + self.intervals[name]
+                # Bei Überlauf nicht nachholen, sondern ab jetzt neu takten
+                self._schedule(name, deadline if deadline > now else now + self.intervals[name])
+            self.condition.notify_all()
+
+def notification_targets():
+    targets = {
+        "startup_folders": [("dir", USER_STARTUP_DIR), ("dir", COMMON_STARTUP_DIR)]
+    }
+    if winreg is None:
+        return targets
+    for name, location in ASEP_LOCATIONS.items():
+        targets[name] = [("key", getattr(winreg, REGISTRY_HIVES[location.hive]), location.path)]
+    return targets
+
+# Basis der Änderungsbenachrichtiger: Quellen melden Verzeichnisse bzw. Registry-Schlüssel
+# an, wait() liefert die Namen der Quellen, deren Ziel sich seitdem geändert hat.
+class ChangeNotifier:
+    def watch_directory(self, source, path):
+        return False
+
+    def watch_key(self, source, hive, path):
+        return False
+
+    def wait(self, timeout=None):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+class FakeNotifier(ChangeNotifier):
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.targets = {}
+        self.fired = set()
+
+    def watch_directory(self, source, path):
+        self.targets[("dir", path)] = source
+        return True
+
+    def watch_key(self, source, hive, path):
+        self.targets[("key", hive, path)] = source
+        return True
+
+    def fire(self, *target):
+        with self.condition:
+            source = self.targets.get(target)
+            if source is not None:
+                self.fired.add(source)
+                self.condition.notify_all()
+
+    def wait(self, timeout=None):
+        with self.condition:
+            if not self.fired:
+                self.condition.wait(timeout)
+            fired, self.fired = self.fired, set()
+            return fired
+
+class InotifyNotifier(ChangeNotifier):
+    IN_MODIFY = 0x00000002
+    IN_ATTRIB = 0x00000004
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    WATCH_MASK = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+    EVENT_HEADER = struct.Struct("iIII")
 
-    def display_dialog(self):
+    def __init__(self):
+        self.libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 fehlgeschlagen")
+        self.watches = {}
+
+    def watch_directory(self, source, path):
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(path), self.WATCH_MASK)
+        if wd < 0:
+            ENGINE_LOG.error(f"inotify-Überwachung für {path} nicht möglich: {os.strerror(ctypes.get_errno())}")
+            return False
+        self.watches[wd] = source
+        return True
+
+    def wait(self, timeout=None):
+        fired = set()
         try:
-            dialog = CustomDialog(
-                self.dialog_title,
-                self.dialog_message,
-                self.change_type,
-                parent=self
-            )
-            dialog.exec()
+            readable, _, _ = select.select([self.fd], [], [], timeout)
+        except (OSError, ValueError):
+            return fired
+        if not readable:
+            return fired
+        while True:
+            try:
+                data = os.read(self.fd, 65536)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset + self.EVENT_HEADER.size <= len(data):
+                wd, _, _, length = self.EVENT_HEADER.unpack_from(data, offset)
+                offset += self.EVENT_HEADER.size + length
+                if wd in self.watches:
+                    fired.add(self.watches[wd])
+        return fired
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+class Win32Notifier(ChangeNotifier):
+    FILE_NOTIFY_CHANGE_FILE_NAME = 0x00000001
+    FILE_NOTIFY_CHANGE_LAST_WRITE = 0x00000010
+    REG_NOTIFY_CHANGE_NAME = 0x00000001
+    REG_NOTIFY_CHANGE_LAST_SET = 0x00000004
+    KEY_NOTIFY = 0x0010
+    WAIT_OBJECT_0 = 0x00000000
+    WAIT_TIMEOUT = 0x00000102
+    WAIT_FAILED = 0xFFFFFFFF
+    INVALID_HANDLE_VALUE = ctypes.c_void_p(-1).value
+    MAXIMUM_WAIT_OBJECTS = 64
+
+    def __init__(self):
+        from ctypes import wintypes
+        self.wintypes = wintypes
+        self.kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+        self.advapi32 = ctypes.WinDLL("advapi32", use_last_error=True)
+        self.kernel32.FindFirstChangeNotificationW.restype = wintypes.HANDLE
+        self.kernel32.FindFirstChangeNotificationW.argtypes = [wintypes.LPCWSTR, wintypes.BOOL, wintypes.DWORD]
+        self.kernel32.CreateEventW.restype = wintypes.HANDLE
+        self.kernel32.WaitForMultipleObjects.argtypes = [wintypes.DWORD, ctypes.POINTER(wintypes.HANDLE), wintypes.BOOL, wintypes.DWORD]
+        self.kernel32.WaitForMultipleObjects.restype = wintypes.DWORD
+        # Handles sind unter 64 Bit zeigerbreit; ohne argtypes würden sie auf int gekürzt
+        for function in (self.kernel32.FindNextChangeNotification, self.kernel32.FindCloseChangeNotification, self.kernel32.CloseHandle):
+            function.argtypes = [wintypes.HANDLE]
+            function.restype = wintypes.BOOL
+        self.kernel32.CreateEventW.argtypes = [wintypes.LPVOID, wintypes.BOOL, wintypes.BOOL, wintypes.LPCWSTR]
+        self.advapi32.RegCloseKey.argtypes = [wintypes.HKEY]
+        self.advapi32.RegCloseKey.restype = wintypes.LONG
+        self.advapi32.RegOpenKeyExW.argtypes = [wintypes.HKEY, wintypes.LPCWSTR, wintypes.DWORD, wintypes.DWORD, ctypes.POINTER(wintypes.HKEY)]
+        self.advapi32.RegNotifyChangeKeyValue.argtypes = [wintypes.HKEY, wintypes.BOOL, wintypes.DWORD, wintypes.HANDLE, wintypes.BOOL]
+        # Je Eintrag: (Handle, Quelle, Registry-Schlüssel oder None für Verzeichnisse)
+        self.watches = []
+
+    def _arm_key(self, hkey, event):
+        return self.advapi32.RegNotifyChangeKeyValue(
+            hkey, True, self.REG_NOTIFY_CHANGE_NAME | self.REG_NOTIFY_CHANGE_LAST_SET, event, True
+        ) == 0
+
+    def watch_directory(self, source, path):
+        if len(self.watches) >= self.MAXIMUM_WAIT_OBJECTS:
+            return False
+        handle = self.kernel32.FindFirstChangeNotificationW(
+            path, False, self.FILE_NOTIFY_CHANGE_FILE_NAME | self.FILE_NOTIFY_CHANGE_LAST_WRITE
+        )
+        if not handle or handle == self.INVALID_HANDLE_VALUE:
+            ENGINE_LOG.error(f"Verzeichnisüberwachung für {path} nicht möglich: {ctypes.get_last_error()}")
+            return False
+        self.watches.append((handle, source, None))
+        return True
+
+    def watch_key(self, source, hive, path):
+        if len(self.watches) >= self.MAXIMUM_WAIT_OBJECTS:
+            return False
+        hkey = self.wintypes.HKEY()
+        # Vordefinierte Hive-Handles sind vorzeichenerweitert (z.B. 0xFFFFFFFF80000002)
+        root = self.wintypes.HKEY(ctypes.c_long(hive).value)
+        if self.advapi32.RegOpenKeyExW(root, path, 0, self.KEY_NOTIFY, ctypes.byref(hkey)) != 0:
+            ENGINE_LOG.error(f"Registry-Überwachung für {path} nicht möglich")
+            return False
+        event = self.kernel32.CreateEventW(None, False, False, None)
+        if not event or not self._arm_key(hkey, event):
+            self.advapi32.RegCloseKey(hkey)
+            if event:
+                self.kernel32.CloseHandle(event)
+            return False
+        self.watches.append((event, source, hkey))
+        return True
+
+    # WAIT_FAILED (z.B. ungültig gewordenes Handle) kehrt sofort zurück; als Timeout behandelt
+    # würde der Aufrufer in einer Schleife ohne Pause laufen, daher Fehler an watch_notifications
+    def _wait_handles(self, handles, millis):
+        result = self.kernel32.WaitForMultipleObjects(len(self.watches), handles, False, millis)
+        if result == self.WAIT_FAILED:
+            raise ctypes.WinError(ctypes.get_last_error())
+        return result
+
+    def wait(self, timeout=None):
+        fired = set()
+        if not self.watches:
+            time.sleep(timeout or 0)
+            return fired
+        handles = (self.wintypes.HANDLE * len(self.watches))(*[watch[0] for watch in self.watches])
+        millis = 0xFFFFFFFF if timeout is None else int(timeout * 1000)
+        result = self._wait_handles(handles, millis)
+        while self.WAIT_OBJECT_0 <= result < self.WAIT_OBJECT_0 + len(self.watches):
+            handle, source, hkey = self.watches[result - self.WAIT_OBJECT_0]
+            fired.add(source)
+            # Benachrichtigungen sind einmalig und müssen neu angemeldet werden
+            if hkey is None:
+                self.kernel32.FindNextChangeNotification(handle)
+            else:
+                self._arm_key(hkey, handle)
+            result = self._wait_handles(handles, 0)
+        return fired
+
+    def close(self):
+        for handle, _, hkey in self.watches:
+            if hkey is None:
+                self.kernel32.FindCloseChangeNotification(handle)
+            else:
+                self.advapi32.RegCloseKey(hkey)
+                self.kernel32.CloseHandle(handle)
+        self.watches = []
+
+def create_notifier():
+    try:
+        if sys.platform == "win32":
+            return Win32Notifier()
+        if sys.platform.startswith("linux"):
+            return InotifyNotifier()
+    except Exception as e:
+        ENGINE_LOG.error(f"Änderungsbenachrichtigung nicht verfügbar, nur Polling aktiv: {e}")
+    return None
+
+def register_watches(notifier, names, targets=None):
+    targets = notification_targets() if targets is None else targets
+    watched = []
+    for name in names:
+        if name not in targets:
+            continue
+        ok = True
+        for target in targets[name]:
+            if target[0] == "dir":
+                ok = notifier.watch_directory(name, target[1]) and ok
+            else:
+                ok = notifier.watch_key(name, target[1], target[2]) and ok
+        # Nur vollständig überwachte Quellen dürfen seltener gepollt werden
+        if ok:
+            watched.append(name)
+    return watched
+
+def watch_notifications(notifier, scheduler, watched):
+    try:
+        while not scheduler.stopped():
+            fired = notifier.wait(1.0)
+            if fired:
+                ENGINE_LOG.debug(f"Änderungsbenachrichtigung für: {', '.join(sorted(fired))}")
+                scheduler.trigger(fired)
+    except Exception as e:
+        ENGINE_LOG.error(f"Fehler im Änderungsbenachrichtiger, zurück zu reinem Polling: {e}")
+        for name in watched:
+            scheduler.set_floor(name, 0)
+    finally:
+        notifier.close()
+
+SETTINGS_FILE = "settings.json"
+
+def load_settings(path=SETTINGS_FILE):
+    if os.path.exists(path):
+        try:
+            with open(path, "r", encoding="utf8") as f:
+                settings = {**DEFAULT_SETTINGS, **json.load(f)}
+            LOG.info("Einstellungen erfolgreich geladen")
+            return settings
         except Exception as e:
-            logging.error(f"Fehler beim Anzeigen des Dialogs: {e}")
+            LOG.error(f"Fehler beim Laden der Einstellungen: {e}")
+            return DEFAULT_SETTINGS.copy()
+    LOG.info("Standard-Einstellungen verwendet")
+    return DEFAULT_SETTINGS.copy()
+
+def report_to_log(events):
+    msg_text = render_events(events)
+    CHANGES_LOG.info("Änderungen gefunden:\n" + msg_text)
+
+def summarize_events(events, language="de", limit=5):
+    lines = [render_event(event, language) for event in events[:limit]]
+    if len(events) > limit:
+        more = len(events) - limit
+        lines.append(f"… und {more} weitere Änderungen" if language == "de" else f"… and {more} more changes")
+    return "\n".join(lines)
+
+# Stellt Änderungen auf einem eigenen Thread zu. Änderungen innerhalb des Ruhefensters werden
+# zu einer Meldung zusammengefasst, die Alarmrate ist begrenzt und submit() blockiert nie,
+# damit eine langsame Senke den nächsten Scan nicht verzögert.
+# direct_sinks erhalten jede Änderung sofort im aufrufenden Thread, ohne Drosselung und ohne die
+# begrenzte Warteschlange (z.B. die verlustfreie EventBridge des Änderungsdialogs)
+class NotificationDispatcher:
+    def __init__(self, sinks, quiet_window=2.0, max_delay=30.0, max_per_minute=6, max_pending=10000, direct_sinks=()):
+        self.sinks = list(sinks)
+        self.direct_sinks = list(direct_sinks)
+        self.quiet_window = quiet_window
+        self.max_delay = max_delay
+        self.max_per_minute = max_per_minute
+        self.max_pending = max_pending
+        self.condition = threading.Condition()
+        self.pending = collections.deque()
+        self.dropped = 0
+        self.dropped_total = 0
+        self.first_submit = None
+        self.last_submit = None
+        self.sent = collections.deque()
+        self.stopping = False
+        self.thread = threading.Thread(target=self._run, name="notification-dispatcher", daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def submit(self, events):
+        for sink in self.direct_sinks:
+            try:
+                sink(events)
+            except Exception as e:
+                NOTIFY_LOG.error(f"Fehler in Benachrichtigungssenke {getattr(sink, '__name__', sink)}: {e}")
+        if not self.sinks:
+            return
+        with self.condition:
+            now = time.monotonic()
+            self.pending.extend(events)
+            # Rückstau begrenzen: älteste Alarme verwerfen statt den Monitor-Thread zu blockieren
+            while len(self.pending) > self.max_pending:
+                self.pending.popleft()
+                self.dropped += 1
+                self.dropped_total += 1
+            if self.first_submit is None:
+                self.first_submit = now
+            self.last_submit = now
+            self.condition.notify_all()
+
+    def stop(self, timeout=5.0):
+        with self.condition:
+            self.stopping = True
+            self.condition.notify_all()
+        if self.thread.is_alive():
+            self.thread.join(timeout)
+
+    def _next_dispatch(self, now):
+        # Zeitpunkt, ab dem der aktuelle Stapel zugestellt werden darf
+        due = min(self.last_submit + self.quiet_window, self.first_submit + self.max_delay)
+        while self.sent and self.sent[0] <= now - 60:
+            self.sent.popleft()
+        if self.max_per_minute and len(self.sent) >= self.max_per_minute:
+            due = max(due, self.sent[0] + 60)
+        return due
+
+    def _run(self):
+        while True:
+            with self.condition:
+                while not self.stopping:
+                    if self.pending:
+                        now = time.monotonic()
+                        due = self._next_dispatch(now)
+                        if due <= now:
+                            break
+                        self.condition.wait(due - now)
+                    else:
+                        self.condition.wait()
+                if not self.pending:
+                    return
+                batch = list(self.pending)
+                self.pending.clear()
+                dropped, self.dropped = self.dropped, 0
+                self.first_submit = self.last_submit = None
+                self.sent.append(time.monotonic())
+            if dropped:
+                NOTIFY_LOG.warning(f"{dropped} Änderungen wegen Rückstau nicht als Alarm zugestellt")
+            for sink in self.sinks:
+                try:
+                    sink(batch)
+                except Exception as e:
+                    NOTIFY_LOG.error(f"Fehler in Benachrichtigungssenke {getattr(sink, '__name__', sink)}: {e}")
+
+# Verlustfreie Übergabe von Änderungen an einen anderen Thread (z.B. den Qt-Thread).
+# notify wird nur beim Übergang von leer zu nicht leer aufgerufen; der Empfänger holt
+# die Änderungen mit drain() stapelweise ab, bis die Warteschlange leer ist.
+class EventBridge:
+    def __init__(self, notify=None):
+        self.lock = threading.Lock()
+        self.queue = collections.deque()
+        self.notify = notify
+        self.signalled = False
+
+    def push(self, events):
+        with self.lock:
+            self.queue.extend(events)
+            if self.signalled or not self.queue:
+                return
+            self.signalled = True
+        if self.notify is not None:
+            self.notify()
+
+    def drain(self, max_items=None):
+        with self.lock:
+            count = len(self.queue) if max_items is None else min(max_items, len(self.queue))
+            batch = [self.queue.popleft() for _ in range(count)]
+            more = bool(self.queue)
+            if not more:
+                self.signalled = False
+            return batch, more
+
+    def __len__(self):
+        with self.lock:
+            return len(self.queue)
+
+# Überwachungslogik ohne GUI: liest ihre Konfiguration aus dem Settings-Dict und meldet
+# gefundene Änderungen an den übergebenen report-Callback (GUI oder Log)
+class MonitorEngine:
+    def __init__(self, settings, sinks=None, history=None, baseline=None, direct_sinks=None):
+        self.settings = settings
+        self.sinks = sinks or [report_to_log]
+        self.direct_sinks = direct_sinks or []
+        self.history = history
+        # Von einer vorherigen Instanz übernommener Zustand (state, digests) statt der Snapshot-Datei
+        self.baseline = baseline
+        self.snapshot = None
+        self.suppressions = None
+        self.metrics = MonitorMetrics()
+        self.dispatcher = None
+        self.scheduler = None
+        self.thread = None
+
+    def setting(self, key):
+        return self.settings.get(key, DEFAULT_SETTINGS[key])
+
+    def enabled_sources(self):
+        methods = self.setting("selected_methods")
+        defaults = DEFAULT_SETTINGS["selected_methods"]
+        multi_user = self.setting("multi_user")
+        return [
+            name for name in COLLECTORS
+            if methods.get(name, defaults.get(name, True)) and (multi_user or name not in MULTI_USER_SOURCES)
+        ]
+
+    def scan_intervals(self, names):
+        overrides = self.setting("scan_intervals")
+        return {name: overrides.get(name, self.setting("scan_interval")) for name in names}
+
+    def running(self):
+        return self.scheduler is not None
+
+    def start(self):
+        if self.scheduler is not None:
+            return
+        # Jeder Lauf bekommt einen eigenen Scheduler samt Stop-Event, damit ein noch
+        # auslaufender alter Thread bei schnellem Umschalten nicht weiterläuft
+        if self.history is None and self.setting("history_enabled"):
+            try:
+                self.history = ChangeHistory()
+            except Exception as e:
+                HISTORY_LOG.error(f"Änderungshistorie nicht verfügbar: {e}")
+        self.scheduler = ScanScheduler(self.scan_intervals(self.enabled_sources()), threading.Event())
+        self.dispatcher = NotificationDispatcher(
+            self.sinks,
+            quiet_window=self.setting("notification_quiet_window"),
+            max_delay=self.setting("notification_max_delay"),
+            max_per_minute=self.setting("notification_max_per_minute"),
+            direct_sinks=self.direct_sinks
+        ).start()
+        ENGINE_LOG.info("Monitoring gestartet")
+        self.thread = threading.Thread(target=self.run, args=(self.scheduler, self.dispatcher, self.thread), daemon=True)
+        self.thread.start()
+
+    def stop(self, wait=False):
+        if self.scheduler is not None:
+            self.scheduler.stop()
+            self.scheduler = None
+            ENGINE_LOG.info("Monitoring gestoppt")
+        # Ausstehende Meldungen noch zustellen, ohne den aufrufenden (GUI-)Thread zu blockieren
+        if self.dispatcher is not None:
+            if wait:
+                self.dispatcher.stop()
+            else:
+                threading.Thread(target=self.dispatcher.stop, daemon=True).start()
+            self.dispatcher = None
+
+    def status(self):
+        scheduler = self.scheduler
+        metrics = self.metrics
+        suppressions = self.suppressions
+        return {
+            "running": scheduler is not None,
+            "sources": sorted(scheduler.intervals) if scheduler is not None else [],
+            "cycles": metrics.cycles,
+            "last_cycle": metrics.last_cycle,
+            "schedule_lag": metrics.last_lag,
+            "errors": sum(metrics.errors.values()),
+            "events": sum(metrics.events.values()),
+            "suppressed": sum(suppressions.hits.values()) if suppressions is not None else 0
+        }
 
-    def load_settings(self):
-        if os.path.exists("settings.json"):
+    # Überwachung beenden und den letzten Zustand für eine nachfolgende Instanz liefern
+    def handoff(self, timeout=90):
+        thread = self.thread
+        self.stop(wait=True)
+        if thread is not None:
+            thread.join(timeout=timeout)
+            if thread.is_alive():
+                ENGINE_LOG.error("Monitoring-Thread nicht rechtzeitig beendet; Zustand wird nicht übergeben")
+                return None
+        if self.snapshot is None:
+            return None
+        return encode_snapshot(*self.snapshot)
+
+    def update_intervals(self):
+        scheduler = self.scheduler
+        if scheduler is None:
+            return
+        overrides = self.setting("scan_intervals")
+        for name in list(scheduler.intervals):
+            if name not in overrides:
+                scheduler.set_interval(name, self.setting("scan_interval"))
+
+    def run(self, scheduler, dispatcher, previous_run=None):
+        # Nach schnellem Stop/Start erst den alten Lauf auslaufen lassen: sein letzter Zyklus schreibt
+        # noch den Snapshot, sein Abbau schließt die prozessweiten Worker (Command-Hosts, Benutzer-Pool)
+        if previous_run is not None and previous_run.is_alive():
+            ENGINE_LOG.info("Warte auf das Ende des vorherigen Monitoring-Laufs")
+            previous_run.join()
+        if scheduler.stopped():
+            if self.scheduler is scheduler:
+                self.scheduler = None
+            return
+        enabled = list(scheduler.intervals)
+        executor = CollectorExecutor(
+            max_workers=self.setting("collector_workers"),
+            timeout=self.setting("collector_timeout"),
+            timeouts=self.setting("collector_timeouts"),
+            hasher=TargetHasher(self.setting("hash_workers")) if self.setting("hash_targets") else None,
+            metrics=self.metrics
+        )
+        configure_command_hosts(self.setting("command_workers"), self.setting("command_timeout"))
+        USER_SCANNER.configure(self.setting("user_workers"))
+        suppressions = self.suppressions = SuppressionRules(self.setting("suppressions_file"))
+        metrics = self.metrics
+        metrics.suppression_hits = suppressions.hits
+        metrics_file = self.setting("metrics_file")
+        recorder = SnapshotRecorder(self.setting("record_file")) if self.setting("record_file") else None
+        fleet = None
+        if self.setting("fleet_collector"):
             try:
-                with open("settings.json", "r", encoding="utf8") as f:
-                    self.settings = json.load(f)
-                logging.info("Einstellungen erfolgreich geladen")
+                fleet = FleetAgent(
+                    self.setting("fleet_collector"),
+                    host_id=self.setting("fleet_host_id") or None,
+                    spool=FleetSpool(self.setting("fleet_spool_file"), self.setting("fleet_spool_max_rows")),
+                    digest_interval=self.setting("fleet_digest_interval")
+                ).start()
             except Exception as e:
-                logging.error(f"Fehler beim Laden der Einstellungen: {e}")
-                self.settings = DEFAULT_SETTINGS.copy()
+                FLEET_LOG.error(f"Fleet-Agent nicht verfügbar: {e}")
+        # Port 0 = kein HTTP-Endpunkt, nur die Datei
+        metrics_server = MetricsServer(metrics, self.setting("metrics_port")).start() if self.setting("metrics_port") else None
+        persist = self.setting("persist_snapshot")
+        # Gespeicherte Basis laden; der erste Scan wird direkt dagegen verglichen und
+        # meldet so auch Änderungen, die bei nicht laufendem Monitor passiert sind
+        if self.baseline is not None:
+            stored_state, stored_digests = self.baseline
+            self.baseline = None
         else:
-            self.settings = DEFAULT_SETTINGS.copy()
-            logging.info("Standard-Einstellungen verwendet")
-
-    def save_settings(self):
-        current_settings = {
-            "selected_methods": {
-                "startup_folders": self.chk_startup.isChecked(),
-                "registry": self.chk_registry.isChecked(),
-                "registry_hklm_run": self.chk_reg_hklm_run.isChecked(),
-                "context_handlers_star": self.chk_ctx_star.isChecked(),
-                "context_handlers_allfilesystem": self.chk_ctx_allfilesystem.isChecked(),
-                "context_handlers_directory": self.chk_ctx_directory.isChecked(),
-                "context_handlers_directory_bg": self.chk_ctx_directory_bg.isChecked(),
-                "folder_context_handlers": self.chk_folder_ctx.isChecked(),
-                "directory_dragdrop_handlers": self.chk_directory_dragdrop.isChecked(),
-                "services": self.chk_services.isChecked(),
-                "tasks": self.chk_tasks.isChecked()
-            },
-            "notification_methods": {
-                "windows_toast": self.chk_toast.isChecked(),
-                "dialog": self.chk_dialog.isChecked()
-            },
-            "auto_start": self.chk_autostart.isChecked(),
-            "language": self.cmb_language.currentText(),
-            "dark_mode": self.chk_dark_mode.isChecked(),
-            "scan_interval": self.sld_interval.value()
-        }
-        self.settings = current_settings
+            stored_state, stored_digests = load_snapshot() if persist else ({}, {})
+        previous_state = {name: compact_source(name, value) for name, value in stored_state.items() if base_source(name) in enabled}
+        stored_state.update(previous_state)
+        previous_digests = {name: value for name, value in stored_digests.items() if base_source(name) in enabled}
+
+        def cycle(names, lag=0.0):
+            nonlocal previous_state
+            cycle_started = stage_started = time.perf_counter()
+            results, digests, failed = executor.run(names, {
+                name: (previous_state[name], previous_digests[name]) for name in previous_digests if name in previous_state
+            })
+            stage_started = metrics.observe_stage("collect", stage_started)
+            # Nur Quellen mit geändertem Fingerabdruck werden strukturell verglichen
+            changed = [name for name in digests if digests[name] != previous_digests.get(name)]
+            # Nicht fällige, fehlgeschlagene und unveränderte Quellen behalten ihren letzten (kompakten)
+            # Stand; die frischen Collector-Daten werden dann gleich wieder freigegeben
+            current_state = dict(previous_state)
+            pool = {}
+            for name in results:
+                if name in changed or name not in previous_state:
+                    current_state[name] = compact_source(name, results[name], previous_state.get(name), pool)
+            del pool
+            stage_started = metrics.observe_stage("compact", stage_started)
+
+            # Regeldatei bei Änderung neu laden, ohne das Monitoring neu zu starten
+            suppressions.refresh()
+            events = compare_states(previous_state, current_state, changed, suppressions, metrics)
+            previous_digests.update(digests)
+            metrics.record_changes(changed, events)
+            stage_started = metrics.observe_stage("diff", stage_started)
+
+            if recorder is not None and changed:
+                try:
+                    recorder.record(names, {name: results[name] for name in changed if name in names})
+                except Exception as e:
+                    ENGINE_LOG.error(f"Fehler beim Aufzeichnen des Zyklus: {e}")
+            if events:
+                # Die Historie wird vor der (ggf. verdichteten) Benachrichtigung verlustfrei geschrieben
+                if self.history is not None:
+                    try:
+                        self.history.record(events)
+                    except Exception as e:
+                        HISTORY_LOG.error(f"Fehler beim Schreiben der Änderungshistorie: {e}")
+            if self.history is not None:
+                self.history.maintain(self.setting("history_retention_days"), self.setting("history_max_rows"))
+
+            if fleet is not None and (events or changed or fleet.digests_due()):
+                try:
+                    if events:
+                        fleet.submit_events(events)
+                    fleet.submit_digests(previous_digests, changed, state=current_state)
+                except Exception as e:
+                    FLEET_LOG.error(f"Fehler beim Schreiben in den Fleet-Spool: {e}")
+            stage_started = metrics.observe_stage("record", stage_started)
+            if events:
+                dispatcher.submit(events)
+            stage_started = metrics.observe_stage("notify", stage_started)
+
+            previous_state = current_state
+            self.snapshot = (previous_state, previous_digests)
+            # Nur schreiben, wenn sich ein Fingerabdruck geändert hat
+            if persist and changed:
+                stored_state.update(previous_state)
+                stored_digests.update(previous_digests)
+                save_snapshot(stored_state, stored_digests)
+            metrics.observe_stage("persist", stage_started)
+
+            metrics.observe_cycle(time.perf_counter() - cycle_started, lag)
+            if metrics_file:
+                metrics.write(metrics_file)
+
         try:
-            with open("settings.json", "w", encoding="utf8") as f:
-                json.dump(self.settings, f, indent=4, ensure_ascii=False)
-            logging.info(f"Einstellungen gespeichert: {json.dumps(self.settings, indent=4)}")
+            cycle(enabled)
         except Exception as e:
-            logging.error(f"Konnte Einstellungen nicht speichern: {e}")
+            ENGINE_LOG.error(f"Fehler beim Initialisieren des Zustands: {e}")
+
+        # Ereignisgesteuerte Erkennung; das Polling bleibt als Rückfallebene aktiv
+        if self.setting("event_driven"):
+            notifier = create_notifier()
+            if notifier is not None:
+                watched = register_watches(notifier, enabled)
+                for name in watched:
+                    scheduler.set_floor(name, self.setting("event_fallback_interval"))
+                ENGINE_LOG.info(f"Ereignisgesteuert überwacht: {', '.join(watched) or '-'}")
+                threading.Thread(target=watch_notifications, args=(notifier, scheduler, watched), daemon=True).start()
+
+        while not scheduler.stopped():
+            due = scheduler.next_due()
+            if not due:
+                break
+            try:
+                cycle(due, scheduler.lag)
+            except KeyboardInterrupt:
+                ENGINE_LOG.info("Monitoring durch KeyboardInterrupt beendet.")
+                break
+            except Exception as e:
+                ENGINE_LOG.error(f"Fehler im Monitoring: {e}")
+            finally:
+                scheduler.complete(due)
+
+        executor.shutdown()
+        # Worker werden bei Bedarf wieder gestartet; ein schnell nachfolgender Lauf verliert nichts
+        close_command_hosts()
+        USER_SCANNER.shutdown()
+        if metrics_server is not None:
+            metrics_server.stop()
+        # Nicht bestätigte Einträge bleiben im Spool und werden beim nächsten Start gesendet
+        if fleet is not None:
+            fleet.stop()
+        if recorder is not None:
+            recorder.close()
+        if suppressions.hits:
+            ENGINE_LOG.info("Unterdrückte Änderungen je Regel: " + ", ".join(f"{rule}={hits}" for rule, hits in suppressions.hits.most_common()))
+        if self.scheduler is scheduler:
+            self.scheduler = None
+        ENGINE_LOG.info("Monitoring Thread beendet")
+
+def current_rss():
+    try:
+        if sys.platform == "win32":
+            from ctypes import wintypes
+
+            class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+                _fields_ = [
+                    ("cb", wintypes.DWORD),
+                    ("PageFaultCount", wintypes.DWORD),
+                    ("PeakWorkingSetSize", ctypes.c_size_t),
+                    ("WorkingSetSize", ctypes.c_size_t),
+                    ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                    ("PagefileUsage", ctypes.c_size_t),
+                    ("PeakPagefileUsage", ctypes.c_size_t)
+                ]
+
+            counters = PROCESS_MEMORY_COUNTERS()
+            counters.cb = ctypes.sizeof(counters)
+            process = ctypes.windll.kernel32.GetCurrentProcess()
+            if ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+                return counters.WorkingSetSize
+            return None
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except Exception:
+        return None
+
+def log_startup_metrics(mode, import_seconds, echo=False):
+    rss = current_rss()
+    ready = time.perf_counter() - _IMPORT_STARTED
+    rss_text = f"{rss / (1024 * 1024):.1f} MB" if rss else "unbekannt"
+    text = f"Start ({mode}): Importe {import_seconds * 1000:.0f} ms, bereit nach {ready * 1000:.0f} ms, RSS {rss_text}"
+    LOG.info(text)
+    if echo:
+        print(text)
+
+INSTANCE_NAME = "AutostartMonitor"
+INSTANCE_HANDOFF_TIMEOUT = 120
+
+# Named Pipe unter Windows, sonst Unix-Socket; je Benutzer eine Instanz
+def instance_address(name=INSTANCE_NAME):
+    user = os.environ.get("USERNAME") or os.environ.get("USER") or "default"
+    if sys.platform == "win32":
+        return f"\\\\.\\pipe\\{name}-{user}"
+    return os.path.join(tempfile.gettempdir(), f"{name}-{user}.sock")
+
+# Sendet einen Befehl an die laufende Instanz; None, wenn keine erreichbar ist
+def instance_request(command, timeout=2.0, address=None, **params):
+    from multiprocessing.connection import Client
+    try:
+        connection = Client(address or instance_address())
+    except OSError:
+        return None
+    with connection:
+        connection.send_bytes(json.dumps({"command": command, **params}).encode("utf-8"))
+        if not connection.poll(timeout):
+            raise TimeoutError(f"Keine Antwort der laufenden Instanz auf {command}")
+        return json.loads(connection.recv_bytes().decode("utf-8"))
+
+# Lokaler Server der laufenden Instanz: ping, status, activate (Argumente einer zweiten
+# Instanz übernehmen) und handoff (Überwachung beenden, Zustand übergeben, Programm beenden)
+class InstanceServer:
+    def __init__(self, mode, engine, activate=None, shutdown=None, address=None):
+        self.mode = mode
+        self.engine = engine
+        self.activate = activate
+        self.shutdown = shutdown
+        self.address = address or instance_address()
+        self.listener = None
+        self.closed = threading.Event()
+
+    def start(self):
+        from multiprocessing.connection import Listener
+        if not self.address.startswith("\\\\"):
+            # Verwaisten Socket einer abgestürzten Instanz entfernen
+            if os.path.exists(self.address) and instance_request("ping", address=self.address) is None:
+                os.unlink(self.address)
+        try:
+            self.listener = Listener(self.address)
+        except OSError as e:
+            INSTANCE_LOG.error(f"Instanz-Server nicht verfügbar: {e}")
+            return self
+        if not self.address.startswith("\\\\"):
+            os.chmod(self.address, 0o600)
+        threading.Thread(target=self._serve, name="instance-server", daemon=True).start()
+        return self
+
+    def _serve(self):
+        while not self.closed.is_set():
+            try:
+                connection = self.listener.accept()
+            except OSError:
+                break
+            if self.closed.is_set():
+                connection.close()
+                break
+            # Ein langsamer handoff soll Statusabfragen nicht blockieren
+            threading.Thread(target=self._handle, args=(connection,), daemon=True).start()
+
+    def _handle(self, connection):
+        with connection:
+            try:
+                if not connection.poll(5):
+                    return
+                message = json.loads(connection.recv_bytes().decode("utf-8"))
+                reply = self.handle(message)
+                connection.send_bytes(json.dumps(reply, ensure_ascii=False).encode("utf-8"))
+            except Exception as e:
+                INSTANCE_LOG.error(f"Fehler bei Anfrage an die Instanz: {e}")
+                return
+        # Erst nach der Antwort beenden, sonst geht der übergebene Zustand verloren
+        if message.get("command") == "handoff" and self.shutdown is not None:
+            self.shutdown()
+
+    def handle(self, message):
+        command = message.get("command")
+        reply = {"ok": True, "pid": os.getpid(), "mode": self.mode}
+        engine = self.engine()
+        if command == "status":
+            reply.update(engine.status() if engine is not None else {"running": False})
+        elif command == "activate":
+            INSTANCE_LOG.info(f"Weitere Instanz gestartet mit {message.get('argv', [])}")
+            if self.activate is not None:
+                self.activate(message.get("argv", []))
+        elif command == "handoff":
+            INSTANCE_LOG.info("Übergabe an neue Instanz")
+            snapshot = engine.handoff() if engine is not None else None
+            # Adresse vor der Antwort freigeben, damit die neue Instanz sie sofort belegen kann
+            self.close()
+            if snapshot is not None:
+                reply["snapshot"] = base64.b64encode(snapshot).decode("ascii")
+        elif command != "ping":
+            reply = {"ok": False, "error": f"Unbekannter Befehl: {command}"}
+        return reply
+
+    def close(self):
+        if self.listener is None or self.closed.is_set():
+            return
+        self.closed.set()
+        # accept() blockiert; eine eigene Verbindung weckt den Server-Thread auf
+        try:
+            from multiprocessing.connection import Client
+            Client(self.address).close()
+        except OSError:
+            pass
+        self.listener.close()
+
+# Vor dem Start: läuft bereits eine Instanz im selben Modus, übernimmt sie die Argumente
+# (Rückgabe None = beenden). Sonst wird sie abgelöst und ihr Zustand als Basis übernommen.
+def claim_instance(mode, argv, takeover=False):
+    try:
+        running = instance_request("ping")
+        if running is None:
+            return {}
+        if running.get("mode") == mode and not takeover:
+            instance_request("activate", argv=list(argv))
+            INSTANCE_LOG.info(f"Instanz läuft bereits (PID {running.get('pid')}); Argumente übergeben")
+            return None
+        reply = instance_request("handoff", timeout=INSTANCE_HANDOFF_TIMEOUT) or {}
+        INSTANCE_LOG.info(f"Vorherige Instanz (PID {running.get('pid')}, {running.get('mode')}) abgelöst")
+        if reply.get("snapshot"):
+            state, digests = decode_snapshot(base64.b64decode(reply["snapshot"]), "Übergebener Zustand")
+            return {"baseline": (state, digests)}
+    except Exception as e:
+        INSTANCE_LOG.error(f"Fehler bei der Übergabe durch die laufende Instanz: {e}")
+    return {}
 
-def close_other_instance():
+def print_instance_status():
     try:
-        hwnd = ctypes.windll.user32.FindWindowW(None, "Autostart Monitor")
-        if hwnd:
-            WM_CLOSE = 0x0010
-            ctypes.windll.user32.PostMessageW(hwnd, WM_CLOSE, 0, 0)
-            time.sleep(1)
-            logging.info("Vorherige Instanz geschlossen")
+        reply = instance_request("status")
     except Exception as e:
-        logging.error(f"Fehler beim Schließen der anderen Instanz: {e}")
+        print(f"Fehler: {e}")
+        return 2
+    if reply is None:
+        print("Keine laufende Instanz")
+        return 1
+    print(json.dumps(reply, indent=2, ensure_ascii=False))
+    return 0
+
+def run_headless(settings, startup_report=False, baseline=None):
+    setup_logging(settings, console=True)
+    engine = MonitorEngine(settings, baseline=baseline)
+    engine.start()
+    log_startup_metrics("headless", CORE_IMPORT_SECONDS, startup_report)
+    stop = threading.Event()
+    server = InstanceServer("headless", lambda: engine, shutdown=stop.set).start()
+
+    def request_stop(signum, frame):
+        stop.set()
+
+    signal.signal(signal.SIGINT, request_stop)
+    if hasattr(signal, "SIGTERM"):
+        signal.signal(signal.SIGTERM, request_stop)
+    # Kurzes Warte-Intervall, da Signale unter Windows Event.wait nicht unterbrechen
+    while not stop.wait(1.0) and engine.running():
+        pass
+    server.close()
+    thread = engine.thread
+    engine.stop(wait=True)
+    if thread is not None:
+        thread.join(timeout=5)
+    LOG.info("Programm beendet")
+    return 0
 
 def main():
-    close_other_instance()
-    app = QApplication(sys.argv)
-    window = AutostartMonitorWindow()
-    window.show()
-    QTimer.singleShot(0, window.toggle_monitoring)
-    if window.chk_autostart.isChecked():
-        QTimer.singleShot(20000, window.hide)
-    app_result = app.exec()
-    logging.info("Programm beendet")
-    sys.exit(app_result)
+    parser = argparse.ArgumentParser(description="Autostart Monitor")
+    parser.add_argument("--headless", action="store_true", help="ohne GUI nur mit settings.json überwachen")
+    parser.add_argument("--settings", default=SETTINGS_FILE, help="Pfad zur Einstellungsdatei")
+    parser.add_argument("--startup-report", action="store_true", help="Importzeit und RSS nach dem Start ausgeben")
+    parser.add_argument("--status", action="store_true", help="Status der laufenden Instanz ausgeben")
+    parser.add_argument("--takeover", action="store_true", help="laufende Instanz ablösen und ihren Zustand übernehmen")
+    args = parser.parse_args()
+    if args.status:
+        sys.exit(print_instance_status())
+    claim = claim_instance("headless" if args.headless else "gui", sys.argv[1:], args.takeover)
+    if claim is None:
+        sys.exit(0)
+    if args.headless:
+        sys.exit(run_headless(load_settings(args.settings), args.startup_report, claim.get("baseline")))
+
+    started = time.perf_counter()
+    import autostart_monitor_gui
+    sys.exit(autostart_monitor_gui.run_gui(
+        import_seconds=CORE_IMPORT_SECONDS + time.perf_counter() - started,
+        startup_report=args.startup_report,
+        baseline=claim.get("baseline")
+    ))
+
+CORE_IMPORT_SECONDS = time.perf_counter() - _IMPORT_STARTED
 
 if __name__ == "__main__":
+    # Die GUI importiert dieses Modul; als Skript gestartet soll es nicht ein zweites Mal geladen werden
+    sys.modules.setdefault("autostart_monitor", sys.modules[__name__])
     main()
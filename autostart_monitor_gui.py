@@ -0,0 +1,738 @@
+import os
+import sys
+import json
+import time
+import logging
+import subprocess
+from PyQt6.QtCore import Qt, QTimer, QVariantAnimation, QEasingCurve, pyqtSignal, QAbstractTableModel, QModelIndex
+from PyQt6.QtGui import QFont, QColor
+from PyQt6.QtWidgets import (
+    QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QGroupBox,
+    QLabel, QCheckBox, QPushButton, QComboBox, QSlider, QFormLayout, QMessageBox, QDialog,
+    QPlainTextEdit, QTabWidget, QTableView, QHeaderView, QLineEdit, QListWidget, QListWidgetItem
+)
+
+from autostart_monitor import (
+    DEFAULT_SETTINGS, SETTINGS_FILE, ASEP_LOCATIONS, asep_location_label, MonitorEngine, EventBridge, ChangeHistory, load_settings, report_to_log, render_events,
+    summarize_events, format_value, decode_history_value, play_alert_sound, flash_window, show_windows_toast, log_startup_metrics,
+    InstanceServer, setup_logging
+)
+
+GUI_LOG = logging.getLogger("autostart.gui")
+
+def show_dialog(title: str, message: str, parent=None):
+    try:
+        msg = QMessageBox(parent)
+        msg.setWindowTitle(title)
+        msg.setText(message)
+        msg.setIcon(QMessageBox.Icon.Information)
+        msg.exec()
+    except Exception as e:
+        GUI_LOG.error(f"Fehler bei Dialog: {e}")
+
+DIALOG_TEXTS = {
+    "de": {
+        "title": "Autostart Änderung",
+        "count": "{count} Änderungen",
+        "registry": "Regedit öffnen",
+        "tasks": "Taskplanung öffnen",
+        "services": "Dienste öffnen",
+        "autoruns": "Autoruns.exe starten",
+        "cancel": "Abbrechen"
+    },
+    "en": {
+        "title": "Autostart change",
+        "count": "{count} changes",
+        "registry": "Open Regedit",
+        "tasks": "Open Task Scheduler",
+        "services": "Open Services",
+        "autoruns": "Start Autoruns.exe",
+        "cancel": "Cancel"
+    }
+}
+
+# Orte aus der ASEP-Tabelle ohne eigene Checkbox; sie erscheinen in einer Liste mit Registry-Pfad
+EXTRA_LOCATIONS = [name for name in ASEP_LOCATIONS if name not in (
+    "registry", "registry_hklm_run", "context_handlers_star", "context_handlers_allfilesystem",
+    "context_handlers_directory", "context_handlers_directory_bg", "folder_context_handlers", "directory_dragdrop_handlers"
+)]
+
+# Maximale Anzahl Änderungen, die pro Durchlauf der Qt-Ereignisschleife dargestellt werden
+GUI_EVENT_BATCH = 500
+
+class CustomDialog(QDialog):
+    def __init__(self, events=(), language="de", parent=None):
+        super().__init__(parent)
+        self.texts = DIALOG_TEXTS.get(language, DIALOG_TEXTS["de"])
+        self.language = language
+        self.setWindowTitle(self.texts["title"])
+        self.events = []
+
+        layout = QVBoxLayout()
+        self.setLayout(layout)
+
+        self.count_label = QLabel()
+        layout.addWidget(self.count_label)
+
+        self.text_view = QPlainTextEdit()
+        self.text_view.setReadOnly(True)
+        layout.addWidget(self.text_view)
+
+        button_box = QHBoxLayout()
+
+        # Buttons anhand der Event-Felder statt per Textsuche; erst sichtbar, wenn die Kategorie vorkommt
+        self.category_buttons = {}
+        for category, target in (("registry", "regedit.exe"), ("tasks", "taskschd.msc"), ("services", "services.msc")):
+            button = QPushButton(self.texts[category])
+            button.clicked.connect(lambda _checked=False, target=target: os.startfile(target))
+            button.setVisible(False)
+            button_box.addWidget(button)
+            self.category_buttons[category] = button
+
+        autoruns_button = QPushButton(self.texts["autoruns"])
+        autoruns_button.clicked.connect(self.start_autoruns)
+        button_box.addWidget(autoruns_button)
+
+        cancel_button = QPushButton(self.texts["cancel"])
+        cancel_button.clicked.connect(self.reject)
+        button_box.addWidget(cancel_button)
+
+        layout.addLayout(button_box)
+        self.add_events(events)
+
+    def add_events(self, events):
+        if not events:
+            return
+        self.events.extend(events)
+        # Ein appendPlainText pro Stapel statt pro Änderung
+        self.text_view.appendPlainText(render_events(events, self.language))
+        for event in events:
+            button = self.category_buttons.get(event.category)
+            if button is not None and not button.isVisible():
+                button.setVisible(True)
+        self.count_label.setText(self.texts["count"].format(count=len(self.events)))
+
+    def start_autoruns(self):
+        try:
+            if not os.path.exists("autoruns.exe"):
+                url = "https://live.sysinternals.com/autoruns.exe"
+                response = subprocess.check_output([
+                    "powershell.exe",
+                    "-Command",
+                    f"Invoke-WebRequest -Uri '{url}' -OutFile 'autoruns.exe'"
+                ])
+            subprocess.Popen(["autoruns.exe"])
+        except Exception as e:
+            GUI_LOG.error(f"Fehler beim Starten von Autoruns.exe: {e}")
+
+HISTORY_TEXTS = {
+    "de": {
+        "tab_monitor": "Überwachung",
+        "tab_history": "Verlauf",
+        "columns": ["Zeit", "Quelle", "Art", "Schlüssel", "Alt", "Neu"],
+        "all_sources": "Alle Quellen",
+        "key_filter": "Schlüssel (exakt)",
+        "refresh": "Aktualisieren",
+        "unavailable": "Änderungshistorie ist deaktiviert"
+    },
+    "en": {
+        "tab_monitor": "Monitoring",
+        "tab_history": "History",
+        "columns": ["Time", "Source", "Kind", "Key", "Old", "New"],
+        "all_sources": "All sources",
+        "key_filter": "Key (exact)",
+        "refresh": "Refresh",
+        "unavailable": "Change history is disabled"
+    }
+}
+
+# Lädt den Verlauf seitenweise nach (canFetchMore/fetchMore), sodass auch bei Millionen
+# Zeilen nur die tatsächlich angezeigten Seiten im Speicher liegen
+class HistoryTableModel(QAbstractTableModel):
+    PAGE_SIZE = 500
+
+    def __init__(self, history, language="de", parent=None):
+        super().__init__(parent)
+        self.history = history
+        self.language = language
+        self.rows = []
+        self.exhausted = history is None
+        self.filters = {}
+
+    def set_language(self, language):
+        self.language = language
+        self.headerDataChanged.emit(Qt.Orientation.Horizontal, 0, self.columnCount() - 1)
+
+    def set_filters(self, source=None, key=None):
+        self.beginResetModel()
+        self.filters = {"source": source or None, "key": key or None}
+        self.rows = []
+        self.exhausted = self.history is None
+        self.endResetModel()
+
+    def reload(self):
+        self.set_filters(**self.filters)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else 6
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self.exhausted
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self.exhausted:
+            return
+        before_id = self.rows[-1][0] if self.rows else None
+        try:
+            page = self.history.page(before_id=before_id, limit=self.PAGE_SIZE, **self.filters)
+        except Exception as e:
+            GUI_LOG.error(f"Fehler beim Lesen der Änderungshistorie: {e}")
+            page = []
+        if len(page) < self.PAGE_SIZE:
+            self.exhausted = True
+        if not page:
+            return
+        self.beginInsertRows(QModelIndex(), len(self.rows), len(self.rows) + len(page) - 1)
+        self.rows.extend(page)
+        self.endInsertRows()
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role not in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ToolTipRole):
+            return None
+        _, ts, source, kind, key, old, new = self.rows[index.row()]
+        column = index.column()
+        if column == 0:
+            return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(ts))
+        if column == 1:
+            return source
+        if column == 2:
+            return kind
+        if column == 3:
+            return key
+        # Werte erst beim Anzeigen dekodieren; nur sichtbare Zellen werden abgefragt
+        value = old if column == 4 else new
+        if value is None:
+            return ""
+        limit = 1000 if role == Qt.ItemDataRole.ToolTipRole else 80
+        return format_value(decode_history_value(value), limit)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole or orientation != Qt.Orientation.Horizontal:
+            return None
+        return HISTORY_TEXTS.get(self.language, HISTORY_TEXTS["de"])["columns"][section]
+
+class HistoryView(QWidget):
+    def __init__(self, history, language="de", parent=None):
+        super().__init__(parent)
+        self.history = history
+        layout = QVBoxLayout(self)
+
+        filters = QHBoxLayout()
+        self.cmb_source = QComboBox()
+        self.txt_key = QLineEdit()
+        self.btn_refresh = QPushButton()
+        filters.addWidget(self.cmb_source)
+        filters.addWidget(self.txt_key, 1)
+        filters.addWidget(self.btn_refresh)
+        layout.addLayout(filters)
+
+        self.model = HistoryTableModel(history, language, self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        self.table.setWordWrap(False)
+        # Feste Zeilenhöhe: Qt muss nicht jede geladene Zeile vermessen
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        layout.addWidget(self.table)
+
+        self.cmb_source.activated.connect(self.apply_filters)
+        self.txt_key.returnPressed.connect(self.apply_filters)
+        self.btn_refresh.clicked.connect(self.refresh)
+        self.set_language(language)
+
+    def set_language(self, language):
+        texts = HISTORY_TEXTS.get(language, HISTORY_TEXTS["de"])
+        self.txt_key.setPlaceholderText(texts["key_filter"])
+        self.btn_refresh.setText(texts["refresh"])
+        if self.cmb_source.count():
+            self.cmb_source.setItemText(0, texts["all_sources"])
+        else:
+            self.cmb_source.addItem(texts["all_sources"], None)
+        self.table.setEnabled(self.history is not None)
+        self.table.setToolTip("" if self.history is not None else texts["unavailable"])
+        self.model.set_language(language)
+
+    def refresh(self):
+        if self.history is not None:
+            current = self.cmb_source.currentData()
+            try:
+                sources = self.history.sources()
+            except Exception as e:
+                GUI_LOG.error(f"Fehler beim Lesen der Änderungshistorie: {e}")
+                sources = []
+            while self.cmb_source.count() > 1:
+                self.cmb_source.removeItem(1)
+            for source in sources:
+                self.cmb_source.addItem(source, source)
+            index = self.cmb_source.findData(current)
+            self.cmb_source.setCurrentIndex(max(index, 0))
+        self.apply_filters()
+
+    def apply_filters(self):
+        self.model.set_filters(source=self.cmb_source.currentData(), key=self.txt_key.text().strip())
+
+class AutostartMonitorWindow(QMainWindow):
+    events_available = pyqtSignal()
+    # Anfragen einer weiteren Instanz kommen auf dem Thread des InstanceServer an
+    activation_requested = pyqtSignal(list)
+    quit_requested = pyqtSignal()
+
+    def __init__(self, baseline=None):
+        super().__init__()
+        self.settings = DEFAULT_SETTINGS.copy()
+        self.load_settings()
+        self.setWindowTitle("Autostart Monitor")
+        self.resize(600, 500)
+
+        self.history = None
+        if self.settings.get("history_enabled", DEFAULT_SETTINGS["history_enabled"]):
+            try:
+                self.history = ChangeHistory()
+            except Exception as e:
+                GUI_LOG.error(f"Änderungshistorie nicht verfügbar: {e}")
+
+        self.tabs = QTabWidget()
+        self.setCentralWidget(self.tabs)
+        self.central = QWidget()
+        self.tabs.addTab(self.central, HISTORY_TEXTS["de"]["tab_monitor"])
+        self.history_view = HistoryView(self.history, self.settings.get("language", "de"))
+        self.tabs.addTab(self.history_view, HISTORY_TEXTS["de"]["tab_history"])
+        self.tabs.currentChanged.connect(self.on_tab_changed)
+        self.main_layout = QVBoxLayout(self.central)
+        self.main_layout.setContentsMargins(20, 20, 20, 20)
+        self.main_layout.setSpacing(15)
+
+        header = QLabel("Autostart Monitor")
+        header.setFont(QFont("Segoe UI", 18, QFont.Weight.Bold))
+        header.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.main_layout.addWidget(header)
+
+        self.grp_methods = QGroupBox("Zu überwachende Methoden:")
+        self.grp_methods.setFont(QFont("Segoe UI", 10, QFont.Weight.Bold))
+        self.methods_layout = QVBoxLayout()
+        self.grp_methods.setLayout(self.methods_layout)
+        self.chk_startup = QCheckBox("Startup-Ordner")
+        self.chk_registry = QCheckBox("Registry-Einträge (HKCU)")
+        self.chk_reg_hklm_run = QCheckBox("Registry (HKLM Run)")
+        self.chk_ctx_star = QCheckBox("Kontextmenü Handler (* ShellEx)")
+        self.chk_ctx_allfilesystem = QCheckBox("Kontextmenü Handler (AllFilesystemObjects)")
+        self.chk_ctx_directory = QCheckBox("Kontextmenü Handler (Directory)")
+        self.chk_ctx_directory_bg = QCheckBox("Kontextmenü Handler (Directory Hintergrund)")
+        self.chk_folder_ctx = QCheckBox("Kontextmenü Handler (Folder)")
+        self.chk_directory_dragdrop = QCheckBox("Kontextmenü Handler (Directory)")
+        self.chk_services = QCheckBox("Dienste")
+        self.chk_service_status = QCheckBox("Dienststatus (läuft/gestoppt)")
+        self.chk_tasks = QCheckBox("Geplante Tasks")
+        self.methods_layout.addWidget(self.chk_startup)
+        self.methods_layout.addWidget(self.chk_registry)
+        self.methods_layout.addWidget(self.chk_reg_hklm_run)
+        self.methods_layout.addWidget(self.chk_ctx_star)
+        self.methods_layout.addWidget(self.chk_ctx_allfilesystem)
+        self.methods_layout.addWidget(self.chk_ctx_directory)
+        self.methods_layout.addWidget(self.chk_ctx_directory_bg)
+        self.methods_layout.addWidget(self.chk_folder_ctx)
+        self.methods_layout.addWidget(self.chk_directory_dragdrop)
+        self.methods_layout.addWidget(self.chk_services)
+        self.methods_layout.addWidget(self.chk_service_status)
+        self.methods_layout.addWidget(self.chk_tasks)
+        self.chk_multi_user = QCheckBox("Alle Benutzerprofile (Mehrbenutzer-Modus)")
+        self.methods_layout.addWidget(self.chk_multi_user)
+        self.lbl_locations = QLabel("Weitere Autostart-Orte:")
+        self.lst_locations = QListWidget()
+        self.lst_locations.setMaximumHeight(120)
+        for name in EXTRA_LOCATIONS:
+            item = QListWidgetItem(asep_location_label(name))
+            item.setData(Qt.ItemDataRole.UserRole, name)
+            item.setFlags(item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
+            item.setCheckState(Qt.CheckState.Checked)
+            self.lst_locations.addItem(item)
+        self.methods_layout.addWidget(self.lbl_locations)
+        self.methods_layout.addWidget(self.lst_locations)
+        self.main_layout.addWidget(self.grp_methods)
+
+        self.grp_notifications = QGroupBox("Benachrichtigungswege:")
+        self.grp_notifications.setFont(QFont("Segoe UI", 10, QFont.Weight.Bold))
+        self.noti_layout = QVBoxLayout()
+        self.grp_notifications.setLayout(self.noti_layout)
+        self.chk_toast = QCheckBox("Windows-Benachrichtigung")
+        self.chk_dialog = QCheckBox("Dialog")
+        self.noti_layout.addWidget(self.chk_toast)
+        self.noti_layout.addWidget(self.chk_dialog)
+        self.main_layout.addWidget(self.grp_notifications)
+
+        self.grp_settings = QGroupBox("Einstellungen:")
+        self.grp_settings.setFont(QFont("Segoe UI", 10, QFont.Weight.Bold))
+        self.settings_layout = QFormLayout()
+        self.grp_settings.setLayout(self.settings_layout)
+
+        self.cmb_language = QComboBox()
+        self.cmb_language.addItems(["de", "en"])
+        self.settings_layout.addRow("Sprache:", self.cmb_language)
+
+        self.chk_dark_mode = QCheckBox("Dark Mode")
+        self.settings_layout.addRow("Dark Mode:", self.chk_dark_mode)
+
+        self.sld_interval = QSlider(Qt.Orientation.Horizontal)
+        self.sld_interval.setRange(10, 300)
+        self.sld_interval.setTickInterval(10)
+        self.lbl_interval = QLabel("60 Sek.")
+        interval_layout = QHBoxLayout()
+        interval_layout.addWidget(self.sld_interval)
+        interval_layout.addWidget(self.lbl_interval)
+        self.settings_layout.addRow("Scanintervall:", interval_layout)
+        self.main_layout.addWidget(self.grp_settings)
+
+        self.chk_autostart = QCheckBox("Automatisch beim Programmstart nach 20 Sekunden verstecken")
+        self.main_layout.addWidget(self.chk_autostart)
+
+        self.btn_toggle = QPushButton("Überwachung starten")
+        self.btn_toggle.setFont(QFont("Segoe UI", 11))
+        self.main_layout.addWidget(self.btn_toggle)
+
+        self.monitoring_active = False
+        self.engine = None
+        self.baseline = baseline
+        self.change_dialog = None
+        # Änderungen aus dem Dispatcher-Thread; das Signal wird über die Qt-Ereignisschleife zugestellt
+        self.event_bridge = EventBridge(notify=self.events_available.emit)
+        self.events_available.connect(self.drain_events)
+        self.activation_requested.connect(self.activate_window)
+        self.quit_requested.connect(QApplication.quit)
+
+        self.timer = QTimer()
+        self.timer.timeout.connect(self.update_interval_label)
+        self.sld_interval.valueChanged.connect(self.update_interval_label)
+
+        self.theme_animation = QVariantAnimation(
+            self,
+            startValue=QColor("#E0E0E0"),
+            endValue=QColor("#2E2E2E"),
+            duration=300,
+            valueChanged=self.on_theme_animate,
+            easingCurve=QEasingCurve.Type.InOutQuad
+        )
+
+        self.setup_signals()
+        self.apply_settings()
+        self.apply_style()
+
+    def setup_signals(self):
+        self.btn_toggle.clicked.connect(self.toggle_monitoring)
+        self.cmb_language.currentTextChanged.connect(self.update_language)
+        self.chk_dark_mode.stateChanged.connect(self.toggle_theme)
+        self.chk_autostart.stateChanged.connect(self.toggle_autostart)
+        self.chk_startup.stateChanged.connect(self.save_settings)
+        self.chk_registry.stateChanged.connect(self.save_settings)
+        self.chk_reg_hklm_run.stateChanged.connect(self.save_settings)
+        self.chk_ctx_star.stateChanged.connect(self.save_settings)
+        self.chk_ctx_allfilesystem.stateChanged.connect(self.save_settings)
+        self.chk_ctx_directory.stateChanged.connect(self.save_settings)
+        self.chk_ctx_directory_bg.stateChanged.connect(self.save_settings)
+        self.chk_folder_ctx.stateChanged.connect(self.save_settings)
+        self.chk_directory_dragdrop.stateChanged.connect(self.save_settings)
+        self.chk_services.stateChanged.connect(self.save_settings)
+        self.chk_service_status.stateChanged.connect(self.save_settings)
+        self.chk_tasks.stateChanged.connect(self.save_settings)
+        self.lst_locations.itemChanged.connect(self.save_settings)
+        self.chk_multi_user.stateChanged.connect(self.save_settings)
+        self.chk_toast.stateChanged.connect(self.save_settings)
+        self.chk_dialog.stateChanged.connect(self.save_settings)
+        self.cmb_language.currentTextChanged.connect(self.save_settings)
+        self.sld_interval.valueChanged.connect(self.save_settings)
+        self.sld_interval.valueChanged.connect(self.update_scan_intervals)
+        self.chk_dark_mode.stateChanged.connect(self.save_settings)
+        self.chk_autostart.stateChanged.connect(self.save_settings)
+
+    def apply_settings(self):
+        s = self.settings
+        self.chk_startup.setChecked(s["selected_methods"].get("startup_folders", True))
+        self.chk_registry.setChecked(s["selected_methods"].get("registry", True))
+        self.chk_reg_hklm_run.setChecked(s["selected_methods"].get("registry_hklm_run", True))
+        self.chk_ctx_star.setChecked(s["selected_methods"].get("context_handlers_star", True))
+        self.chk_ctx_allfilesystem.setChecked(s["selected_methods"].get("context_handlers_allfilesystem", True))
+        self.chk_ctx_directory.setChecked(s["selected_methods"].get("context_handlers_directory", True))
+        self.chk_ctx_directory_bg.setChecked(s["selected_methods"].get("context_handlers_directory_bg", True))
+        self.chk_folder_ctx.setChecked(s["selected_methods"].get("folder_context_handlers", True))
+        self.chk_directory_dragdrop.setChecked(s["selected_methods"].get("directory_dragdrop_handlers", True))
+        self.chk_services.setChecked(s["selected_methods"].get("services", True))
+        self.chk_service_status.setChecked(s["selected_methods"].get("service_status", False))
+        self.chk_tasks.setChecked(s["selected_methods"].get("tasks", True))
+        self.chk_multi_user.setChecked(s.get("multi_user", False))
+        for row in range(self.lst_locations.count()):
+            item = self.lst_locations.item(row)
+            checked = s["selected_methods"].get(item.data(Qt.ItemDataRole.UserRole), True)
+            item.setCheckState(Qt.CheckState.Checked if checked else Qt.CheckState.Unchecked)
+        self.chk_toast.setChecked(s["notification_methods"].get("windows_toast", True))
+        self.chk_dialog.setChecked(s["notification_methods"].get("dialog", True))
+        self.chk_autostart.setChecked(s.get("auto_start", False))
+        self.cmb_language.setCurrentText(s.get("language", "de"))
+        self.chk_dark_mode.setChecked(s.get("dark_mode", False))
+        self.sld_interval.setValue(s.get("scan_interval", 60))
+        self.lbl_interval.setText(f"{self.sld_interval.value()} Sek.")
+        self.update_language()
+
+    def apply_style(self):
+        base_color = "#2E2E2E" if self.chk_dark_mode.isChecked() else "#E0E0E0"
+        text_color = "#FFFFFF" if self.chk_dark_mode.isChecked() else "#000000"
+        accent_color = "#5DADE2"
+        self.setStyleSheet(f"""
+            QWidget {{
+                background-color: {base_color};
+                color: {text_color};
+                font-family: "Segoe UI";
+            }}
+            QGroupBox {{
+                border: 2px solid {accent_color};
+                border-radius: 10px;
+                margin-top: 10px;
+            }}
+            QGroupBox::title {{
+                subcontrol-origin: margin;
+                left: 10px;
+                padding: 0 5px;
+            }}
+            QCheckBox::indicator {{
+                width: 18px;
+                height: 18px;
+            }}
+            QSlider::groove:horizontal {{
+                border: 1px solid #999;
+                height: 8px;
+                border-radius: 4px;
+                background: {accent_color};
+            }}
+            QSlider::handle:horizontal {{
+                background: {text_color};
+                border: 1px solid {accent_color};
+                width: 18px;
+                margin: -5px 0;
+                border-radius: 9px;
+            }}
+            QPushButton {{
+                background-color: {accent_color};
+                border: none;
+                border-radius: 10px;
+                padding: 10px;
+            }}
+            QPushButton:hover {{
+                background-color: #3498DB;
+            }}
+        """)
+
+    def on_theme_animate(self, value):
+        self.central.setStyleSheet(f"background-color: {value.name()};")
+        
+    def toggle_theme(self):
+        # Angepasst: Setzt explizit Start- und Endfarbe, je nachdem ob Dark Mode aktiviert ist
+        if self.chk_dark_mode.isChecked():
+            self.theme_animation.setStartValue(QColor("#E0E0E0"))
+            self.theme_animation.setEndValue(QColor("#2E2E2E"))
+        else:
+            self.theme_animation.setStartValue(QColor("#2E2E2E"))
+            self.theme_animation.setEndValue(QColor("#E0E0E0"))
+        self.theme_animation.start()
+        self.apply_style()
+
+    def on_tab_changed(self, index):
+        if self.tabs.widget(index) is self.history_view:
+            self.history_view.refresh()
+
+    def update_language(self):
+        lang = self.cmb_language.currentText()
+        history_texts = HISTORY_TEXTS.get(lang, HISTORY_TEXTS["de"])
+        self.tabs.setTabText(0, history_texts["tab_monitor"])
+        self.tabs.setTabText(1, history_texts["tab_history"])
+        self.history_view.set_language(lang)
+        if lang == "de":
+            self.grp_methods.setTitle("Zu überwachende Methoden:")
+            self.chk_startup.setText("Startup-Ordner")
+            self.chk_registry.setText("Registry-Einträge (HKCU)")
+            self.chk_reg_hklm_run.setText("Registry (HKLM Run)")
+            self.chk_ctx_star.setText("Kontextmenü Handler (* ShellEx)")
+            self.chk_ctx_allfilesystem.setText("Kontextmenü Handler (AllFilesystemObjects)")
+            self.chk_ctx_directory.setText("Kontextmenü Handler (Directory)")
+            self.chk_ctx_directory_bg.setText("Kontextmenü Handler (Directory Hintergrund)")
+            self.chk_folder_ctx.setText("Kontextmenü Handler (Folder)")
+            self.chk_directory_dragdrop.setText("Kontextmenü Handler (Directory)")
+            self.chk_services.setText("Dienste")
+            self.chk_service_status.setText("Dienststatus (läuft/gestoppt)")
+            self.chk_tasks.setText("Geplante Tasks")
+            self.lbl_locations.setText("Weitere Autostart-Orte:")
+            self.chk_multi_user.setText("Alle Benutzerprofile (Mehrbenutzer-Modus)")
+            self.grp_notifications.setTitle("Benachrichtigungswege:")
+            self.chk_toast.setText("Windows-Benachrichtigung")
+            self.chk_dialog.setText("Dialog")
+            self.chk_autostart.setText("Automatisch beim Programmstart nach 20 Sekunden verstecken")
+            self.btn_toggle.setText("Überwachung starten" if not self.monitoring_active else "Überwachung stoppen")
+        else:
+            self.grp_methods.setTitle("Methods to Monitor:")
+            self.chk_startup.setText("Startup folders")
+            self.chk_registry.setText("Registry entries (HKCU)")
+            self.chk_reg_hklm_run.setText("Registry (HKLM Run)")
+            self.chk_ctx_star.setText("Context menu handlers (* ShellEx)")
+            self.chk_ctx_allfilesystem.setText("Context menu handlers (AllFilesystemObjects)")
+            self.chk_ctx_directory.setText("Context menu handlers (Directory)")
+            self.chk_ctx_directory_bg.setText("Context menu handlers (Directory Background)")
+            self.chk_folder_ctx.setText("Context menu handlers (Folder)")
+            self.chk_directory_dragdrop.setText("Context menu handlers (Directory)")
+            self.chk_services.setText("Services")
+            self.chk_service_status.setText("Service status (running/stopped)")
+            self.chk_tasks.setText("Scheduled tasks")
+            self.lbl_locations.setText("Additional autostart locations:")
+            self.chk_multi_user.setText("All user profiles (multi-user mode)")
+            self.grp_notifications.setTitle("Notification methods:")
+            self.chk_toast.setText("Windows notification")
+            self.chk_dialog.setText("Dialog")
+            self.chk_autostart.setText("Automatically hide GUI 20 seconds after program start")
+            self.btn_toggle.setText("Start monitoring" if not self.monitoring_active else "Stop monitoring")
+
+    def update_interval_label(self, value=None):
+        if value is None:
+            value = self.sld_interval.value()
+        self.lbl_interval.setText(f"{value} Sek.")
+
+    def toggle_autostart(self):
+        GUI_LOG.info("Auto-Hide beim Programmstart: " + ("aktiviert" if self.chk_autostart.isChecked() else "deaktiviert"))
+
+    def update_scan_intervals(self):
+        if self.engine is not None:
+            self.engine.update_intervals()
+
+    def toggle_monitoring(self):
+        if not self.monitoring_active:
+            self.monitoring_active = True
+            self.engine = MonitorEngine(
+                self.settings, sinks=[report_to_log, self.alert_sink, self.toast_sink], history=self.history,
+                baseline=self.baseline, direct_sinks=[self.dialog_sink]
+            )
+            self.baseline = None
+            self.engine.start()
+            self.btn_toggle.setText("Überwachung stoppen" if self.cmb_language.currentText() == "de" else "Stop monitoring")
+        else:
+            self.monitoring_active = False
+            if self.engine is not None:
+                self.engine.stop()
+                self.engine = None
+            self.btn_toggle.setText("Überwachung starten" if self.cmb_language.currentText() == "de" else "Start monitoring")
+
+    def activate_window(self, argv):
+        self.showNormal()
+        self.raise_()
+        self.activateWindow()
+
+    # Senken laufen auf dem Thread des NotificationDispatcher bzw. (dialog_sink) des Monitorings:
+    # Einstellungen statt Widgets lesen
+    def alert_sink(self, events):
+        play_alert_sound()
+        flash_window()
+
+    def toast_sink(self, events):
+        notification_methods = self.settings.get("notification_methods", DEFAULT_SETTINGS["notification_methods"])
+        if notification_methods.get("windows_toast", True):
+            language = self.settings.get("language", DEFAULT_SETTINGS["language"])
+            show_windows_toast(DIALOG_TEXTS.get(language, DIALOG_TEXTS["de"])["title"], summarize_events(events, language))
+
+    # Direkt am Dispatcher vorbei, damit bei einer Flut keine Änderung im Dialog fehlt
+    def dialog_sink(self, events):
+        notification_methods = self.settings.get("notification_methods", DEFAULT_SETTINGS["notification_methods"])
+        if notification_methods.get("dialog", True):
+            self.event_bridge.push(events)
+
+    def drain_events(self):
+        batch, more = self.event_bridge.drain(GUI_EVENT_BATCH)
+        if more:
+            # Rest im nächsten Durchlauf, damit die Oberfläche bedienbar bleibt
+            QTimer.singleShot(0, self.drain_events)
+        try:
+            if batch:
+                # Weitere Änderungen landen im offenen Dialog statt in einem neuen modalen Fenster
+                if self.change_dialog is None:
+                    self.change_dialog = CustomDialog(language=self.settings.get("language", DEFAULT_SETTINGS["language"]), parent=self)
+                    self.change_dialog.finished.connect(self.on_change_dialog_closed)
+                    self.change_dialog.show()
+                self.change_dialog.add_events(batch)
+        except Exception as e:
+            GUI_LOG.error(f"Fehler beim Anzeigen des Dialogs: {e}")
+
+    def on_change_dialog_closed(self):
+        self.change_dialog = None
+
+    def load_settings(self):
+        self.settings = load_settings()
+        setup_logging(self.settings)
+
+    def save_settings(self):
+        previous_settings = self.settings
+        current_settings = dict(self.settings)
+        current_settings.update({
+            "selected_methods": {
+                "startup_folders": self.chk_startup.isChecked(),
+                "registry": self.chk_registry.isChecked(),
+                "registry_hklm_run": self.chk_reg_hklm_run.isChecked(),
+                "context_handlers_star": self.chk_ctx_star.isChecked(),
+                "context_handlers_allfilesystem": self.chk_ctx_allfilesystem.isChecked(),
+                "context_handlers_directory": self.chk_ctx_directory.isChecked(),
+                "context_handlers_directory_bg": self.chk_ctx_directory_bg.isChecked(),
+                "folder_context_handlers": self.chk_folder_ctx.isChecked(),
+                "directory_dragdrop_handlers": self.chk_directory_dragdrop.isChecked(),
+                "services": self.chk_services.isChecked(),
+                "service_status": self.chk_service_status.isChecked(),
+                "tasks": self.chk_tasks.isChecked(),
+                **{
+                    item.data(Qt.ItemDataRole.UserRole): item.checkState() == Qt.CheckState.Checked
+                    for item in map(self.lst_locations.item, range(self.lst_locations.count()))
+                }
+            },
+            "notification_methods": {
+                "windows_toast": self.chk_toast.isChecked(),
+                "dialog": self.chk_dialog.isChecked()
+            },
+            "multi_user": self.chk_multi_user.isChecked(),
+            "auto_start": self.chk_autostart.isChecked(),
+            "language": self.cmb_language.currentText(),
+            "dark_mode": self.chk_dark_mode.isChecked(),
+            "scan_interval": self.sld_interval.value()
+        })
+        self.settings = current_settings
+        if self.engine is not None:
+            self.engine.settings = self.settings
+        try:
+            with open(SETTINGS_FILE, "w", encoding="utf8") as f:
+                json.dump(self.settings, f, indent=4, ensure_ascii=False)
+            changed = sorted(key for key, value in self.settings.items() if previous_settings.get(key) != value)
+            GUI_LOG.info(f"Einstellungen gespeichert ({', '.join(changed) or 'unverändert'})")
+        except Exception as e:
+            GUI_LOG.error(f"Konnte Einstellungen nicht speichern: {e}")
+
+def run_gui(import_seconds=0.0, startup_report=False, baseline=None):
+    app = QApplication(sys.argv)
+    window = AutostartMonitorWindow(baseline)
+    window.show()
+    server = InstanceServer(
+        "gui", lambda: window.engine, activate=window.activation_requested.emit, shutdown=window.quit_requested.emit
+    ).start()
+    log_startup_metrics("GUI", import_seconds, startup_report)
+    QTimer.singleShot(0, window.toggle_monitoring)
+    if window.chk_autostart.isChecked():
+        QTimer.singleShot(20000, window.hide)
+    app_result = app.exec()
+    server.close()
+    if window.engine is not None:
+        window.engine.stop()
+    GUI_LOG.info("Programm beendet")
+    return app_result
@@ -0,0 +1,101 @@
+# Vergleicht das bisherige Lesen je Ort (OpenKey ab Hive-Wurzel, alle Werte) mit dem gemeinsamen
+# RegistryLocationReader über die ASEP-Tabelle plus 100 zusätzliche Orte in einer Fake-Registry.
+#   python benchmarks/bench_asep_locations.py --extra 100 --rounds 20
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from autostart_monitor import ASEP_LOCATIONS, REGISTRY_HIVES, AsepLocation, RegistryLocationReader
+from fake_winreg import FakeRegistry, REG_SZ
+
+def populate(registry, locations):
+    for name, location in locations.items():
+        hive = getattr(registry, REGISTRY_HIVES[location.hive])
+        if location.mode == "values":
+            for value_name in location.values or [f"{name}{i}" for i in range(5)]:
+                registry.set_value(hive, location.path, value_name, f"C:\\Program Files\\{name}\\{value_name}.exe", REG_SZ)
+        else:
+            for i in range(20):
+                registry.set_value(hive, f"{location.path}\\{name}{i}", (location.values or ("",))[0], f"{{{i:08d}-{name}}}", REG_SZ)
+    return registry
+
+# Bisheriges Muster: jeder Ort öffnet seinen Pfad ab der Hive-Wurzel und liest alles neu
+def read_naive(registry, location):
+    entries = {}
+    hive = getattr(registry, REGISTRY_HIVES[location.hive])
+    with registry.OpenKey(hive, location.path) as key:
+        if location.mode == "values":
+            i = 0
+            while True:
+                try:
+                    name, value, _ = registry.EnumValue(key, i)
+                except OSError:
+                    break
+                if location.values is None or name in location.values:
+                    entries[name] = value
+                i += 1
+            return entries
+        i = 0
+        while True:
+            try:
+                name = registry.EnumKey(key, i)
+            except OSError:
+                break
+            with registry.OpenKey(key, name) as sub_key:
+                for value_name in location.values or ("",):
+                    try:
+                        entries[name], _ = registry.QueryValueEx(sub_key, value_name)
+                        break
+                    except FileNotFoundError:
+                        pass
+            i += 1
+    return entries
+
+def measure(registry, rounds, scan):
+    times = []
+    registry.calls.clear()
+    for _ in range(rounds):
+        started = time.perf_counter()
+        result = scan()
+        times.append(time.perf_counter() - started)
+    calls = {name: count // rounds for name, count in registry.calls.items()}
+    return statistics.median(times), calls, result
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--extra", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    locations = dict(ASEP_LOCATIONS)
+    for i in range(args.extra):
+        locations[f"extra{i}"] = AsepLocation("HKLM", f"SOFTWARE\\Vendor{i % 10}\\Product{i}\\Run", "values")
+    registry = populate(FakeRegistry(), locations)
+    reader = RegistryLocationReader()
+
+    def read_all():
+        return {name: reader.read(location, registry) for name, location in locations.items()}
+
+    naive_time, naive_calls, naive = measure(registry, args.rounds, lambda: {name: read_naive(registry, location) for name, location in locations.items()})
+    cold_time, cold_calls, cold = measure(registry, 1, read_all)
+    warm_time, warm_calls, warm = measure(registry, args.rounds, read_all)
+
+    print(f"{len(locations)} Orte, {len(reader.handles)} offene Schlüssel")
+    print(f"  je Ort ab Wurzel:    {naive_time * 1000:6.2f} ms  {naive_calls}")
+    print(f"  Reader, erster Scan: {cold_time * 1000:6.2f} ms  {cold_calls}")
+    print(f"  Reader, unverändert: {warm_time * 1000:6.2f} ms  {warm_calls}")
+
+    # Ein offenes Handle auf einen gelöschten Schlüssel muss verworfen werden
+    registry.delete_key(registry.HKEY_LOCAL_MACHINE, locations["extra0"].path)
+    after_delete = reader.read(locations["extra0"], registry)
+    if naive != cold or cold != warm or after_delete != {}:
+        print("FEHLER: Ergebnisse weichen ab")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+# Vergleicht einen neuen Prozess je Abfrage mit dem langlebigen CommandHost und prüft
+# Timeout, Neustart nach Absturz und Fehlerantworten gegen den Stand-in-Worker.
+#   python benchmarks/bench_command_host.py --requests 50 --services 300
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from autostart_monitor import CommandHost, CommandHostError, check_system_services
+
+STUB = os.path.join(os.path.dirname(os.path.abspath(__file__)), "command_worker_stub.py")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--services", type=int, default=300)
+    args = parser.parse_args()
+    argv = [sys.executable, STUB, "--services", str(args.services)]
+
+    # Bisheriges Verhalten: ein Prozess je Abfrage
+    request = json.dumps({"id": 1, "command": "services"}) + "\n"
+    started = time.perf_counter()
+    for _ in range(args.requests):
+        output = subprocess.run(argv, input=request.encode("utf-8"), stdout=subprocess.PIPE, check=True).stdout
+        assert len(json.loads(output)["result"]) == args.services
+    spawn = (time.perf_counter() - started) / args.requests
+
+    host = CommandHost(argv, name="stub", timeout=5)
+    check_system_services(host)
+    started = time.perf_counter()
+    for _ in range(args.requests):
+        assert len(check_system_services(host)) == args.services
+    persistent = (time.perf_counter() - started) / args.requests
+    print(f"Neuer Prozess je Abfrage: {spawn * 1000:.1f} ms, CommandHost: {persistent * 1000:.2f} ms")
+
+    failures = []
+    pid = host.request("pid")
+    try:
+        host.request("sleep", timeout=0.5, seconds=5)
+        failures.append("kein Timeout")
+    except TimeoutError:
+        pass
+    if host.request("ping") != "pong" or host.request("pid") == pid:
+        failures.append("kein Neustart nach Timeout")
+
+    pid = host.request("pid")
+    try:
+        host.request("crash")
+        failures.append("Absturz nicht gemeldet")
+    except CommandHostError:
+        pass
+    if host.request("pid") == pid:
+        failures.append("kein Neustart nach Absturz")
+
+    try:
+        host.request("unknown")
+        failures.append("Fehlerantwort nicht gemeldet")
+    except CommandHostError:
+        pass
+    host.close()
+
+    for failure in failures:
+        print(f"FEHLER: {failure}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+# Vergleicht den Speicherbedarf des Überwachungszustands als Dicts/Sets (bisher) und als kompakte,
+# sortierte Tupel (compact_snapshot) bei 50.000 Einträgen. Jede Variante läuft in einem eigenen Prozess
+# mehrere Zyklen wie MonitorEngine: frische Collector-Daten, Vergleich mit dem Vorstand, Vorstand ersetzen.
+# Gemessen wird der RSS-Zuwachs im eingeschwungenen Zustand und die Vergleichszeit je Zyklus.
+#   python benchmarks/bench_compact_snapshot.py --entries 50000 --cycles 5
+import argparse
+import gc
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from autostart_monitor import COMPARATORS, compact_source, current_rss
+
+USERS = 40
+
+# Aufteilung der Einträge auf die Quellen; Mehrbenutzer-Quellen haben je Benutzer dieselben Namen
+def source_sizes(entries):
+    return {
+        "services": entries * 3 // 10,
+        "context_handlers_star": entries // 5,
+        "tasks": entries // 10,
+        "user_registry": entries // 5 // USERS,
+        "user_startup_folders": entries // 5 // USERS
+    }
+
+# Liefert wie ein Collector in jedem Zyklus neue Objekte; changed enthält die Indizes mit neuem Wert
+def collect(sizes, changed):
+    version = lambda i: 1 if i in changed else 0
+    state = {
+        "services": {f"Service{i:06d}": (2, 3, 4)[(i + version(i)) % 3] for i in range(sizes["services"])},
+        "context_handlers_star": {
+            f"Handler{i:06d}": f"{{{i:08X}-{version(i):04X}-4C2B-9F1A-{i * 7919 % 16 ** 12:012X}}}"
+            for i in range(sizes["context_handlers_star"])
+        },
+        "tasks": {
+            f"\\Vendor{i % 50}\\Task{i:06d}": {
+                "enabled": (i + version(i)) % 7 != 0,
+                "actions": (f"Exec(Command=C:\\Program Files\\Vendor{i % 50}\\Product{i % 400}\\task.exe, Arguments=/run {i})",),
+                "triggers": ("LogonTrigger(Enabled=true)",)
+            }
+            for i in range(sizes["tasks"])
+        },
+        "user_registry": {
+            f"S-1-5-21-3623811015-3361044348-30300820-{1001 + user}": {
+                f"registry\\App{i:04d}": f"\"C:\\Users\\Public\\Programs\\Vendor{i % 30}\\App{i}\\v{version(i)}\\app.exe\" --autostart"
+                for i in range(sizes["user_registry"])
+            }
+            for user in range(USERS)
+        },
+        "user_startup_folders": {
+            f"S-1-5-21-3623811015-3361044348-30300820-{1001 + user}": {
+                f"Tool {i:04d} ({version(i)}).lnk" for i in range(sizes["user_startup_folders"])
+            }
+            for user in range(USERS)
+        }
+    }
+    return state
+
+def run_mode(mode, entries, cycles, churn):
+    sizes = source_sizes(entries)
+    rng = random.Random(1)
+    gc.collect()
+    rss_before = current_rss()
+    previous = {}
+    compare_seconds = []
+    for cycle in range(cycles):
+        changed = set(rng.sample(range(max(sizes.values())), max(1, int(entries * churn)))) if cycle else set()
+        results = collect(sizes, changed)
+        if mode == "compact":
+            pool = {}
+            current = {name: compact_source(name, data, previous.get(name), pool) for name, data in results.items()}
+            del pool
+        else:
+            current = results
+        del results
+        if previous:
+            started = time.perf_counter()
+            for name in current:
+                COMPARATORS[name](previous[name], current[name], name)
+            compare_seconds.append(time.perf_counter() - started)
+        previous = current
+        del current
+        gc.collect()
+    return {
+        "mode": mode,
+        "entries": sum(size * (USERS if name.startswith("user_") else 1) for name, size in sizes.items()),
+        "rss_before_mb": rss_before / 1024 ** 2,
+        "rss_after_mb": current_rss() / 1024 ** 2,
+        "state_mb": (current_rss() - rss_before) / 1024 ** 2,
+        "compare_ms": 1000 * sum(compare_seconds) / max(1, len(compare_seconds))
+    }
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--entries", type=int, default=50000)
+    parser.add_argument("--cycles", type=int, default=5)
+    parser.add_argument("--churn", type=float, default=0.001)
+    parser.add_argument("--mode", choices=("dict", "compact"), help="nur eine Variante im aktuellen Prozess messen")
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(run_mode(args.mode, args.entries, args.cycles, args.churn)))
+        return 0
+    # Getrennte Prozesse, damit die Varianten sich den Heap nicht teilen
+    results = {}
+    for mode in ("dict", "compact"):
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--mode", mode, "--entries", str(args.entries),
+             "--cycles", str(args.cycles), "--churn", str(args.churn)],
+            capture_output=True, text=True, check=True
+        ).stdout
+        results[mode] = json.loads(output.strip().splitlines()[-1])
+    print(f"{results['dict']['entries']} Einträge, {args.cycles} Zyklen")
+    for mode, result in results.items():
+        print(f"  {mode:8s} RSS {result['rss_before_mb']:6.1f} -> {result['rss_after_mb']:6.1f} MB, "
+              f"Zustand {result['state_mb']:6.1f} MB, Vergleich {result['compare_ms']:7.2f} ms/Zyklus")
+    print(f"  Ersparnis: {1 - results['compact']['state_mb'] / results['dict']['state_mb']:.0%}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+# Simuliert viele Agents (FleetAgent mit Spool im Speicher) gegen einen lokalen FleetCollector.
+# Nach der Hälfte der Zyklen wird der Collector neu gestartet; die Agents sammeln währenddessen
+# im Spool und setzen danach per Sequenznummer fort. Geprüft wird, dass jede Änderung genau
+# einmal ankommt.
+#   python benchmarks/bench_fleet.py --agents 200 --cycles 20 --events 25
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from autostart_monitor import FleetAgent, FleetSpool, ChangeEvent, ADDED, MODIFIED, snapshot_digest
+from fleet_collector import FleetCollector
+
+def make_events(agent, cycle, count):
+    return [
+        ChangeEvent("registry", ADDED if i % 3 else MODIFIED, f"Updater{i}",
+                    old=f"C:\\Program Files\\Vendor{i}\\1.{cycle}\\update.exe" if i % 3 == 0 else None,
+                    new=f"C:\\Program Files\\Vendor{i}\\1.{cycle + 1}\\update.exe --agent {agent}")
+        for i in range(count)
+    ]
+
+def wait_for(predicate, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.05)
+    return False
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--agents", type=int, default=200)
+    parser.add_argument("--cycles", type=int, default=20)
+    parser.add_argument("--events", type=int, default=25, help="Änderungen je Agent und Zyklus")
+    parser.add_argument("--address", default="127.0.0.1:0")
+    args = parser.parse_args()
+
+    received = {}
+    lock = threading.Lock()
+
+    def handler(host, seq, kind, payload):
+        with lock:
+            received.setdefault(host, []).append((seq, kind, len(payload.get("events", ()))))
+
+    collector = FleetCollector(handler)
+    server = collector.listen(args.address)
+    address = "%s:%d" % server.server_address[:2]
+    digests = {"registry": snapshot_digest({"a": 1}), "services": snapshot_digest({"b": 2})}
+    agents = [
+        FleetAgent(address, host_id=f"host{i:04d}", spool=FleetSpool(":memory:"), retry_max=0.5).start()
+        for i in range(args.agents)
+    ]
+
+    def run_cycles(cycles):
+        for cycle in cycles:
+            for index, agent in enumerate(agents):
+                agent.submit_events(make_events(index, cycle, args.events))
+                agent.submit_digests(digests, ["registry"])
+
+    expected_rows = args.agents * args.cycles * 2
+    started = time.perf_counter()
+    half = args.cycles // 2
+    run_cycles(range(half))
+    # Collector-Neustart auf demselben Port: offene Verbindungen brechen ab, Agents spoolen
+    collector.close()
+    offline = sum(agent.spool.count() for agent in agents)
+    run_cycles(range(half, args.cycles))
+    spooled = sum(agent.spool.count() for agent in agents)
+    collector.listen(address)
+    delivered = wait_for(lambda: collector.rows >= expected_rows, 120)
+    elapsed = time.perf_counter() - started
+
+    raw = sum(agent.bytes_raw for agent in agents)
+    wire = sum(agent.bytes_sent for agent in agents)
+    batches = sum(agent.batches for agent in agents)
+    for agent in agents:
+        agent.stop()
+    collector.close()
+
+    events = collector.events
+    print(f"{args.agents} Agents, {args.cycles} Zyklen: {collector.rows} Einträge / {events} Änderungen in {elapsed:.2f} s "
+          f"({events / elapsed:.0f} Änderungen/s)")
+    print(f"Spool beim Neustart: {offline} unbestätigt, danach offline gesammelt: {spooled}; Duplikate verworfen: {collector.duplicates}")
+    print(f"{batches} Stapel, {raw / 1024:.0f} KiB JSON -> {wire / 1024:.0f} KiB übertragen (Faktor {raw / max(wire, 1):.1f})")
+
+    ok = delivered and events == args.agents * args.cycles * args.events
+    for host, rows in received.items():
+        seqs = [seq for seq, kind, count in rows]
+        ok = ok and seqs == list(range(1, len(seqs) + 1))
+    if not ok:
+        print("FEHLER: Änderungen fehlen oder wurden doppelt verarbeitet")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
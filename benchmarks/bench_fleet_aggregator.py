@@ -0,0 +1,108 @@
+# Misst die Aufnahme im FleetAggregator auf einem Kern: 2.000 Hosts melden denselben neuen
+# Run-Wert (Rollout), gestaffelte Updates und hostspezifisches Rauschen. Danach Abfragen
+# "welche Hosts haben Run-Wert X" über den Index im Vergleich zu einem linearen Durchlauf.
+# Weitere --preinstalled Hosts hatten den Wert schon vor dem Start des Agents und melden ihn nur
+# über die Einträge ihres ersten vollständigen Berichts; hosts_with muss sie mitzählen.
+#   python benchmarks/bench_fleet_aggregator.py --hosts 2000 --events 100 --preinstalled 500
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from autostart_monitor import ChangeEvent, ADDED, MODIFIED, REMOVED, encode_fleet_event, fleet_entries, snapshot_digest
+from fleet_collector import FleetAggregator
+
+ROLLOUT_VALUE = "\"C:\\Program Files\\Zoom\\bin\\ZoomUpdate.exe\" /silent"
+
+def host_batches(hosts, per_host, rng):
+    for index in range(hosts):
+        host = f"ws{index:05d}"
+        events = [ChangeEvent("registry_hklm_run", ADDED, "ZoomUpdate", new=ROLLOUT_VALUE)]
+        for i in range(per_host - 1):
+            roll = rng.random()
+            if roll < 0.4:
+                # Gestaffelte Updates: wenige verschiedene Versionen über viele Hosts
+                version = rng.randrange(5)
+                events.append(ChangeEvent("registry", MODIFIED, f"Updater{i % 20}", f"C:\\Vendor{i % 20}\\1.{version}\\up.exe", f"C:\\Vendor{i % 20}\\1.{version + 1}\\up.exe"))
+            elif roll < 0.5:
+                events.append(ChangeEvent("tasks", REMOVED, f"\\Vendor\\Task{i % 50}", old={"enabled": True, "actions": ("x.exe",), "triggers": ("logon",)}))
+            else:
+                events.append(ChangeEvent("startup_folders", ADDED, f"user\\tool{index}-{i}.lnk", new=f"{index}-{i}"))
+        digests = {f"source{n}": snapshot_digest({"group": (index + n) % 7}).hex() for n in range(12)}
+        yield host, [encode_fleet_event(event) for event in events], digests
+
+# Erster vollständiger Bericht eines Hosts, dessen Run-Schlüssel den Wert bereits enthält
+def preinstalled_report(index):
+    run = {"ZoomUpdate": ROLLOUT_VALUE, **{f"Vendor{i}": f"C:\\Vendor{i}\\app.exe" for i in range(20)}}
+    return f"pre{index:05d}", {
+        "ts": time.time(),
+        "full": True,
+        "digests": {"registry_hklm_run": snapshot_digest(run).hex()},
+        "entries": {"registry_hklm_run": fleet_entries("registry_hklm_run", run)}
+    }
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--hosts", type=int, default=2000)
+    parser.add_argument("--events", type=int, default=100, help="Änderungen je Host")
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--preinstalled", type=int, default=500, help="Hosts, die den Wert nur als Eintrag melden")
+    args = parser.parse_args()
+    rng = random.Random(7)
+    batches = list(host_batches(args.hosts, args.events, rng))
+    total = sum(len(events) for host, events, digests in batches)
+
+    aggregator = FleetAggregator()
+    started_cpu = time.process_time()
+    started = time.perf_counter()
+    # Wie vom Collector: je Host ein Stapel Änderungen und eine vollständige Digest-Meldung
+    for host, events, digests in batches:
+        aggregator.handle(host, 1, "events", {"ts": time.time(), "events": events})
+        aggregator.handle(host, 2, "digests", {"ts": time.time(), "full": True, "digests": digests})
+    elapsed = time.perf_counter() - started
+    cpu = time.process_time() - started_cpu
+    rate = total / cpu
+    print(f"Aufnahme: {total} Änderungen von {args.hosts} Hosts in {elapsed:.2f} s ({rate:,.0f} Änderungen/s CPU), "
+          f"{len(aggregator.incidents)} Incidents")
+
+    top = aggregator.top_incidents(3)
+    for incident in top:
+        print(f"  {incident.host_count:5d} Hosts  {incident.source} {incident.kind} {incident.key}")
+
+    started = time.perf_counter()
+    for _ in range(args.queries):
+        hosts = aggregator.hosts_with("registry_hklm_run", "ZoomUpdate", ROLLOUT_VALUE)
+    indexed = (time.perf_counter() - started) / args.queries
+    started = time.perf_counter()
+    for _ in range(args.queries):
+        aggregator.hosts_with("startup_folders", "user\\tool5-7.lnk")
+    selective = (time.perf_counter() - started) / args.queries
+    # Vergleich: alle gemeldeten Änderungen durchsuchen
+    started = time.perf_counter()
+    for _ in range(max(1, args.queries // 100)):
+        linear = sorted({host for host, events, digests in batches for event in events if event[2] == "ZoomUpdate" and event[4] == ROLLOUT_VALUE})
+    scan = (time.perf_counter() - started) / max(1, args.queries // 100)
+    group = aggregator.hosts_with_digest("source0", snapshot_digest({"group": 0}).hex())
+    print(f"hosts_with (alle {len(hosts)} Treffer): {indexed * 1000:.3f} ms, ein Treffer: {selective * 1e6:.1f} µs, "
+          f"linearer Durchlauf: {scan * 1000:.1f} ms; gleicher Stand source0: {len(group)} Hosts")
+
+    reports = [preinstalled_report(index) for index in range(args.preinstalled)]
+    started = time.perf_counter()
+    for host, payload in reports:
+        aggregator.handle(host, 1, "digests", payload)
+    elapsed = time.perf_counter() - started
+    with_preinstalled = aggregator.hosts_with("registry_hklm_run", "ZoomUpdate", ROLLOUT_VALUE)
+    print(f"Erste Berichte von {args.preinstalled} Hosts mit Einträgen: {elapsed * 1000:.1f} ms; "
+          f"Wert jetzt auf {len(with_preinstalled)} Hosts")
+
+    ok = rate >= 10000 and hosts == linear and top[0].host_count == args.hosts and top[0].key == "ZoomUpdate"
+    ok = ok and with_preinstalled == sorted(linear + [host for host, payload in reports])
+    if not ok:
+        print("FEHLER: Durchsatz unter 10.000 Änderungen/s oder falsche Zuordnung")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
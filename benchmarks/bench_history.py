@@ -0,0 +1,83 @@
+# Füllt die Änderungshistorie mit 1.000.000 Zeilen und misst Einfügen, seitenweises
+# Lesen (wie das Verlaufs-Tab), gefilterte Abfragen und Aufbewahrung/Kompaktierung. Während der
+# Aufbewahrung liest ein zweiter Thread fortlaufend die erste Seite; seine längste Wartezeit zeigt,
+# wie lange die Pflege die Sperre am Stück hält.
+#   python benchmarks/bench_history.py --rows 1000000
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from autostart_monitor import ChangeEvent, ChangeHistory, ADDED, MODIFIED, COLLECTORS
+
+def timed(label, func):
+    started = time.perf_counter()
+    result = func()
+    print(f"{label}: {(time.perf_counter() - started) * 1000:.1f} ms")
+    return result
+
+# Liest wie das Verlaufs-Tab, solange func läuft, und liefert die längste einzelne Abfragezeit
+def worst_reader_latency(history, func):
+    done = threading.Event()
+    latencies = []
+
+    def reader():
+        while not done.is_set():
+            started = time.perf_counter()
+            history.page(limit=50)
+            latencies.append(time.perf_counter() - started)
+            time.sleep(0.001)
+
+    thread = threading.Thread(target=reader, daemon=True)
+    thread.start()
+    try:
+        result = func()
+    finally:
+        done.set()
+        thread.join()
+    return result, max(latencies, default=0.0)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--batch", type=int, default=10000)
+    parser.add_argument("--page", type=int, default=500)
+    args = parser.parse_args()
+
+    sources = list(COLLECTORS)
+    with tempfile.TemporaryDirectory() as directory:
+        history = ChangeHistory(os.path.join(directory, "history.sqlite3"))
+        now = time.time()
+        started = time.perf_counter()
+        for offset in range(0, args.rows, args.batch):
+            count = min(args.batch, args.rows - offset)
+            events = [
+                ChangeEvent(sources[i % len(sources)], MODIFIED if i % 3 else ADDED, f"Entry{i % 5000}", f"C:\\old\\{i}.exe", f"C:\\new\\{i}.exe")
+                for i in range(offset, offset + count)
+            ]
+            # Über ein Jahr verteilt, damit Zeitfilter und Aufbewahrung etwas zu tun haben
+            history.record(events, ts=now - 365 * 86400 * (1 - offset / args.rows))
+        elapsed = time.perf_counter() - started
+        print(f"Einfügen: {args.rows} Zeilen in {elapsed:.1f} s ({args.rows / elapsed:.0f}/s)")
+        print(f"Dateigröße: {os.path.getsize(history.path) / (1024 * 1024):.1f} MB")
+
+        page = timed("Erste Seite", lambda: history.page(limit=args.page))
+        timed("Folgeseite (Keyset)", lambda: history.page(before_id=page[-1][0], limit=args.page))
+        timed("Tiefe Seite (id 1000)", lambda: history.page(before_id=1000, limit=args.page))
+        timed(f"Quelle {sources[1]}, letzte 30 Tage", lambda: history.page(source=sources[1], since=now - 30 * 86400, limit=args.page))
+        timed("Schlüssel Entry42", lambda: history.page(key="Entry42", limit=args.page))
+        timed("Quellen", history.sources)
+
+        deleted, worst = worst_reader_latency(history, lambda: timed("Aufbewahrung (180 Tage)", lambda: history.apply_retention(max_age_days=180)))
+        print(f"Entfernt: {deleted}, längste Leseabfrage währenddessen: {worst * 1000:.1f} ms")
+        _, worst = worst_reader_latency(history, lambda: timed("Kompaktierung", history.compact))
+        print(f"Längste Leseabfrage während der Kompaktierung: {worst * 1000:.1f} ms")
+        print(f"Dateigröße danach: {os.path.getsize(history.path) / (1024 * 1024):.1f} MB")
+        history.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# Startet eine Headless-Instanz mit einer künstlichen Quelle (50.000 Einträge) und misst:
+# Statusabfrage, zweiten Start im selben Modus (Argumente übergeben und beenden) und
+# Ablösung mit Übergabe des Zustands.
+#   python benchmarks/bench_instance.py --entries 50000
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import autostart_monitor
+from autostart_monitor import claim_instance, instance_request, snapshot_digest
+
+def fake_data(entries):
+    return {f"Tool{i}": f"C:\\Program Files\\Tool{i}\\tool.exe" for i in range(entries)}
+
+def serve(entries):
+    autostart_monitor.COLLECTORS["bench"] = lambda: fake_data(entries)
+    autostart_monitor.COMPARATORS["bench"] = autostart_monitor.compare_registry_entries
+    settings = {
+        "selected_methods": {name: name == "bench" for name in autostart_monitor.COLLECTORS},
+        "persist_snapshot": False, "history_enabled": False, "event_driven": False, "metrics_file": "", "hash_targets": False
+    }
+    return autostart_monitor.run_headless(settings)
+
+def wait_for(predicate, timeout=10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return False
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--entries", type=int, default=50000)
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.serve:
+        return serve(args.entries)
+
+    # Eigene Adresse, damit eine echte Instanz nicht gestört wird
+    os.environ["USER"] = os.environ["USERNAME"] = f"bench{os.getpid()}"
+    with tempfile.TemporaryDirectory() as directory:
+        child = subprocess.Popen([sys.executable, os.path.abspath(__file__), "--serve", "--entries", str(args.entries)], cwd=directory)
+        try:
+            ok = wait_for(lambda: (instance_request("status") or {}).get("cycles", 0) >= 1)
+            started = time.perf_counter()
+            for _ in range(100):
+                status = instance_request("status")
+            print(f"Statusabfrage: {(time.perf_counter() - started) * 10:.2f} ms, Zyklen {status['cycles']}, PID {status['pid']}")
+
+            started = time.perf_counter()
+            claim = claim_instance("headless", ["--headless"])
+            print(f"Zweiter Start (gleicher Modus): {(time.perf_counter() - started) * 1000:.2f} ms, beendet: {claim is None}")
+            ok = ok and claim is None
+
+            started = time.perf_counter()
+            process = subprocess.run([sys.executable, os.path.join(ROOT, "autostart_monitor.py"), "--headless"], cwd=directory)
+            print(f"Zweiter Start als Prozess (inkl. Interpreter): {(time.perf_counter() - started) * 1000:.0f} ms, Exitcode {process.returncode}")
+            ok = ok and process.returncode == 0
+
+            started = time.perf_counter()
+            claim = claim_instance("headless", ["--headless", "--takeover"], takeover=True)
+            elapsed = time.perf_counter() - started
+            state, digests = claim.get("baseline", ({}, {}))
+            transferred = state.get("bench") == fake_data(args.entries) and digests.get("bench") == snapshot_digest(fake_data(args.entries))
+            print(f"Ablösung mit Zustandsübergabe: {elapsed * 1000:.0f} ms, {len(state.get('bench', {}))} Einträge übernommen")
+            ok = ok and transferred and child.wait(timeout=10) == 0
+            ok = ok and instance_request("ping") is None
+        finally:
+            if child.poll() is None:
+                child.kill()
+    if not ok:
+        print("FEHLER: Übergabe unvollständig")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+# Vergleicht die Verzögerung, die Logging im Scan-Thread verursacht: vorher (FileHandler bzw.
+# rotierender Handler mit Komprimierung direkt im aufrufenden Thread) und nachher (QueueHandler,
+# Schreiben/Rotation/gzip im Listener-Thread). Ein Zyklus erzeugt --lines Einträge.
+#   python benchmarks/bench_logging.py --cycles 2000 --lines 50 --max-bytes 1048576 --gap 5
+import argparse
+import logging
+import logging.handlers
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+def run_cycles(logger, cycles, lines, gap):
+    timings = []
+    for cycle in range(cycles):
+        # Zwischen den Zyklen arbeitet der Scan-Thread ohne zu loggen (Collectors, Vergleich)
+        time.sleep(gap)
+        started = time.perf_counter()
+        for i in range(lines):
+            logger.error(f"Fehler beim Lesen des Dienstes Service{i} in Zyklus {cycle}: [WinError 5] Zugriff verweigert")
+        timings.append(time.perf_counter() - started)
+    return timings
+
+def report(label, timings, lines):
+    print(f"{label:34s} p50 {percentile(timings, 0.5) * 1000:7.3f} ms  p99 {percentile(timings, 0.99) * 1000:7.3f} ms  "
+          f"max {max(timings) * 1000:7.2f} ms  ({sum(timings) / len(timings) / lines * 1e6:.1f} µs/Eintrag)")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cycles", type=int, default=2000)
+    parser.add_argument("--lines", type=int, default=50)
+    parser.add_argument("--max-bytes", type=int, default=1024 * 1024)
+    parser.add_argument("--gap", type=float, default=5, help="ms ohne Logging zwischen den Zyklen")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        import autostart_monitor
+        root = logging.getLogger()
+        queue_handlers = list(root.handlers)
+        logger = autostart_monitor.COLLECTOR_LOG
+        formatter = logging.Formatter(autostart_monitor.LOG_FORMAT)
+
+        # Vorher: synchron wie logging.basicConfig, einmal ohne und einmal mit Rotation im Scan-Thread
+        for label, handler in (
+            ("vorher: FileHandler (synchron)", logging.FileHandler("sync.log", encoding="utf8")),
+            ("vorher: Rotation+gzip (synchron)", autostart_monitor.CompressingRotatingFileHandler("sync-rot.log", args.max_bytes, 5, daily=False))
+        ):
+            handler.setFormatter(formatter)
+            for queue_handler in queue_handlers:
+                root.removeHandler(queue_handler)
+            root.addHandler(handler)
+            report(label, run_cycles(logger, args.cycles, args.lines, args.gap / 1000), args.lines)
+            root.removeHandler(handler)
+            handler.close()
+            for queue_handler in queue_handlers:
+                root.addHandler(queue_handler)
+
+        # Nachher: Warteschlange, Rotation und Komprimierung im Listener-Thread
+        autostart_monitor.setup_logging({"log_max_bytes": args.max_bytes, "log_backup_count": 5, "log_rotate_daily": False})
+        timings = run_cycles(logger, args.cycles, args.lines, args.gap / 1000)
+        started = time.perf_counter()
+        autostart_monitor.stop_logging()
+        drain = time.perf_counter() - started
+        report("nachher: QueueHandler + Listener", timings, args.lines)
+        rotated = sorted(name for name in os.listdir(directory) if name.startswith(autostart_monitor.LOG_FILE))
+        print(f"Listener leeren beim Beenden: {drain * 1000:.0f} ms; Dateien: {', '.join(rotated)}")
+        os.chdir(ROOT)
+        ok = f"{autostart_monitor.LOG_FILE}.1.gz" in rotated
+    if not ok:
+        print("FEHLER: keine rotierte Datei")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
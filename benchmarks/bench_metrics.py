@@ -0,0 +1,71 @@
+# Misst den Aufwand der Instrumentierung (Collector-Aufrufe mit und ohne MonitorMetrics),
+# die Ausgabe im Prometheus-Textformat und einen Abruf über den lokalen HTTP-Endpunkt.
+#   python benchmarks/bench_metrics.py --sources 40 --cycles 2000
+import argparse
+import os
+import sys
+import tempfile
+import time
+import urllib.request
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import autostart_monitor
+from autostart_monitor import CollectorExecutor, MonitorMetrics, MetricsServer, compare_states, ChangeEvent, ADDED
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sources", type=int, default=40)
+    parser.add_argument("--cycles", type=int, default=2000)
+    args = parser.parse_args()
+
+    names = [f"bench_{i}" for i in range(args.sources)]
+    for i, name in enumerate(names):
+        data = {f"entry{n}": f"C:\\Tools\\{n}.exe" for n in range(20)}
+        autostart_monitor.COLLECTORS[name] = lambda data=data: data
+        autostart_monitor.COMPARATORS[name] = lambda old, new, source: []
+
+    timings = {}
+    for label, metrics in (("ohne Metriken", None), ("mit Metriken", MonitorMetrics())):
+        executor = CollectorExecutor(max_workers=4, metrics=metrics)
+        state = {}
+        started = time.perf_counter()
+        for _ in range(args.cycles):
+            results, digests, failed = executor.run(names)
+            compare_states(state, results, names, metrics=metrics)
+            if metrics is not None:
+                metrics.record_changes(names[:1], [ChangeEvent(names[0], ADDED, "x", new="y")])
+                metrics.observe_cycle(0.01, 0.0)
+            state = results
+        timings[label] = (time.perf_counter() - started) / args.cycles
+        executor.shutdown()
+        print(f"{label}: {timings[label] * 1000:.3f} ms/Zyklus ({args.sources} Quellen)")
+    overhead = timings["mit Metriken"] - timings["ohne Metriken"]
+    print(f"Mehraufwand: {overhead * 1e6 / args.sources:.1f} µs je Quelle und Zyklus")
+
+    started = time.perf_counter()
+    text = metrics.render()
+    print(f"render(): {(time.perf_counter() - started) * 1000:.2f} ms, {len(text.splitlines())} Zeilen, {len(text)} Bytes")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "metrics.prom")
+        started = time.perf_counter()
+        metrics.write(path)
+        print(f"write(): {(time.perf_counter() - started) * 1000:.2f} ms")
+
+    server = MetricsServer(metrics, 0).start()
+    try:
+        started = time.perf_counter()
+        with urllib.request.urlopen(f"http://127.0.0.1:{server.port}/metrics", timeout=5) as response:
+            body = response.read().decode("utf8")
+        print(f"HTTP-Abruf: {(time.perf_counter() - started) * 1000:.2f} ms, {len(body)} Bytes")
+    finally:
+        server.stop()
+    ok = f'autostart_collector_duration_seconds_count{{source="{names[0]}"}} {args.cycles}' in body
+    ok = ok and f"autostart_cycles_total {args.cycles}" in body
+    if not ok:
+        print("FEHLER: unerwartete Metrikausgabe")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
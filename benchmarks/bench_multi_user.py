@@ -0,0 +1,77 @@
+# Baut einen Terminalserver mit 200 Profilen nach (Fake-Registry mit HKEY_USERS\<SID> und
+# ProfileList, Startup-Ordner in einem Temp-Verzeichnis) und misst den Mehrbenutzer-Scan:
+# erster Durchlauf, unverändert und nach Änderungen bei einzelnen Benutzern.
+#   python benchmarks/bench_multi_user.py --users 200 --workers 8
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from autostart_monitor import (
+    MultiUserScanner, PROFILE_LIST_LOCATION, RUN_KEY_PATH, USER_STARTUP_SUBDIR,
+    check_user_registry, check_user_startup_folders, compare_user_registry, compare_user_startup_folders, render_events
+)
+from fake_winreg import FakeRegistry, HKEY_LOCAL_MACHINE, HKEY_USERS, REG_EXPAND_SZ
+
+def sid(index):
+    return f"S-1-5-21-1004336348-1177238915-682003330-{1000 + index}"
+
+def build(root, users, loaded):
+    registry = FakeRegistry()
+    for i in range(users):
+        profile = os.path.join(root, f"user{i:03d}")
+        os.makedirs(os.path.join(profile, USER_STARTUP_SUBDIR))
+        for n in range(3):
+            open(os.path.join(profile, USER_STARTUP_SUBDIR, f"tool{n}.lnk"), "wb").close()
+        registry.set_value(HKEY_LOCAL_MACHINE, f"{PROFILE_LIST_LOCATION.path}\\{sid(i)}", "ProfileImagePath", profile, REG_EXPAND_SZ)
+        if i < loaded:
+            for n in range(4):
+                registry.set_value(HKEY_USERS, f"{sid(i)}\\{RUN_KEY_PATH}", f"App{n}", f"C:\\Apps\\app{n}.exe")
+            registry.create_key(HKEY_USERS, f"{sid(i)}_Classes")
+    return registry
+
+def scan(label, registry, scanner):
+    reads = scanner.registry_reads
+    folders = scanner.rescanned_folders
+    started = time.perf_counter()
+    result = check_user_registry(registry, scanner), check_user_startup_folders(registry, scanner)
+    elapsed = time.perf_counter() - started
+    print(f"{label}: {elapsed * 1000:7.1f} ms, {scanner.registry_reads - reads} Schlüssel neu gelesen, "
+          f"{scanner.rescanned_folders - folders} Ordner neu gelistet")
+    return result
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--loaded", type=int, default=120, help="davon angemeldet (Hive geladen)")
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        registry = build(root, args.users, args.loaded)
+        scanner = MultiUserScanner(args.workers)
+        first_registry, first_folders = scan("Erster Scan", registry, scanner)
+        scan("Unverändert", registry, scanner)
+
+        registry.set_value(HKEY_USERS, f"{sid(0)}\\{RUN_KEY_PATH}", "Updater", "C:\\Users\\Public\\evil.exe")
+        registry.set_value(HKEY_USERS, f"{sid(1)}\\{RUN_KEY_PATH}", "App0", "C:\\Apps\\other.exe")
+        open(os.path.join(root, "user150", USER_STARTUP_SUBDIR, "payload.bat"), "w").close()
+        # Abmeldung: Hive entladen, darf keine Entfernungen melden
+        registry.delete_key(HKEY_USERS, sid(2))
+        second_registry, second_folders = scan("2 Hives, 1 Ordner geändert, 1 abgemeldet", registry, scanner)
+        scanner.shutdown()
+
+        events = compare_user_registry(first_registry, second_registry) + compare_user_startup_folders(first_folders, second_folders)
+        print(render_events(events))
+        expected = {("user_registry", "user000\\registry\\Updater"), ("user_registry", "user001\\registry\\App0"),
+                    ("user_startup_folders", "user150\\payload.bat")}
+        if {(event.source, event.key) for event in events} != expected:
+            print("FEHLER: unerwartete Änderungen")
+            return 1
+        return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+# Misst, wie gut parallele Collector-Threads den gemeinsamen RegistryLocationReader nutzen: alle
+# ASEP-Orte werden über einen Thread-Pool gelesen, einmal mit einer Sperre um jeden read()-Aufruf
+# (bisheriges Verhalten, alle Orte seriell) und einmal mit den Sperren je Ort. Die Fake-Registry
+# wartet je Aufruf --latency Mikrosekunden (gibt wie echte Registry-Aufrufe die GIL frei).
+#   python benchmarks/bench_registry_concurrency.py --workers 8 --latency 200
+import argparse
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from autostart_monitor import ASEP_LOCATIONS, RegistryLocationReader
+from bench_asep_locations import populate
+from fake_winreg import FakeRegistry
+
+class SlowRegistry(FakeRegistry):
+    def __init__(self, latency):
+        super().__init__()
+        self.latency = latency
+
+    def QueryInfoKey(self, key):
+        time.sleep(self.latency)
+        return super().QueryInfoKey(key)
+
+    def EnumValue(self, key, index):
+        time.sleep(self.latency)
+        return super().EnumValue(key, index)
+
+    def EnumKey(self, key, index):
+        time.sleep(self.latency)
+        return super().EnumKey(key, index)
+
+    def QueryValueEx(self, key, name):
+        time.sleep(self.latency)
+        return super().QueryValueEx(key, name)
+
+def scan(pool, reader, registry, serial_lock):
+    def read(location):
+        if serial_lock is None:
+            return reader.read(location, registry)
+        with serial_lock:
+            return reader.read(location, registry)
+
+    started = time.perf_counter()
+    result = dict(zip(ASEP_LOCATIONS, pool.map(read, ASEP_LOCATIONS.values())))
+    return time.perf_counter() - started, result
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=200, help="Mikrosekunden je Registry-Aufruf")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    results = {}
+    with ThreadPoolExecutor(args.workers) as pool:
+        for label, serial_lock in (("eine Sperre", threading.Lock()), ("Sperre je Ort", None)):
+            registry = populate(SlowRegistry(args.latency / 1e6), ASEP_LOCATIONS)
+            reader = RegistryLocationReader()
+            cold, first = scan(pool, reader, registry, serial_lock)
+            warm = min(scan(pool, reader, registry, serial_lock)[0] for _ in range(args.rounds))
+            results[label] = first
+            print(f"{label:14s} erster Scan {cold * 1000:7.1f} ms, unverändert {warm * 1000:6.1f} ms")
+    if len({repr(sorted(result.items())) for result in results.values()}) != 1:
+        print("FEHLER: Ergebnisse weichen ab")
+        return 1
+    print(f"{len(ASEP_LOCATIONS)} Orte, {args.workers} Threads, {args.latency:.0f} µs je Aufruf")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,45 @@
+# Vergleicht check_services_start_values mit und ohne Last-Write-Cache an einer Fake-Registry.
+#   python benchmarks/bench_services_cache.py --services 5000 --rounds 20
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import autostart_monitor
+from fake_winreg import FakeRegistry, build_services, HKEY_LOCAL_MACHINE, REG_DWORD
+
+def measure(registry, rounds, cache=None, mutate=0):
+    timings = []
+    for round_index in range(rounds):
+        for i in range(mutate):
+            index = (round_index * mutate + i) % 5000
+            registry.set_value(HKEY_LOCAL_MACHINE, rf"SYSTEM\CurrentControlSet\Services\Service{index:05d}", "Start", round_index % 5, REG_DWORD)
+        registry.calls.clear()
+        start = time.perf_counter()
+        autostart_monitor.check_services_start_values(reg=registry, cache=cache)
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return timings[len(timings) // 2] * 1000, sum(registry.calls.values())
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--services", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--mutate", type=int, default=10, help="geänderte Dienste pro Runde")
+    args = parser.parse_args()
+
+    registry = build_services(FakeRegistry(), args.services)
+    uncached_ms, uncached_calls = measure(registry, args.rounds)
+    cache = autostart_monitor.ServicesStartCache()
+    measure(registry, 1, cache)
+    unchanged_ms, unchanged_calls = measure(registry, args.rounds, cache)
+    mutated_ms, mutated_calls = measure(registry, args.rounds, cache, args.mutate)
+    print(f"{args.services} Dienste, Median über {args.rounds} Runden")
+    print(f"  ohne Cache:               {uncached_ms:8.2f} ms  {uncached_calls:6d} Registry-Aufrufe")
+    print(f"  Cache, unverändert:       {unchanged_ms:8.2f} ms  {unchanged_calls:6d} Registry-Aufrufe")
+    print(f"  Cache, {args.mutate:3d} geändert/Runde: {mutated_ms:8.2f} ms  {mutated_calls:6d} Registry-Aufrufe")
+
+if __name__ == "__main__":
+    main()
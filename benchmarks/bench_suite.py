@@ -0,0 +1,246 @@
+# Benchmark-Suite für die Collectors und Vergleichsfunktionen der Scan-Schleife: Kontextmenü-Handler
+# (check_registry_location), Dienste (check_services_start_values), Startup-Ordner (check_startup_folders)
+# und compare_registry_entries, compare_services, compare_startup_folders, jeweils auch für kompakte
+# Stände (compact_snapshot). Läuft gegen die Fake-Registry und einen temporären Startup-Ordner, also
+# auch unter Linux. Ergebnisse als JSON; mit --baseline wird gegen einen gespeicherten Stand verglichen
+# und bei Regression über --threshold mit Code 1 beendet.
+#   python benchmarks/bench_suite.py                           # Vergleich mit bench_suite_baseline.json
+#   python benchmarks/bench_suite.py --sizes 10,1000 --out result.json
+#   python benchmarks/bench_suite.py --update-baseline         # neuen Referenzstand speichern
+import argparse
+import gc
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import autostart_monitor
+from autostart_monitor import (ASEP_LOCATIONS, RegistryLocationReader, ServicesStartCache, check_registry_location,
+                               check_services_start_values, check_startup_folders, compact_snapshot, compare_registry_entries,
+                               compare_services, compare_startup_folders)
+from fake_winreg import FakeRegistry, build_services, HKEY_LOCAL_MACHINE, REG_SZ
+
+DEFAULT_SIZES = (10, 100, 1000, 10000, 100000)
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_suite_baseline.json")
+CONTEXT_LOCATION = "context_handlers_star"
+
+# Misst fn wiederholt, bis min_rounds und min_seconds erreicht sind
+def measure(fn, min_rounds, min_seconds, max_rounds=2000):
+    gc.collect()
+    timings = []
+    started = time.perf_counter()
+    while len(timings) < max_rounds and (len(timings) < min_rounds or time.perf_counter() - started < min_seconds):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+def populate_context_handlers(registry, size):
+    path = ASEP_LOCATIONS[CONTEXT_LOCATION].path
+    for i in range(size):
+        registry.set_value(HKEY_LOCAL_MACHINE, f"{path}\\Handler{i:06d}", "", f"{{{i:08X}-0000-0000-0000-000000000000}}", REG_SZ)
+    return registry
+
+def populate_startup_folders(root, size):
+    # Drei Viertel im Benutzer-, der Rest im gemeinsamen Ordner
+    directories = {"user": os.path.join(root, "user"), "common": os.path.join(root, "common")}
+    for directory in directories.values():
+        os.makedirs(directory)
+    for i in range(size):
+        scope = "common" if i % 4 == 3 else "user"
+        open(os.path.join(directories[scope], f"tool{i:06d}.lnk"), "wb").close()
+    return directories
+
+# Vorher/Nachher-Paar mit je churn-Anteil hinzugefügter, entfernter und geänderter Einträge
+def mapping_pair(size, churn, entry):
+    changes = max(1, int(size * churn))
+    prev = dict(entry(i, 0) for i in range(size))
+    curr = dict(prev)
+    keys = list(prev)
+    for key in keys[:changes]:
+        del curr[key]
+    for i in range(size, size + changes):
+        key, value = entry(i, 0)
+        curr[key] = value
+    for key in keys[changes:2 * changes]:
+        curr[key] = entry(int(key[-6:]), 1)[1]
+    return prev, curr, 3 * min(changes, size // 2 or 1)
+
+def folder_pair(size, churn):
+    changes = max(1, int(size * churn))
+    prev = {"user": {f"tool{i:06d}.lnk" for i in range(size)}, "common": {f"common{i:06d}.lnk" for i in range(size // 4)}}
+    curr = {scope: set(files) for scope, files in prev.items()}
+    for i in range(changes):
+        curr["user"].discard(f"tool{i:06d}.lnk")
+        curr["user"].add(f"tool{size + i:06d}.lnk")
+    return prev, curr, 2 * min(changes, size)
+
+def registry_entry(i, version):
+    return f"App{i:06d}", f"\"C:\\Program Files\\Vendor{i % 500}\\App{i}\\v{version}\\app.exe\" --background"
+
+def service_entry(i, version):
+    return f"Service{i:06d}", (2, 3, 4)[(i + version) % 3]
+
+def check_events(name, events, expected):
+    if len(events) != expected:
+        raise SystemExit(f"{name}: {len(events)} Änderungen statt {expected}")
+
+def run_size(size, churn, min_rounds, min_seconds, passes, workdir):
+    registry = populate_context_handlers(build_services(FakeRegistry(), size), size)
+    directories = populate_startup_folders(os.path.join(workdir, str(size)), size)
+    autostart_monitor.USER_STARTUP_DIR = directories["user"]
+    autostart_monitor.COMMON_STARTUP_DIR = directories["common"]
+
+    # Plausibilität: die Collectors müssen alle angelegten Einträge liefern
+    if len(check_registry_location(CONTEXT_LOCATION, registry, RegistryLocationReader())) != size:
+        raise SystemExit("check_registry_location: Eintragsanzahl stimmt nicht")
+    if len(check_services_start_values(registry)) != size:
+        raise SystemExit("check_services_start_values: Eintragsanzahl stimmt nicht")
+    folders = check_startup_folders()
+    if len(folders["user"]) + len(folders["common"]) != size:
+        raise SystemExit("check_startup_folders: Eintragsanzahl stimmt nicht")
+
+    reader = RegistryLocationReader()
+    cache = ServicesStartCache()
+    registry_pair = mapping_pair(size, churn, registry_entry)
+    services_pair = mapping_pair(size, churn, service_entry)
+    startup_pair = folder_pair(size, churn)
+    check_events("compare_registry_entries", compare_registry_entries(*registry_pair[:2]), registry_pair[2])
+    check_events("compare_services", compare_services(*services_pair[:2]), services_pair[2])
+    check_events("compare_startup_folders", compare_startup_folders(*startup_pair[:2]), startup_pair[2])
+    # Kompakte Stände wie in MonitorEngine: der neue Stand übernimmt die Objekte des vorherigen
+    compact_pairs = {}
+    for name, (prev, curr, _) in (("registry", registry_pair), ("services", services_pair), ("startup", startup_pair)):
+        compact_prev = compact_snapshot(prev)
+        compact_pairs[name] = (compact_prev, compact_snapshot(curr, compact_prev))
+    check_events("compare_registry_entries (kompakt)", compare_registry_entries(*compact_pairs["registry"]), registry_pair[2])
+    check_events("compare_services (kompakt)", compare_services(*compact_pairs["services"]), services_pair[2])
+    check_events("compare_startup_folders (kompakt)", compare_startup_folders(*compact_pairs["startup"]), startup_pair[2])
+
+    cases = {
+        # Kalt: neuer Reader je Runde, also vollständiges Lesen aller Unterschlüssel
+        "collect_context_handlers": lambda: check_registry_location(CONTEXT_LOCATION, registry, RegistryLocationReader()),
+        # Warm: unveränderte Last-Write-Zeit, Ergebnis aus dem Cache des Readers
+        "collect_context_handlers_cached": lambda: check_registry_location(CONTEXT_LOCATION, registry, reader),
+        "collect_services": lambda: check_services_start_values(registry),
+        "collect_services_cached": lambda: check_services_start_values(registry, cache),
+        "collect_startup_folders": check_startup_folders,
+        "compare_registry_entries": lambda: compare_registry_entries(*registry_pair[:2]),
+        "compare_services": lambda: compare_services(*services_pair[:2]),
+        "compare_startup_folders": lambda: compare_startup_folders(*startup_pair[:2]),
+        "compact_registry": lambda: compact_snapshot(registry_pair[1], compact_pairs["registry"][0]),
+        "compare_registry_entries_compact": lambda: compare_registry_entries(*compact_pairs["registry"]),
+        "compare_services_compact": lambda: compare_services(*compact_pairs["services"]),
+        "compare_startup_folders_compact": lambda: compare_startup_folders(*compact_pairs["startup"])
+    }
+    # Fälle reihum in mehreren Durchgängen messen, damit kurze langsame Phasen der Maschine
+    # nicht einen Fall allein treffen
+    timings_by_case = {case: [] for case in cases}
+    for _ in range(passes):
+        for case, fn in cases.items():
+            timings_by_case[case].extend(measure(fn, min_rounds, min_seconds))
+    results = {}
+    for case, timings in timings_by_case.items():
+        median = statistics.median(timings)
+        results[f"{case}/{size}"] = {
+            "case": case,
+            "size": size,
+            "rounds": len(timings),
+            "median_ms": median * 1000,
+            "min_ms": min(timings) * 1000,
+            "us_per_entry": min(timings) * 1e6 / size
+        }
+    cache.close()
+    reader.close()
+    shutil.rmtree(os.path.join(workdir, str(size)), ignore_errors=True)
+    return results
+
+# Regression: schnellste Runde um mehr als threshold langsamer und mindestens min_delta_ms absolut.
+# Der Bestwert schwankt auf geteilten Maschinen deutlich weniger als der Median
+def compare_baseline(results, baseline, threshold, min_delta_ms):
+    rows = []
+    for name, result in results.items():
+        reference = baseline.get("results", {}).get(name)
+        if reference is None:
+            rows.append((name, result, None, None, False))
+            continue
+        ratio = result["min_ms"] / reference["min_ms"] if reference["min_ms"] else 1.0
+        regressed = ratio > 1 + threshold and result["min_ms"] - reference["min_ms"] > min_delta_ms
+        rows.append((name, result, reference, ratio, regressed))
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default=",".join(str(size) for size in DEFAULT_SIZES))
+    parser.add_argument("--churn", type=float, default=0.01, help="Anteil hinzugefügter/entfernter/geänderter Einträge beim Vergleich")
+    parser.add_argument("--min-rounds", type=int, default=5)
+    parser.add_argument("--min-seconds", type=float, default=0.1, help="Mindestmesszeit je Fall, Größe und Durchgang")
+    parser.add_argument("--passes", type=int, default=3, help="Durchgänge je Größe, Fälle reihum")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="gespeicherter Referenzstand (JSON)")
+    parser.add_argument("--threshold", type=float, default=0.25, help="erlaubte Verlangsamung der schnellsten Runde, 0.25 = 25 %%")
+    parser.add_argument("--min-delta-ms", type=float, default=0.05, help="kleinere absolute Abweichungen gelten nicht als Regression")
+    parser.add_argument("--update-baseline", action="store_true", help="Ergebnis als neuen Referenzstand speichern")
+    parser.add_argument("--out", help="Ergebnis zusätzlich als JSON-Datei schreiben")
+    parser.add_argument("--json", action="store_true", help="Ergebnis als JSON auf stdout statt Tabelle")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+    workdir = tempfile.mkdtemp(prefix="autostart-bench-")
+    results = {}
+    try:
+        for size in sizes:
+            results.update(run_size(size, args.churn, args.min_rounds, args.min_seconds, args.passes, workdir))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    report = {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "churn": args.churn,
+            "passes": args.passes
+        },
+        "results": results
+    }
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+
+    baseline = {}
+    if not args.update_baseline and os.path.exists(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    rows = compare_baseline(results, baseline, args.threshold, args.min_delta_ms)
+    regressions = [name for name, _, _, _, regressed in rows if regressed]
+    if args.json:
+        report["regressions"] = regressions
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"{'Fall':40s} {'Median':>11s} {'Bestwert':>11s} {'µs/Eintrag':>11s} {'Referenz':>11s} {'Faktor':>7s}")
+        for name, result, reference, ratio, regressed in rows:
+            line = f"{name:40s} {result['median_ms']:8.3f} ms {result['min_ms']:8.3f} ms {result['us_per_entry']:11.3f}"
+            if reference is not None:
+                line += f" {reference['min_ms']:8.3f} ms {ratio:6.2f}x" + ("  REGRESSION" if regressed else "")
+            print(line)
+        if args.update_baseline:
+            print(f"Referenzstand gespeichert: {args.baseline}")
+        elif not baseline:
+            print(f"Kein Referenzstand unter {args.baseline}, Vergleich übersprungen")
+        else:
+            print(f"{len(regressions)} Regression(en) über {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+# Misst die Unterdrückung von 10.000 Änderungen bei 0 bis 10.000 Regeln (gemischt: exakte
+# Schlüssel, Präfix-Globs, Regex/komplexe Globs, Wertmuster) und prüft das Neuladen der Datei.
+#   python benchmarks/bench_suppressions.py --events 10000 --complex 0.02
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from autostart_monitor import ChangeEvent, SuppressionRules, MODIFIED, ADDED
+
+def make_rules(count, complex_share, rng):
+    rules = []
+    for i in range(count):
+        roll = rng.random()
+        if roll < complex_share:
+            rule = {"key": f"re:Vendor{i}Agent(32|64)?", "source": "registry*"}
+        elif roll < 0.4:
+            rule = {"key": f"Updater{i}*", "source": "registry*", "value": "re:.*\\\\Updater\\d+\\\\[0-9.]+\\\\.*", "kinds": ["modified"]}
+        else:
+            rule = {"key": f"App{i}", "source": "registry_hklm_run"}
+        rules.append({"id": f"r{i}", **rule})
+    return rules
+
+def make_events(count, rule_count, rng):
+    events = []
+    for i in range(count):
+        n = rng.randrange(max(1, rule_count * 2))
+        roll = rng.random()
+        if roll < 0.3:
+            events.append(ChangeEvent("registry_hklm_run", ADDED, f"App{n}", new=f"C:\\Apps\\{n}.exe"))
+        elif roll < 0.6:
+            events.append(ChangeEvent("registry", MODIFIED, f"Updater{n}Task", f"C:\\Updater{n}\\1.{i}\\up.exe", f"C:\\Updater{n}\\1.{i + 1}\\up.exe"))
+        else:
+            events.append(ChangeEvent("registry", ADDED, f"Unknown{i}", new="C:\\Users\\Public\\x.exe"))
+    return events
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=10000)
+    parser.add_argument("--complex", type=float, default=0.02, help="Anteil Regex-Regeln")
+    args = parser.parse_args()
+    rng = random.Random(1)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "suppressions.json")
+        timings = {}
+        for count in (0, 100, 1000, 10000):
+            with open(path, "w", encoding="utf8") as f:
+                json.dump({"rules": make_rules(count, args.complex, rng)}, f)
+            rules = SuppressionRules(path)
+            started = time.perf_counter()
+            rules.refresh()
+            rules.matcher("registry")
+            rules.matcher("registry_hklm_run")
+            compile_time = time.perf_counter() - started
+            events = make_events(args.events, count, rng)
+            started = time.perf_counter()
+            kept = rules.filter(events)
+            elapsed = time.perf_counter() - started
+            timings[count] = elapsed / args.events
+            print(f"{count:6d} Regeln: laden+kompilieren {compile_time * 1000:7.1f} ms, "
+                  f"{elapsed / args.events * 1e6:5.2f} µs/Änderung, {len(events) - len(kept)} unterdrückt")
+
+        # Neuladen: gleiche Datei ersetzen, Zähler je ID bleiben erhalten
+        with open(path, "w", encoding="utf8") as f:
+            json.dump({"rules": [{"id": "r1", "source": "registry", "key": "Unknown*"}]}, f)
+        reloaded = rules.refresh()
+        kept = rules.filter([ChangeEvent("registry", ADDED, "Unknown1", new="x")])
+        ok = reloaded and not kept and rules.hits["r1"] >= 1
+        ok = ok and timings[10000] < max(timings[100], 1e-6) * 5
+        if not ok:
+            print("FEHLER: Neuladen oder Skalierung")
+        return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+# Legt Programmdateien samt Run-Einträgen an (mit Leerzeichen, Anführungszeichen und Argumenten),
+# misst das erste Hashen, einen unveränderten Durchlauf (nur stat) und erkennt eine in-place
+# ersetzte Datei als "modified_target".
+#   python benchmarks/bench_target_hashes.py --files 200 --size-mb 4
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from autostart_monitor import TargetHasher, compare_targets, render_events, resolve_registry_targets, MODIFIED_TARGET
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--size-mb", type=float, default=4)
+    parser.add_argument("--workers", type=int, default=2)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        folder = os.path.join(root, "Program Files", "Vendor")
+        os.makedirs(folder)
+        size = int(args.size_mb * 1024 * 1024)
+        entries = {}
+        for i in range(args.files):
+            path = os.path.join(folder, f"agent{i}.exe")
+            with open(path, "wb") as f:
+                f.write(os.urandom(size))
+            # Abwechselnd in Anführungszeichen, ungeschützt mit Leerzeichen und ohne .exe
+            if i % 3 == 0:
+                entries[f"Agent{i}"] = f'"{path}" --background'
+            elif i % 3 == 1:
+                entries[f"Agent{i}"] = f"{path} /minimized"
+            else:
+                entries[f"Agent{i}"] = path[:-4]
+
+        targets = resolve_registry_targets(entries)
+        unresolved = [name for name, path in targets.items() if not path or not os.path.isfile(path)]
+        hasher = TargetHasher(args.workers)
+
+        started = time.perf_counter()
+        first = hasher.hash_targets(targets)
+        cold = time.perf_counter() - started
+        started = time.perf_counter()
+        second = hasher.hash_targets(targets)
+        warm = time.perf_counter() - started
+        total_mb = args.files * size / (1024 * 1024)
+        print(f"Erstes Hashen: {cold * 1000:.0f} ms ({total_mb / cold:.0f} MB/s), unverändert: {warm * 1000:.1f} ms")
+
+        # Inhalt ersetzen, Eintrag bleibt gleich
+        with open(targets["Agent1"], "r+b") as f:
+            f.write(b"MZ-replaced")
+        hashed = hasher.hashed
+        third = hasher.hash_targets(targets)
+        events = compare_targets(second, third, "registry:targets")
+        print(render_events(events))
+        print(f"Neu gehasht: {hasher.hashed - hashed}")
+        hasher.shutdown()
+
+        failures = []
+        if unresolved:
+            failures.append(f"nicht aufgelöst: {unresolved[:3]}")
+        if len(first) != args.files or first != second:
+            failures.append("unveränderter Durchlauf weicht ab")
+        if [(event.kind, event.key) for event in events] != [(MODIFIED_TARGET, "Agent1")]:
+            failures.append("ersetzte Datei nicht erkannt")
+        for failure in failures:
+            print(f"FEHLER: {failure}")
+        return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
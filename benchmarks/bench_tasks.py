@@ -0,0 +1,91 @@
+# Legt einen Task-Ordner mit 500 Definitionen (UTF-16 wie unter Windows) in Unterordnern an und
+# misst den ersten Scan, einen unveränderten Folgescan und einen Scan nach Änderung einzelner Tasks.
+#   python benchmarks/bench_tasks.py --tasks 500 --changed 5
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from autostart_monitor import ScheduledTaskCache, check_scheduled_tasks, compare_tasks, render_events
+
+TASK_TEMPLATE = """<?xml version="1.0" encoding="UTF-16"?>
+<Task version="1.2" xmlns="http://schemas.microsoft.com/windows/2004/02/mit/task">
+  <RegistrationInfo>
+    <Author>Fixture</Author>
+    <URI>{uri}</URI>
+  </RegistrationInfo>
+  <Triggers>
+    <LogonTrigger>
+      <Enabled>true</Enabled>
+    </LogonTrigger>
+    <TimeTrigger>
+      <Repetition>
+        <Interval>PT{interval}M</Interval>
+      </Repetition>
+      <StartBoundary>2024-01-01T08:00:00</StartBoundary>
+    </TimeTrigger>
+  </Triggers>
+  <Settings>
+    <Enabled>{enabled}</Enabled>
+    <Hidden>false</Hidden>
+  </Settings>
+  <Actions Context="Author">
+    <Exec>
+      <Command>{command}</Command>
+      <Arguments>--task {index}</Arguments>
+    </Exec>
+  </Actions>
+</Task>
+"""
+
+def write_task(root, index, command=None, enabled=True, interval=15):
+    folder = os.path.join(root, "Vendor", f"Group{index % 20:02d}")
+    os.makedirs(folder, exist_ok=True)
+    path = os.path.join(folder, f"Task{index:04d}")
+    with open(path, "w", encoding="utf-16") as f:
+        f.write(TASK_TEMPLATE.format(
+            uri=f"\\Vendor\\Group{index % 20:02d}\\Task{index:04d}",
+            interval=interval,
+            enabled="true" if enabled else "false",
+            command=command or f"C:\\Program Files\\Vendor\\agent{index}.exe",
+            index=index
+        ))
+    return path
+
+def timed(label, cache, root):
+    parsed = cache.parsed
+    started = time.perf_counter()
+    tasks = check_scheduled_tasks(root, cache)
+    print(f"{label}: {(time.perf_counter() - started) * 1000:.1f} ms, {cache.parsed - parsed} geparst")
+    return tasks
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tasks", type=int, default=500)
+    parser.add_argument("--changed", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        for index in range(args.tasks):
+            write_task(root, index)
+        cache = ScheduledTaskCache()
+        first = timed("Erster Scan", cache, root)
+        timed("Unverändert", cache, root)
+
+        # mtime_ns kann bei schnellem Überschreiben gleich bleiben; die Größe ändert sich hier mit
+        for index in range(args.changed):
+            write_task(root, index, command=f"C:\\Users\\Public\\evil{index}.exe", enabled=index % 2 == 0, interval=5)
+        os.remove(os.path.join(root, "Vendor", "Group19", f"Task{args.tasks - 1:04d}"))
+        write_task(root, args.tasks)
+        second = timed(f"{args.changed} geändert, 1 entfernt, 1 neu", cache, root)
+
+        events = compare_tasks(first, second)
+        print(render_events(events[:4]))
+        print(f"{len(events)} Änderungen")
+        return 0 if len(events) == args.changed + 2 else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,54 @@
+# Stand-in für den PowerShell-Worker des CommandHost mit demselben Zeilenprotokoll:
+# je Zeile eine JSON-Anfrage {"id", "command", ...}, je Zeile eine JSON-Antwort.
+# Zusätzlich zu "ping" und "services" gibt es "sleep" und "crash" zum Testen von
+# Timeouts und Neustarts.
+#   "command_workers": {"powershell": ["python", "benchmarks/command_worker_stub.py", "--services", "300"]}
+import argparse
+import json
+import os
+import sys
+import time
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--services", type=int, default=200, help="Anzahl erzeugter Dienste")
+    parser.add_argument("--fixture", help="JSON-Datei {Name: Status}, wird bei jeder Anfrage neu gelesen")
+    args = parser.parse_args()
+
+    def services(request):
+        if args.fixture:
+            with open(args.fixture, "r", encoding="utf8") as f:
+                return json.load(f)
+        return {f"Service{i:05d}": "Running" if i % 3 else "Stopped" for i in range(args.services)}
+
+    def sleep(request):
+        time.sleep(float(request.get("seconds", 1)))
+        return "slept"
+
+    def crash(request):
+        os._exit(3)
+
+    commands = {
+        "ping": lambda request: "pong",
+        "services": services,
+        "sleep": sleep,
+        "crash": crash,
+        "pid": lambda request: os.getpid()
+    }
+
+    for line in sys.stdin:
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get("id")
+            handler = commands.get(request.get("command"))
+            if handler is None:
+                raise ValueError(f"unbekannter Befehl: {request.get('command')}")
+            response = {"id": request_id, "ok": True, "result": handler(request)}
+        except Exception as e:
+            response = {"id": request_id, "ok": False, "error": str(e)}
+        sys.stdout.write(json.dumps(response, separators=(",", ":")) + "\n")
+        sys.stdout.flush()
+
+if __name__ == "__main__":
+    main()
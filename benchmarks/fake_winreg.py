@@ -0,0 +1,173 @@
+# In-Memory-Nachbildung der genutzten winreg-Schnittstelle für Benchmarks unter Linux.
+# Zählt die Aufrufe je Funktion, damit Handle-Öffnungen vergleichbar werden.
+import collections
+import itertools
+
+HKEY_CLASSES_ROOT = 0x80000000
+HKEY_CURRENT_USER = 0x80000001
+HKEY_LOCAL_MACHINE = 0x80000002
+HKEY_USERS = 0x80000003
+
+REG_SZ = 1
+REG_EXPAND_SZ = 2
+REG_BINARY = 3
+REG_DWORD = 4
+REG_MULTI_SZ = 7
+
+KEY_READ = 0x20019
+
+class FakeKey:
+    def __init__(self, stamp):
+        self.subkeys = {}
+        self.values = {}
+        self.last_write = stamp
+        self.order = None
+        self.deleted = False
+
+    # Aufzählungsreihenfolge wie bei winreg stabil halten, ohne je Index O(n) zu zahlen
+    def ordered(self):
+        if self.order is None:
+            self.order = ([child.name for child in self.subkeys.values()], list(self.values.items()))
+        return self.order
+
+class FakeHandle:
+    def __init__(self, registry, node):
+        self.registry = registry
+        self.node = node
+        self.closed = False
+
+    def Close(self):
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.Close()
+        return False
+
+class FakeRegistry:
+    HKEY_CLASSES_ROOT = HKEY_CLASSES_ROOT
+    HKEY_CURRENT_USER = HKEY_CURRENT_USER
+    HKEY_LOCAL_MACHINE = HKEY_LOCAL_MACHINE
+    HKEY_USERS = HKEY_USERS
+    REG_SZ = REG_SZ
+    REG_EXPAND_SZ = REG_EXPAND_SZ
+    REG_BINARY = REG_BINARY
+    REG_DWORD = REG_DWORD
+    REG_MULTI_SZ = REG_MULTI_SZ
+    KEY_READ = KEY_READ
+
+    def __init__(self):
+        # Zeitstempel als FILETIME-ähnlicher Zähler, streng monoton steigend
+        self.clock = itertools.count(132000000000000000, 10000)
+        self.roots = {hive: FakeKey(next(self.clock)) for hive in (
+            HKEY_CLASSES_ROOT, HKEY_CURRENT_USER, HKEY_LOCAL_MACHINE, HKEY_USERS
+        )}
+        self.calls = collections.Counter()
+
+    # --- Aufbau und Änderung ---
+
+    def _walk(self, hive, path, create=False):
+        node = self.roots[hive]
+        for part in filter(None, path.split("\\")):
+            child = node.subkeys.get(part.lower())
+            if child is None:
+                if not create:
+                    raise FileNotFoundError(2, "Das System kann die angegebene Datei nicht finden", path)
+                child = node.subkeys[part.lower()] = FakeKey(next(self.clock))
+                child.name = part
+                node.last_write = next(self.clock)
+                node.order = None
+            node = child
+        return node
+
+    def create_key(self, hive, path):
+        return self._walk(hive, path, create=True)
+
+    def set_value(self, hive, path, name, value, value_type=REG_SZ):
+        node = self._walk(hive, path, create=True)
+        node.values[name] = (value, value_type)
+        node.last_write = next(self.clock)
+        node.order = None
+
+    def delete_value(self, hive, path, name):
+        node = self._walk(hive, path)
+        del node.values[name]
+        node.last_write = next(self.clock)
+        node.order = None
+
+    def delete_key(self, hive, path):
+        parent_path, _, name = path.rpartition("\\")
+        parent = self._walk(hive, parent_path)
+        # Offene Handles auf gelöschte Schlüssel liefern wie unter Windows ERROR_KEY_DELETED
+        pending = [parent.subkeys.pop(name.lower())]
+        while pending:
+            node = pending.pop()
+            node.deleted = True
+            pending.extend(node.subkeys.values())
+        parent.last_write = next(self.clock)
+        parent.order = None
+
+    # --- winreg-kompatible Funktionen ---
+
+    def _node(self, key):
+        if isinstance(key, FakeHandle):
+            if key.closed:
+                raise OSError(6, "Das Handle ist ungültig")
+            if key.node.deleted:
+                raise OSError(1018, "Unzulässiger Vorgang für einen zum Löschen markierten Schlüssel")
+            return key.node
+        return self.roots[key]
+
+    def OpenKey(self, key, sub_key, reserved=0, access=KEY_READ):
+        self.calls["OpenKey"] += 1
+        node = self._node(key)
+        for part in filter(None, (sub_key or "").split("\\")):
+            # Durchlaufene Pfadkomponenten: Maß für Traversierungen ab der Hive-Wurzel
+            self.calls["OpenKey-Komponenten"] += 1
+            child = node.subkeys.get(part.lower())
+            if child is None:
+                raise FileNotFoundError(2, "Das System kann die angegebene Datei nicht finden", sub_key)
+            node = child
+        return FakeHandle(self, node)
+
+    OpenKeyEx = OpenKey
+
+    def CloseKey(self, key):
+        if isinstance(key, FakeHandle):
+            key.Close()
+
+    def EnumKey(self, key, index):
+        self.calls["EnumKey"] += 1
+        subkeys = self._node(key).ordered()[0]
+        if index >= len(subkeys):
+            raise OSError(259, "Es sind keine weiteren Daten verfügbar")
+        return subkeys[index]
+
+    def EnumValue(self, key, index):
+        self.calls["EnumValue"] += 1
+        values = self._node(key).ordered()[1]
+        if index >= len(values):
+            raise OSError(259, "Es sind keine weiteren Daten verfügbar")
+        name, (value, value_type) = values[index]
+        return name, value, value_type
+
+    def QueryValueEx(self, key, name):
+        self.calls["QueryValueEx"] += 1
+        values = self._node(key).values
+        if (name or "") not in values:
+            raise FileNotFoundError(2, "Das System kann die angegebene Datei nicht finden", name)
+        return values[name or ""]
+
+    def QueryInfoKey(self, key):
+        self.calls["QueryInfoKey"] += 1
+        node = self._node(key)
+        return len(node.subkeys), len(node.values), node.last_write
+
+def build_services(registry, count, path=r"SYSTEM\CurrentControlSet\Services"):
+    for i in range(count):
+        service_path = f"{path}\\Service{i:05d}"
+        registry.set_value(HKEY_LOCAL_MACHINE, service_path, "Start", i % 5, REG_DWORD)
+        registry.set_value(HKEY_LOCAL_MACHINE, service_path, "ImagePath", f"C:\\Windows\\System32\\svc{i:05d}.exe", REG_EXPAND_SZ)
+    return registry
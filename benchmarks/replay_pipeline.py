@@ -0,0 +1,212 @@
+# Spielt aufgezeichnete (record_file) oder synthetisch erzeugte Zeitreihen so schnell wie möglich
+# durch MonitorEngine.run: Collectors -> Fingerabdruck -> Vergleich/Unterdrückung -> Benachrichtigung.
+# Ausgabe: Zyklen/s, Perzentile je Stufe, Zustelllatenz der Benachrichtigungen und Spitzen-RSS.
+#   python benchmarks/replay_pipeline.py --entries 100000 --cycles 30 --churn 0.001
+#   python benchmarks/replay_pipeline.py --entries 10000 --save timeline.jsonl.gz
+#   python benchmarks/replay_pipeline.py --recording timeline.jsonl.gz
+import argparse
+import collections
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import autostart_monitor
+from autostart_monitor import MonitorEngine, NotificationDispatcher, SnapshotRecorder, read_recording, render_events, current_rss
+
+SYNTHETIC_SOURCES = ("registry", "services", "startup_folders", "tasks")
+
+# Erzeugt Einträge in der Form der echten Collectors
+def synthetic_entry(source, index, version=0):
+    if source == "services":
+        return f"Svc{index:06d}", (2, 3, 4)[(index + version) % 3]
+    if source == "tasks":
+        return f"\\Vendor{index % 50}\\Task{index:06d}", {
+            "enabled": (index + version) % 7 != 0,
+            "actions": (f"Exec(Command=C:\\Program Files\\Vendor{index % 50}\\v{version}\\task.exe)",),
+            "triggers": ("LogonTrigger(Enabled=true)",)
+        }
+    return f"App{index:06d}", f"\"C:\\Program Files\\Vendor{index % 500}\\App{index}\\v{version}\\app.exe\" --background"
+
+def synthetic_timeline(sources, entries, cycles, churn, mix, seed=1):
+    rng = random.Random(seed)
+    add_share, remove_share = mix[0] / sum(mix), (mix[0] + mix[1]) / sum(mix)
+    entries_by_source = {}
+    for source in sources:
+        if source == "startup_folders":
+            entries_by_source[source] = {f"tool{i:06d}.lnk" for i in range(entries)}
+        else:
+            entries_by_source[source] = dict(synthetic_entry(source, i) for i in range(entries))
+    next_index = entries
+    for cycle in range(cycles):
+        state = {}
+        for source in sources:
+            current = entries_by_source[source]
+            # Die Collectors liefern in jedem Zyklus neue Objekte
+            current = set(current) if isinstance(current, set) else dict(current)
+            if cycle:
+                for _ in range(max(1, int(len(current) * churn)) if churn else 0):
+                    roll = rng.random()
+                    if roll < add_share or not current:
+                        if isinstance(current, set):
+                            current.add(f"tool{next_index:06d}.lnk")
+                        else:
+                            key, value = synthetic_entry(source, next_index)
+                            current[key] = value
+                        next_index += 1
+                    elif isinstance(current, set):
+                        current.discard(rng.choice(tuple(current)) if len(current) < 1000 else current.pop())
+                    elif roll < remove_share:
+                        current.pop(next(iter(current)))
+                    else:
+                        key = rng.choice(list(current)) if len(current) < 1000 else next(iter(current))
+                        index = int("".join(char for char in key if char.isdigit())[-6:])
+                        current[key] = synthetic_entry(source, index, cycle)[1]
+            entries_by_source[source] = current
+            state[source] = {"user": current, "common": set()} if source == "startup_folders" else current
+        yield time.time(), list(sources), state
+
+# Ersatz für ScanScheduler: jeder next_due() schaltet die Zeitreihe einen Zyklus weiter
+class ReplayScheduler:
+    def __init__(self, frames, names):
+        self.frames = iter(frames)
+        self.intervals = {name: 1 for name in names}
+        self.lag = 0.0
+        self.current = {}
+        self.done = False
+        self.cycles = 0
+        self.advance()
+
+    def advance(self):
+        try:
+            ts, due, state = next(self.frames)
+        except StopIteration:
+            self.done = True
+            return []
+        self.current = state
+        self.cycles += 1
+        return [name for name in due if name in self.intervals]
+
+    def stopped(self):
+        return self.done
+
+    def next_due(self):
+        return [] if self.done else self.advance()
+
+    def complete(self, names):
+        pass
+
+# Merkt sich den Zeitpunkt der ersten Übergabe je Stapel für die Zustelllatenz
+class ReplayDispatcher(NotificationDispatcher):
+    def __init__(self, sinks):
+        super().__init__(sinks, quiet_window=0, max_delay=0, max_per_minute=0, max_pending=10 ** 9)
+        self.submitted = collections.deque()
+
+    def submit(self, events):
+        self.submitted.append(time.perf_counter())
+        super().submit(events)
+
+def percentiles(values):
+    ordered = sorted(values)
+    if not ordered:
+        return {}
+    return {name: ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] for name, fraction in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99))} | {"max": ordered[-1]}
+
+def peak_rss():
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak * 1024 if sys.platform != "darwin" else peak
+    except ImportError:
+        return current_rss()
+
+def replay(frames, names, settings_overrides=None):
+    scheduler = ReplayScheduler(frames, names)
+    for name in names:
+        autostart_monitor.COLLECTORS[name] = lambda name=name: scheduler.current[name]
+    settings = {
+        "selected_methods": {name: name in names for name in autostart_monitor.COLLECTORS},
+        "persist_snapshot": False, "history_enabled": False, "event_driven": False, "hash_targets": False,
+        "metrics_file": "", "record_file": "", "suppressions_file": os.path.join(tempfile.gettempdir(), "replay-suppressions.json"),
+        **(settings_overrides or {})
+    }
+    engine = MonitorEngine(settings)
+    engine.metrics.samples = collections.defaultdict(list)
+    delivered = collections.Counter()
+    delivery = []
+
+    def sink(events):
+        render_events(events)
+        delivered["events"] += len(events)
+        delivered["batches"] += 1
+        now = time.perf_counter()
+        while dispatcher.submitted:
+            delivery.append(now - dispatcher.submitted.popleft())
+
+    dispatcher = ReplayDispatcher([sink]).start()
+    started = time.perf_counter()
+    engine.run(scheduler, dispatcher)
+    dispatcher.stop(timeout=60)
+    elapsed = time.perf_counter() - started
+    samples = dict(engine.metrics.samples)
+    samples["delivery"] = delivery
+    return {
+        "cycles": scheduler.cycles,
+        "seconds": elapsed,
+        "cycles_per_second": scheduler.cycles / elapsed,
+        "events": sum(engine.metrics.events.values()),
+        "delivered": delivered["events"],
+        "stages_ms": {stage: {key: value * 1000 for key, value in percentiles(values).items()} for stage, values in samples.items()},
+        "peak_rss_mb": (peak_rss() or 0) / (1024 * 1024)
+    }
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--recording", help="aufgezeichnete Datei (record_file) abspielen")
+    parser.add_argument("--sources", default=",".join(SYNTHETIC_SOURCES))
+    parser.add_argument("--entries", type=int, default=10000, help="Einträge je Quelle")
+    parser.add_argument("--cycles", type=int, default=30)
+    parser.add_argument("--churn", type=float, default=0.001, help="Anteil geänderter Einträge je Quelle und Zyklus")
+    parser.add_argument("--mix", default="1:1:2", help="Verhältnis hinzufügen:entfernen:ändern")
+    parser.add_argument("--save", help="synthetische Zeitreihe als Aufzeichnung speichern statt abzuspielen")
+    parser.add_argument("--json", action="store_true", help="Ergebnis als JSON ausgeben")
+    args = parser.parse_args()
+
+    sources = [name for name in args.sources.split(",") if name]
+    mix = [float(part) for part in args.mix.split(":")]
+    if args.recording:
+        frames = read_recording(args.recording)
+        first = next(read_recording(args.recording), None)
+        names = sorted(first[2]) if first else []
+        names = [name for name in names if name in autostart_monitor.COMPARATORS]
+    else:
+        frames = synthetic_timeline(sources, args.entries, args.cycles, args.churn, mix)
+        names = sources
+
+    if args.save:
+        recorder = SnapshotRecorder(args.save)
+        previous = {}
+        for ts, due, state in frames:
+            # Wie der Engine-Recorder: nur geänderte Quellen
+            recorder.record(due, {name: data for name, data in state.items() if previous.get(name) is not data}, ts)
+            previous = dict(state)
+        recorder.close()
+        print(f"Aufzeichnung gespeichert: {args.save} ({os.path.getsize(args.save) / 1024:.0f} KiB)")
+        return 0
+
+    result = replay(frames, names)
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print(f"{result['cycles']} Zyklen in {result['seconds']:.2f} s: {result['cycles_per_second']:.1f} Zyklen/s, "
+              f"{result['events']} Änderungen, {result['delivered']} zugestellt, Spitzen-RSS {result['peak_rss_mb']:.0f} MB")
+        for stage, values in result["stages_ms"].items():
+            print(f"  {stage:9s} " + "  ".join(f"{key} {value:8.2f} ms" for key, value in values.items()))
+    return 0 if result["events"] == result["delivered"] else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+# Schickt 10.000 Änderungen aus mehreren Threads durch die EventBridge und prüft,
+# dass der Empfänger (wie der Qt-Thread) alle in Stapeln und in Reihenfolge erhält.
+# Mit --via-dispatcher laufen die Änderungen wie in der GUI über den NotificationDispatcher
+# (dialog_sink als direct_sink), dessen Rückstau-Grenze dabei bewusst klein ist.
+#   python benchmarks/stress_event_bridge.py --events 10000 --producers 4
+#   python benchmarks/stress_event_bridge.py --events 100000 --via-dispatcher --max-pending 1000
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import autostart_monitor
+from autostart_monitor import ChangeEvent, EventBridge, NotificationDispatcher, ADDED
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=10000)
+    parser.add_argument("--producers", type=int, default=4)
+    parser.add_argument("--burst", type=int, default=40, help="Änderungen pro push()")
+    parser.add_argument("--batch", type=int, default=500, help="Änderungen pro drain() (GUI_EVENT_BATCH)")
+    parser.add_argument("--via-dispatcher", action="store_true", help="über NotificationDispatcher.submit zustellen")
+    parser.add_argument("--max-pending", type=int, default=1000, help="Rückstau-Grenze des Dispatchers")
+    args = parser.parse_args()
+
+    wakeups = threading.Semaphore(0)
+    bridge = EventBridge(notify=wakeups.release)
+    dispatcher = None
+    push = bridge.push
+    if args.via_dispatcher:
+        # Gedrosselte Senke daneben, deren Warteschlange überläuft
+        dispatcher = NotificationDispatcher(
+            [lambda events: None], quiet_window=0.5, max_delay=5, max_pending=args.max_pending, direct_sinks=[bridge.push]
+        ).start()
+        push = dispatcher.submit
+    received = []
+    batches = []
+    per_producer = args.events // args.producers
+    done = threading.Event()
+
+    def produce(index):
+        for start in range(0, per_producer, args.burst):
+            push([
+                ChangeEvent("registry", ADDED, f"p{index}", new=i)
+                for i in range(start, min(start + args.burst, per_producer))
+            ])
+
+    # Nachbildung von drain_events: ein Signal weckt, dann Stapel bis die Warteschlange leer ist
+    def consume():
+        while not (done.is_set() and len(bridge) == 0):
+            if not wakeups.acquire(timeout=0.1):
+                continue
+            more = True
+            while more:
+                started = time.perf_counter()
+                batch, more = bridge.drain(args.batch)
+                autostart_monitor.render_events(batch)
+                received.extend(batch)
+                batches.append((len(batch), time.perf_counter() - started))
+
+    consumer = threading.Thread(target=consume)
+    consumer.start()
+    started = time.perf_counter()
+    producers = [threading.Thread(target=produce, args=(i,)) for i in range(args.producers)]
+    for thread in producers:
+        thread.start()
+    for thread in producers:
+        thread.join()
+    done.set()
+    consumer.join()
+    elapsed = time.perf_counter() - started
+    if dispatcher is not None:
+        dispatcher.stop()
+        print(f"Dispatcher: {dispatcher.dropped_total} Änderungen im gedrosselten Pfad verworfen")
+
+    expected = per_producer * args.producers
+    ordered = all(
+        [event.new for event in received if event.key == f"p{i}"] == list(range(per_producer))
+        for i in range(args.producers)
+    )
+    slowest = max(duration for _, duration in batches) * 1000
+    print(f"{len(received)}/{expected} Änderungen in {len(batches)} Stapeln, {elapsed * 1000:.0f} ms gesamt")
+    print(f"größter Stapel {max(size for size, _ in batches)}, langsamster Stapel {slowest:.1f} ms, Reihenfolge {'ok' if ordered else 'FEHLER'}")
+    if len(received) != expected or not ordered:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# Prüft, dass eine Änderungsbenachrichtigung während eines laufenden Scans nicht verloren geht:
+# Der FakeNotifier feuert mitten im Collect, danach muss die Quelle sofort erneut gescannt werden
+# statt erst nach dem (Rückfall-)Intervall.
+#   python benchmarks/stress_scheduler_trigger.py --rounds 20
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from autostart_monitor import FakeNotifier, ScanScheduler, register_watches, watch_notifications
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--interval", type=float, default=300, help="Polling-Intervall der Quelle")
+    parser.add_argument("--timeout", type=float, default=2.0, help="erlaubte Zeit bis zum erneuten Scan")
+    args = parser.parse_args()
+
+    notifier = FakeNotifier()
+    scheduler = ScanScheduler({"startup_folders": args.interval, "services": args.interval})
+    watched = register_watches(notifier, ["startup_folders"], {"startup_folders": [("dir", "startup")]})
+    threading.Thread(target=watch_notifications, args=(notifier, scheduler, watched), daemon=True).start()
+
+    failures = 0
+    delays = []
+    # Erster Scan per Benachrichtigung außerhalb eines Scans
+    notifier.fire("dir", "startup")
+    for _ in range(args.rounds):
+        due = scheduler.next_due()
+        if due != ["startup_folders"]:
+            print(f"Unerwartet fällig: {due}")
+            return 1
+        # "Collect": der Rest eines Schreib-Bursts trifft während des Scans ein
+        notifier.fire("dir", "startup")
+        time.sleep(0.05)
+        fired_at = time.monotonic()
+        scheduler.complete(due)
+
+        rescanned = threading.Event()
+        waiter = threading.Thread(target=lambda: rescanned.set() if scheduler.next_due() == ["startup_folders"] else None, daemon=True)
+        waiter.start()
+        waiter.join(args.timeout)
+        if not rescanned.is_set():
+            failures += 1
+            print("Benachrichtigung während des Scans verloren")
+            break
+        delays.append(time.monotonic() - fired_at)
+        # Der erneute Scan findet keine weitere Änderung vor
+        scheduler.complete(["startup_folders"])
+        notifier.fire("dir", "startup")
+    scheduler.stop()
+
+    if delays:
+        print(f"{len(delays)} Runden, erneuter Scan nach max. {max(delays) * 1000:.1f} ms")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,352 @@
+import os
+import sys
+import json
+import time
+import heapq
+import socket
+import hashlib
+import argparse
+import threading
+import socketserver
+
+from autostart_monitor import (
+    FLEET_LOG, FLEET_HELLO, FLEET_WELCOME, FLEET_BATCH, FLEET_ACK, FLEET_PROTOCOL_VERSION, REMOVED,
+    read_fleet_frame, write_fleet_frame, decode_fleet_event, render_events, value_fingerprint, _encode_snapshot_value
+)
+
+# Stand der Übertragung je Agent; acked ist die höchste verarbeitete Sequenznummer
+class FleetHostState:
+    __slots__ = ("host", "spool", "acked", "lock", "sessions", "last_seen")
+
+    def __init__(self, host, spool):
+        self.host = host
+        self.spool = spool
+        self.acked = 0
+        self.lock = threading.Lock()
+        self.sessions = 0
+        self.last_seen = None
+
+# Zentrale Gegenstelle für FleetAgent. Für Tests lokal lauffähig; empfangene Einträge
+# gehen an handler(host, seq, kind, payload). Doppelt gesendete Sequenznummern (nach
+# einem Abbruch vor dem ACK) werden verworfen.
+class FleetCollector:
+    def __init__(self, handler=None):
+        self.handler = handler
+        self.hosts = {}
+        self.lock = threading.Lock()
+        self.rows = 0
+        self.events = 0
+        self.duplicates = 0
+        self.servers = []
+        self.connections = set()
+
+    def host_state(self, host, spool):
+        with self.lock:
+            state = self.hosts.get(host)
+            if state is None or state.spool != spool:
+                # Neuer Spool auf dem Agent: Sequenznummern beginnen wieder bei 1
+                if state is not None:
+                    FLEET_LOG.info(f"Fleet: {host} mit neuem Spool, Sequenzen zurückgesetzt")
+                state = self.hosts[host] = FleetHostState(host, spool)
+            return state
+
+    def serve_connection(self, sock):
+        kind, hello = read_fleet_frame(sock)
+        if kind != FLEET_HELLO or hello.get("version") != FLEET_PROTOCOL_VERSION:
+            raise ValueError(f"Ungültiges HELLO: {kind}")
+        state = self.host_state(hello["host"], hello["spool"])
+        with state.lock:
+            state.sessions += 1
+            acked = state.acked
+        write_fleet_frame(sock, FLEET_WELCOME, {"acked": acked})
+        while True:
+            kind, batch = read_fleet_frame(sock)
+            if kind != FLEET_BATCH:
+                raise ValueError(f"Unerwarteter Rahmen {kind}")
+            rows = events = duplicates = 0
+            with state.lock:
+                for seq, item_kind, payload in batch["items"]:
+                    if seq <= state.acked:
+                        duplicates += 1
+                        continue
+                    if self.handler is not None:
+                        self.handler(state.host, seq, item_kind, payload)
+                    state.acked = seq
+                    rows += 1
+                    if item_kind == "events":
+                        events += len(payload["events"])
+                state.last_seen = time.time()
+                acked = state.acked
+            with self.lock:
+                self.rows += rows
+                self.events += events
+                self.duplicates += duplicates
+            write_fleet_frame(sock, FLEET_ACK, {"seq": acked})
+
+    def listen(self, address):
+        collector = self
+
+        class Handler(socketserver.BaseRequestHandler):
+            def handle(self):
+                with collector.lock:
+                    collector.connections.add(self.request)
+                try:
+                    collector.serve_connection(self.request)
+                except (OSError, ValueError) as e:
+                    FLEET_LOG.debug(f"Fleet-Verbindung beendet: {e}")
+                finally:
+                    with collector.lock:
+                        collector.connections.discard(self.request)
+
+        if address.startswith("unix:"):
+            path = address[5:]
+            if os.path.exists(path):
+                os.unlink(path)
+            server = socketserver.ThreadingUnixStreamServer(path, Handler)
+        else:
+            host, _, port = address.rpartition(":")
+            socketserver.ThreadingTCPServer.allow_reuse_address = True
+            server = socketserver.ThreadingTCPServer((host or "127.0.0.1", int(port)), Handler)
+            server.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        server.daemon_threads = True
+        server.request_queue_size = 1024
+        threading.Thread(target=server.serve_forever, name="fleet-collector", daemon=True).start()
+        self.servers.append(server)
+        return server
+
+    # Beendet auch bestehende Verbindungen; die Agents verbinden sich neu und setzen fort
+    def close(self):
+        for server in self.servers:
+            server.shutdown()
+            server.server_close()
+        self.servers = []
+        with self.lock:
+            connections = list(self.connections)
+        for sock in connections:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def stats(self):
+        with self.lock:
+            hosts = len(self.hosts)
+        return {"hosts": hosts, "rows": self.rows, "events": self.events, "duplicates": self.duplicates}
+
+# Inhaltsadresse einer Änderung: gleiche Quelle, Art, Schlüssel und Wert ergeben auf allen
+# Hosts denselben Fingerabdruck. Werte kommen bereits im Snapshot-Format (JSON) an.
+def change_fingerprint(source, kind, key, value_fp):
+    return hashlib.blake2b(f"{source}\0{kind}\0{key.lower()}\0".encode("utf-8") + value_fp, digest_size=12).hexdigest()
+
+# Gleiche Änderungen mehrerer Hosts; hosts enthält interne Host-Nummern
+class Incident:
+    __slots__ = ("id", "source", "kind", "key", "value", "first_seen", "last_seen", "hosts")
+
+    def __init__(self, incident_id, source, kind, key, value, ts):
+        self.id = incident_id
+        self.source = source
+        self.kind = kind
+        self.key = key
+        self.value = value
+        self.first_seen = ts
+        self.last_seen = ts
+        self.hosts = set()
+
+    @property
+    def host_count(self):
+        return len(self.hosts)
+
+# Fasst die Meldungen aller Agents zusammen:
+# - incidents: Fingerabdruck -> Incident mit Menge der betroffenen Hosts
+# - values: (Quelle, Schlüssel) -> Wert-Fingerabdruck -> Hosts, die den Wert aktuell haben; gespeist aus
+#   den Änderungen und den vollständigen Einträgen, die Agents mit vollständigen Digest-Meldungen schicken
+# - digests: (Quelle, Fingerabdruck) -> Hosts mit identischem Stand der Quelle
+# Alle Abfragen sind Dict-Zugriffe; der Aufwand hängt nur von der Größe der Antwort ab.
+class FleetAggregator:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.host_ids = {}
+        self.host_names = []
+        self.incidents = {}
+        self.values = {}
+        self.host_values = {}
+        self.interned = {}
+        self.digests = {}
+        self.host_digests = {}
+        self.ingested = 0
+
+    def _host(self, host):
+        host_id = self.host_ids.get(host)
+        if host_id is None:
+            host_id = self.host_ids[host] = len(self.host_names)
+            self.host_names.append(host)
+            self.host_digests[host_id] = {}
+        return host_id
+
+    def handle(self, host, seq, kind, payload):
+        if kind == "events":
+            self.ingest_events(host, payload["events"], payload.get("ts"))
+        elif kind == "digests":
+            self.ingest_digests(host, payload["digests"], payload.get("full", False), payload.get("entries"))
+
+    def ingest_events(self, host, events, ts=None):
+        ts = time.time() if ts is None else ts
+        with self.lock:
+            host_id = self._host(host)
+            for source, kind, key, old, new in events:
+                value = old if kind == REMOVED else new
+                value_fp = value_fingerprint(value)
+                incident_id = change_fingerprint(source, kind, key, value_fp)
+                incident = self.incidents.get(incident_id)
+                if incident is None:
+                    incident = self.incidents[incident_id] = Incident(incident_id, source, kind, key, value, ts)
+                incident.hosts.add(host_id)
+                if ts > incident.last_seen:
+                    incident.last_seen = ts
+                self._update_value(host_id, source, key.lower(), None if kind == REMOVED else value_fp)
+            self.ingested += len(events)
+
+    def _update_value(self, host_id, source, key, value_fp):
+        index_key = (source, key)
+        postings = self.values.get(index_key)
+        if postings is None:
+            postings = self.values[index_key] = {}
+        current = self.host_values.get((host_id, source))
+        if current is None:
+            current = self.host_values[host_id, source] = {}
+        # Bisherigen Wert des Hosts austragen, damit jeder Host je Schlüssel nur einmal vorkommt
+        previous = current.pop(key, None)
+        if previous is not None:
+            hosts = postings.get(previous)
+            if hosts is not None:
+                hosts.discard(host_id)
+                if not hosts:
+                    del postings[previous]
+        if value_fp is not None:
+            postings.setdefault(value_fp, set()).add(host_id)
+            current[key] = value_fp
+        elif not postings:
+            del self.values[index_key]
+
+    # Vollständige Einträge einer Quelle ersetzen den bisherigen Stand des Hosts; Schlüssel und
+    # Fingerabdrücke werden über alle Hosts geteilt
+    def _replace_values(self, host_id, source, entries):
+        intern = self.interned.setdefault
+        current = self.host_values.get((host_id, source), {})
+        fresh = {}
+        for key, value_hex in entries.items():
+            key = key.lower()
+            value_fp = bytes.fromhex(value_hex)
+            fresh[intern(key, key)] = intern(value_fp, value_fp)
+        for key in [key for key in current if key not in fresh]:
+            self._update_value(host_id, source, key, None)
+        for key, value_fp in fresh.items():
+            if current.get(key) != value_fp:
+                self._update_value(host_id, source, key, value_fp)
+
+    def ingest_digests(self, host, digests, full=False, entries=None):
+        with self.lock:
+            host_id = self._host(host)
+            current = self.host_digests[host_id]
+            # Vollständige Meldung: nicht mehr gemeldete Quellen samt ihren Werten austragen
+            stale = [source for source in current if source not in digests] if full else []
+            for source in stale:
+                self._move_digest(host_id, source, current.pop(source), None)
+                self._replace_values(host_id, source, {})
+            for source, digest in digests.items():
+                previous = current.get(source)
+                if previous != digest:
+                    current[source] = digest
+                    self._move_digest(host_id, source, previous, digest)
+            for source, source_entries in (entries or {}).items():
+                self._replace_values(host_id, source, source_entries)
+
+    def _move_digest(self, host_id, source, previous, digest):
+        if previous is not None:
+            hosts = self.digests.get((source, previous))
+            if hosts is not None:
+                hosts.discard(host_id)
+                if not hosts:
+                    del self.digests[source, previous]
+        if digest is not None:
+            self.digests.setdefault((source, digest), set()).add(host_id)
+
+    def _names(self, host_ids):
+        return sorted(self.host_names[host_id] for host_id in host_ids)
+
+    # "Welche Hosts haben den Run-Wert X": mit value nur Hosts mit genau diesem Wert
+    def hosts_with(self, source, key, value=None):
+        with self.lock:
+            postings = self.values.get((source, key.lower()), {})
+            if value is None:
+                return self._names(set().union(*postings.values()))
+            return self._names(postings.get(value_fingerprint(_encode_snapshot_value(value)), ()))
+
+    def hosts_with_digest(self, source, digest):
+        with self.lock:
+            return self._names(self.digests.get((source, digest), ()))
+
+    def top_incidents(self, limit=10, min_hosts=1):
+        with self.lock:
+            candidates = (incident for incident in self.incidents.values() if len(incident.hosts) >= min_hosts)
+            return heapq.nlargest(limit, candidates, key=lambda incident: (len(incident.hosts), incident.last_seen))
+
+    def incident_hosts(self, incident_id):
+        with self.lock:
+            incident = self.incidents.get(incident_id)
+            return self._names(incident.hosts) if incident is not None else []
+
+    def stats(self):
+        with self.lock:
+            return {"hosts": len(self.host_names), "incidents": len(self.incidents), "ingested": self.ingested}
+
+# Einfacher Handler für den lokalen Betrieb: Änderungen als JSON-Zeilen und/oder auf stdout
+def jsonl_handler(path=None, echo=True):
+    lock = threading.Lock()
+    output = open(path, "a", encoding="utf8") if path else None
+
+    def handle(host, seq, kind, payload):
+        if kind != "events":
+            return
+        if echo:
+            print(f"[{host}] " + render_events([decode_fleet_event(item) for item in payload["events"]]))
+        if output is not None:
+            with lock:
+                output.write(json.dumps({"host": host, "seq": seq, **payload}, ensure_ascii=False) + "\n")
+                output.flush()
+
+    return handle
+
+def main():
+    parser = argparse.ArgumentParser(description="Fleet-Collector für Autostart Monitor")
+    parser.add_argument("--listen", default="127.0.0.1:7070", help="host:port oder unix:<pfad>")
+    parser.add_argument("--out", help="empfangene Änderungen als JSON-Zeilen anhängen")
+    parser.add_argument("--quiet", action="store_true", help="Änderungen nicht auf stdout ausgeben")
+    parser.add_argument("--stats-interval", type=float, default=10)
+    parser.add_argument("--top", type=int, default=5, help="Anzahl der größten Incidents in der Statistik")
+    args = parser.parse_args()
+
+    aggregator = FleetAggregator()
+    output = jsonl_handler(args.out, echo=not args.quiet)
+
+    def handle(host, seq, kind, payload):
+        aggregator.handle(host, seq, kind, payload)
+        output(host, seq, kind, payload)
+
+    collector = FleetCollector(handle)
+    collector.listen(args.listen)
+    print(f"Fleet-Collector wartet auf {args.listen}")
+    try:
+        while True:
+            time.sleep(args.stats_interval)
+            print(json.dumps({**collector.stats(), **aggregator.stats()}))
+            # Änderungen, die auf mehreren Hosts gleich auftreten, als ein Incident
+            for incident in aggregator.top_incidents(args.top, min_hosts=2):
+                print(f"  {incident.host_count:6d} Hosts  {incident.id}  {incident.source} {incident.kind} {incident.key}")
+    except KeyboardInterrupt:
+        pass
+    collector.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())